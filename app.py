@@ -4,14 +4,52 @@ Summary + Market Pulse + Foreign + Sector + Institution + Accumulation + Program
 """
 import logging
 import os
+import queue
+import threading
 import time
-from flask import Flask, render_template, jsonify, request
-
-from config import DEBUG, SECRET_KEY, REFRESH_INTERVAL
+from concurrent.futures import as_completed, wait
+from datetime import datetime
+
+from flask import Flask, Response, g, render_template, jsonify, request, send_file
+
+from config import (
+    API_FRESH_TTL,
+    API_FRESH_TTL_DEFAULT,
+    DASHBOARD_PANEL_TIMEOUT,
+    DEBUG,
+    INTRADAY_ENABLED,
+    METRICS_ENABLED,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_TOKEN,
+    PANEL_SCHEDULE,
+    REFRESH_INTERVAL,
+    SCHEDULER_ENABLED,
+    SCHEDULER_JITTER,
+    SCHEDULER_WORKERS,
+    SECRET_KEY,
+    SSE_HEARTBEAT,
+    SSE_MAX_CLIENTS,
+    SSE_QUEUE_SIZE,
+    STRATEGY_OFF_HOURS_INTERVAL,
+    WARMUP_ENABLED,
+    WARMUP_MAX_SEC,
+    WARMUP_PANELS,
+    WARMUP_RETRY_SEC,
+)
 from modules.kiwoom import KiwoomLogic
 from modules.content import ContentManager
+from modules.broadcast import Broadcaster, sse_frame
+from modules.encoding import EncodedBody, compress, content_etag, dumps, negotiate
 from modules.hong_signal import HongSignalScanner
+from modules.intraday import IntradayStore, today
+from modules import metrics, profiling
+from modules.aio import ContextExecutor
+from modules.replay import StrategyReplay
 from modules.accumulation import AccumulationEngine
+from modules.scheduler import RefreshScheduler
+from modules.singleflight import SingleFlight
+from modules.snapshots import SnapshotStore
+from modules.warmup import Warmup
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,10 +62,15 @@ app.secret_key = SECRET_KEY
 
 kiwoom = KiwoomLogic()
 content = ContentManager()
-hong_scanner = HongSignalScanner(kiwoom)
+intraday = IntradayStore() if INTRADAY_ENABLED else None
+hong_scanner = HongSignalScanner(kiwoom, journal=intraday)
 accumulation_engine = AccumulationEngine(kiwoom)
-
-logger.info(f"AX RADAR v5.3 | Kiwoom: {'LIVE' if kiwoom.connected else 'DISCONNECTED'}")
+inflight = SingleFlight()
+snapshots = SnapshotStore()
+scheduler = RefreshScheduler(workers=SCHEDULER_WORKERS, jitter=SCHEDULER_JITTER)
+broadcaster = Broadcaster(max_clients=SSE_MAX_CLIENTS, queue_size=SSE_QUEUE_SIZE)
+warmup = Warmup(max_sec=WARMUP_MAX_SEC, retry_sec=WARMUP_RETRY_SEC)
+_boot_t0 = time.monotonic()
 
 # ═══════════════════════════════════════════════════════════════════
 #  Main Page
@@ -67,63 +110,293 @@ def api_v3_article(category):
     })
 
 
+# ═══════════════════════════════════════════════════════════════════
+#  Metrics — /metrics (Prometheus 텍스트 형식)
+# ═══════════════════════════════════════════════════════════════════
+
+if METRICS_ENABLED:
+    @app.before_request
+    def _metrics_start():
+        g.metrics_t0 = time.perf_counter()
+        metrics.HTTP_INFLIGHT.inc()
+
+    # 다른 after_request(ETag → 304 등)보다 먼저 등록 → 가장 마지막에 실행되어 최종 상태 코드를 기록
+    @app.after_request
+    def _metrics_status(resp):
+        g.metrics_status = resp.status_code
+        return resp
+
+    @app.teardown_request
+    def _metrics_finish(exc):
+        t0 = g.pop("metrics_t0", None)
+        if t0 is None:
+            return
+        metrics.HTTP_INFLIGHT.dec()
+        # 라벨은 라우트 규칙 (/api/v3/stock/<code>) — 종목코드별로 시계열이 늘어나지 않도록
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        status = 500 if exc is not None else g.pop("metrics_status", 500)
+        metrics.HTTP_SECONDS.labels(route, request.method).observe(time.perf_counter() - t0)
+        metrics.HTTP_REQUESTS.labels(route, request.method, str(status)).inc()
+
+    @metrics.REGISTRY.collector
+    def _runtime_metrics():
+        """기존 통계 객체(캐시 엔진 · limiter · 토큰 · 스냅샷 · SSE)를 조회 시점에 변환."""
+        cache = kiwoom.cache_stats()
+        families = cache["families"]
+        events = ("hits", "staleHits", "misses", "evictions", "expirations", "revalidations")
+        limiter = kiwoom._api.limiter
+        tm = kiwoom._tm
+        return [
+            ("axradar_cache_events_total", "counter", "KiwoomLogic cache lookups and evictions by key family",
+             [({"family": f, "event": ev}, st[ev]) for f, st in families.items() for ev in events]),
+            ("axradar_cache_hit_ratio", "gauge", "(hits + stale hits) / lookups by key family",
+             [({"family": f}, st["hitRatio"]) for f, st in families.items()]),
+            ("axradar_cache_entries", "gauge", "KiwoomLogic cache entries", [({}, cache["entries"])]),
+            ("axradar_cache_bytes", "gauge", "KiwoomLogic cache approximate size", [({}, cache["bytes"])]),
+            ("axradar_kiwoom_rate_limit_waits_total", "counter", "Calls delayed by the local quota limiter",
+             [({}, limiter.waits)]),
+            ("axradar_kiwoom_rate_limit_wait_seconds_total", "counter", "Time spent waiting on the local quota limiter",
+             [({}, round(limiter.waited_sec, 6))]),
+            ("axradar_kiwoom_token_valid", "gauge", "1 if a valid au10001 token is held", [({}, int(tm.is_valid))]),
+            ("axradar_kiwoom_token_expiry_seconds", "gauge", "Seconds until the current token expires",
+             [({}, round(max((tm.expires_at - datetime.now()).total_seconds(), 0), 1) if tm.token else 0)]),
+            ("axradar_snapshot_age_seconds", "gauge", "Age of the latest panel snapshot by cache key",
+             [({"key": k}, age) for k, age in snapshots.ages().items()]),
+            ("axradar_stream_clients", "gauge", "Connected SSE clients", [({}, broadcaster.clients())]),
+        ]
+
+    @app.route("/metrics")
+    def metrics_endpoint():
+        return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Profiling — X-Profile 헤더 / 표본 요청 cProfile + /admin/profiles
+# ═══════════════════════════════════════════════════════════════════
+
+if PROFILE_TOKEN or PROFILE_SAMPLE_RATE > 0:
+    @app.before_request
+    def _profile_start():
+        reason = profiling.should_profile(request.path, request.headers.get("X-Profile", ""))
+        if not reason:
+            return
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        g.profile = profiling.ProfileSession.begin(
+            request.method, request.path, request.query_string.decode("latin-1"), route, reason)
+
+    # HTTP Caching(_api_conditional)보다 먼저 등록 → 304 변환 이후의 최종 응답에 헤더 부착
+    @app.after_request
+    def _profile_status(resp):
+        session = g.get("profile")
+        if session is not None:
+            session.status = resp.status_code
+            resp.headers["X-Profile-Id"] = session.id
+        return resp
+
+    @app.teardown_request
+    def _profile_finish(exc):
+        session = g.pop("profile", None)
+        if session is not None:
+            session.finish(exc)
+
+
+def _profile_admin_denied():
+    """PROFILE_TOKEN 미설정 → 404 (엔드포인트 비노출), 토큰 불일치 → 401."""
+    if not PROFILE_TOKEN:
+        return jsonify({"status": "error", "message": "Not found"}), 404
+    if not profiling.authorized(request.headers):
+        return jsonify({"status": "error", "message": "Unauthorized"}), 401
+    return None
+
+
+@app.route("/admin/profiles")
+def admin_profiles():
+    """최근 프로파일 요약 목록 (최신순)"""
+    denied = _profile_admin_denied()
+    if denied:
+        return denied
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 500)
+    return jsonify({"status": "ok", "data": profiling.list_profiles(limit)})
+
+
+@app.route("/admin/profiles/<name>")
+def admin_profile(name):
+    """
+    프로파일 1건: 기본 .prof 다운로드 (snakeviz · pstats로 열람)
+    ?format=txt → pstats 텍스트 (?sort=cumulative|tottime|ncalls, ?limit=80)
+    """
+    denied = _profile_admin_denied()
+    if denied:
+        return denied
+    if request.args.get("format") == "txt":
+        text = profiling.render_text(name, request.args.get("sort", "cumulative"),
+                                     min(max(request.args.get("limit", 80, type=int), 1), 1000))
+        if text is None:
+            return jsonify({"status": "error", "message": "Profile not found"}), 404
+        return Response(text, mimetype="text/plain")
+    path = profiling.profile_path(name)
+    if path is None:
+        return jsonify({"status": "error", "message": "Profile not found"}), 404
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True, download_name=f"{name}.prof")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  HTTP Caching — ETag / If-None-Match + gzip·br
+# ═══════════════════════════════════════════════════════════════════
+
+_API_PREFIXES = ("/api/v3/", "/api/v4/")
+
+
+def _not_modified(etag):
+    resp = Response(status=304)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def _send_encoded(encoded):
+    """스냅샷의 사전 직렬화 본문 전송: ETag 일치 → 304, 아니면 협상된 압축본"""
+    if request.if_none_match.contains_weak(encoded.etag):
+        return _not_modified(encoded.etag)
+    encoding = negotiate(request.headers.get("Accept-Encoding", ""), len(encoded.body))
+    resp = Response(encoded.get(encoding), mimetype="application/json")
+    resp.set_etag(encoded.etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.vary.add("Accept-Encoding")
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
+@app.after_request
+def _api_conditional(resp):
+    """스냅샷 외 JSON 응답(상세 · 스캐너 · 진단 등)에도 ETag + 압축 적용"""
+    if (request.method != "GET" or not request.path.startswith(_API_PREFIXES)
+            or resp.status_code != 200 or resp.mimetype != "application/json"
+            or resp.direct_passthrough or resp.is_streamed
+            or "ETag" in resp.headers or "Content-Encoding" in resp.headers):
+        return resp
+    body = resp.get_data()
+    etag = content_etag(body)
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.vary.add("Accept-Encoding")
+    encoding = negotiate(request.headers.get("Accept-Encoding", ""), len(body))
+    if encoding != "identity":
+        resp.set_data(compress(body, encoding))
+        resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  API Endpoints
 # ═══════════════════════════════════════════════════════════════════
 
-def _cached_api(cache_key, fetch_fn, label):
-    """Cache wrapper: API call -> cache on success, serve cache on failure"""
+def _fresh_ttl(cache_key):
+    """API_FRESH_TTL 조회: 정확 일치 → 접두어 일치 → 기본값"""
+    if cache_key in API_FRESH_TTL:
+        return API_FRESH_TTL[cache_key]
+    for prefix, ttl in API_FRESH_TTL.items():
+        if prefix.endswith("_") and cache_key.startswith(prefix):
+            return ttl
+    return API_FRESH_TTL_DEFAULT
+
+
+def _off_hours(cache_key):
+    """장외 시간의 전략 스캔 패널 → 갱신 주기를 STRATEGY_OFF_HOURS_INTERVAL로 늘림"""
+    return cache_key.startswith("strategy_signals_") and not hong_scanner.is_market_hours()
+
+
+def _max_age(cache_key, ttl):
+    """스케줄러가 갱신 중인 패널은 갱신 주기 3회분까지 스냅샷을 그대로 사용"""
+    job = scheduler.get(cache_key)
+    if job is not None and scheduler.running:
+        interval = STRATEGY_OFF_HOURS_INTERVAL if _off_hours(cache_key) else job.interval
+        return max(ttl, interval * 3)
+    return ttl
+
+
+def _store_fetch(cache_key, fetch_fn):
+    """fetch_fn 실행 → 스냅샷 저장 (키별 single-flight)"""
+    snap, _ = inflight.do(cache_key, lambda: snapshots.put(cache_key, fetch_fn()))
+    return snap
+
+
+def _resolve(cache_key, fetch_fn, label, ttl=None):
+    """
+    Snapshot lookup with single-flight coalescing.
+
+    fresh snapshot (age <= ttl, or scheduled panel) -> no Kiwoom call
+    miss -> one in-flight fetch per key, concurrent requests share its result
+    failure -> last snapshot regardless of age
+
+    Returns: (snapshot | None, served_stale, error_message)
+    """
+    ttl = _fresh_ttl(cache_key) if ttl is None else ttl
+    snap = snapshots.get(cache_key)
+    if snap is not None and snap.age <= _max_age(cache_key, ttl):
+        return snap, False, ""
+
     try:
-        data = fetch_fn()
-        kiwoom._set_cache(cache_key, data)
-        return jsonify({"status": "ok", "data": data})
+        return _store_fetch(cache_key, fetch_fn), False, ""
     except Exception as e:
         logger.error(f"{label} error: {e}")
-        cached = kiwoom._get_cache(cache_key)
-        if cached is not None:
+        metrics.FETCH_ERRORS.labels(cache_key).inc()
+        snap = snapshots.get(cache_key)
+        if snap is not None:
+            metrics.SERVED_STALE.labels(cache_key).inc()
             logger.info(f"{label}: serving cached data")
-            return jsonify({"status": "ok", "data": cached, "cached": True})
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return snap, snap is not None, str(e)
+
+
+def _cached_api(cache_key, fetch_fn, label, ttl=None):
+    """Snapshot-backed cache wrapper: fresh -> snapshot, miss -> fetch, failure -> last snapshot"""
+    snap, stale, error = _resolve(cache_key, fetch_fn, label, ttl)
+    if snap is None:
+        return jsonify({"status": "error", "message": error}), 500
+    if stale:
+        return jsonify({"status": "ok", "data": snap.data, "cached": True})
+    return _send_encoded(snap.encoded)
+
+
+def _fetch_indices():
+    indices = dict(kiwoom.get_market_indices())
+    indices["NASDAQ"] = kiwoom.get_nasdaq_index()
+    return indices
 
 
 @app.route("/api/v3/indices")
 def api_v3_indices():
     """KOSPI / KOSDAQ / NASDAQ 지수 현황"""
-    def fetch():
-        indices = kiwoom.get_market_indices()
-        nasdaq = kiwoom.get_nasdaq_index()
-        indices["NASDAQ"] = nasdaq
-        return indices
-    return _cached_api("indices", fetch, "Indices API")
+    return _cached_api("indices", _fetch_indices, "Indices API")
+
+
+def _fetch_institutions():
+    return kiwoom.get_institution_summary(top=5)
 
 
 @app.route("/api/v3/institutions")
 def api_v3_institutions():
     """3사 순매수/순매도 TOP 5 · 5영업일 누적 (ka10039 dt=5)"""
-    def fetch():
-        result = {}
-        for inst in ("MS", "JP", "GS"):
-            inst_name = {"MS": "Morgan Stanley", "JP": "JP Morgan", "GS": "Goldman Sachs"}[inst]
-            try:
-                buy_top = kiwoom.get_institution_top(inst, trade_type="1", days="5")[:5]
-                sell_top = kiwoom.get_institution_top(inst, trade_type="2", days="5")[:5]
-            except Exception as e:
-                logger.warning(f"Institution [{inst}] data error: {e}")
-                buy_top = []
-                sell_top = []
-            result[inst] = {"name": inst_name, "buyTop": buy_top, "sellTop": sell_top}
-        has_data = any(result[i]["buyTop"] or result[i]["sellTop"] for i in result)
-        if not has_data:
-            raise Exception("All institution data empty")
-        return result
-    return _cached_api("institutions", fetch, "Institutions API")
+    return _cached_api("institutions", _fetch_institutions, "Institutions API")
 
 
 @app.route("/api/v3/stock/<code>")
 def api_v3_stock_detail(code):
-    """종목 상세 팝업 (ka10001)"""
-    cache_key = f"stock_{code}"
-    return _cached_api(cache_key, lambda: kiwoom.get_stock_info(code), f"Stock detail [{code}]")
+    """종목 상세 팝업 (ka10001) — KiwoomLogic LRU 캐시 (stock_ 계열 fresh/stale TTL)"""
+    try:
+        return jsonify({"status": "ok", "data": kiwoom.get_stock_info(code)})
+    except Exception as e:
+        logger.error(f"Stock detail [{code}] error: {e}")
+        metrics.FETCH_ERRORS.labels("stock_").inc()
+        cached = kiwoom._get_cache(f"stock_{code}")
+        if cached is not None:
+            metrics.SERVED_STALE.labels("stock_").inc()
+            return jsonify({"status": "ok", "data": cached, "cached": True})
+        return jsonify({"status": "error", "message": str(e)}), 500
 
 
 @app.route("/api/v3/foreign-top")
@@ -195,6 +468,28 @@ def api_v3_program_slope():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@app.route("/api/v3/replay")
+def api_v3_replay():
+    """
+    장중 기록 리플레이: 기록된 ka10032 · ka10065 스냅샷으로 scan_strategy 재실행 (API 호출 없음).
+    Query: day=YYYYMMDD (기본 오늘), market="0"|"1", timeline=1 (스텝별 타임라인 포함)
+    """
+    if intraday is None:
+        return jsonify({"status": "error", "message": "Intraday store disabled"}), 404
+    day = request.args.get("day", today())
+    if day not in intraday.days():
+        return jsonify({"status": "error", "message": f"No intraday data for {day}"}), 404
+    replay = StrategyReplay(intraday, kiwoom.refs.peek("sector_map", {}), kiwoom.refs.peek("stock_names", {}))
+    try:
+        result = replay.run(day, request.args.get("market", "0"))
+    except Exception as e:
+        logger.error(f"Replay error: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+    if request.args.get("timeline") != "1":
+        result.pop("timeline")
+    return jsonify({"status": "ok", "data": result})
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  Strategy API — 홍인기 수급 주도주 전략
 # ═══════════════════════════════════════════════════════════════════
@@ -217,20 +512,11 @@ def api_v4_strategy_signals():
 @app.route("/api/v3/accumulation")
 def api_v3_accumulation():
     """Foreign Accumulation Radar — 외국인 스텔스 축적 TOP 30"""
-    cache_key = "accumulation_radar"
-    try:
-        cached = kiwoom._get_cache(cache_key, ttl=120)
-        if cached is not None:
-            return jsonify({"status": "ok", "data": cached, "cached": True})
-        data = accumulation_engine.analyze(top_n=30)
-        kiwoom._set_cache(cache_key, data)
-        return jsonify({"status": "ok", "data": data})
-    except Exception as e:
-        logger.error(f"Accumulation API error: {e}")
-        cached = kiwoom._get_cache(cache_key)
-        if cached is not None:
-            return jsonify({"status": "ok", "data": cached, "cached": True})
-        return jsonify({"status": "error", "message": str(e)}), 500
+    return _cached_api(
+        "accumulation_radar",
+        lambda: accumulation_engine.analyze(top_n=30),
+        "Accumulation API",
+    )
 
 
 @app.route("/api/v3/accumulation/<stk_cd>")
@@ -262,64 +548,345 @@ def api_v3_consecutive_buy():
 #  Program Trading TOP 50 API
 # ═══════════════════════════════════════════════════════════════════
 
+def _fetch_program_top():
+    return kiwoom.get_program_top(50)
+
+
 @app.route("/api/v3/program-top")
 def api_v3_program_top():
     """당일 프로그램 순매수 TOP 50 (코스피+코스닥 통합)"""
+    return _cached_api("program_top", _fetch_program_top, "Program TOP API")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Background Refresh — 패널 스냅샷 사전 계산
+# ═══════════════════════════════════════════════════════════════════
+
+# 패널 캐시 키 → fetch 함수 (라우트와 동일한 함수·키를 사용해 스냅샷 공유)
+PANEL_FETCHERS = {
+    "indices": _fetch_indices,
+    "foreign_top20": kiwoom.get_foreign_top20,
+    "foreign_sector": kiwoom.get_foreign_sector_flow,
+    "ib_sector": kiwoom.get_ib_sector_flow,
+    "institutions": _fetch_institutions,
+    "accumulation_radar": lambda: accumulation_engine.analyze(top_n=30),
+    "consecutive_buy": lambda: kiwoom.get_foreign_consecutive_buy("000"),
+    "program_top": _fetch_program_top,
+    "strategy_signals_0": lambda: hong_scanner.scan_strategy("0"),
+    "strategy_signals_1": lambda: hong_scanner.scan_strategy("1"),
+}
+
+
+# 패널 캐시 키 → 내부 KiwoomLogic 캐시 키 (fresh TTL이 갱신 주기보다 길 수 있는 항목)
+# 스케줄 갱신은 이 키들을 먼저 무효화 → 매 주기 새 데이터로 스냅샷 (NASDAQ 일봉은 자체 120초 TTL 유지)
+PANEL_CACHE_KEYS = {
+    "indices": ("market_indices",),
+    "foreign_top20": ("foreign_top20_data",),
+    "foreign_sector": ("foreign_sector_flow",),
+    "ib_sector": ("ib_sector_flow",),
+    "strategy_signals_0": ("top_volume_0",),
+    "strategy_signals_1": ("top_volume_1",),
+}
+
+
+def _refresh_panel(cache_key, fetch_fn):
+    if _off_hours(cache_key):
+        snap = snapshots.get(cache_key)
+        if snap is not None and snap.age < STRATEGY_OFF_HOURS_INTERVAL:
+            return snap
+    kiwoom.invalidate(*PANEL_CACHE_KEYS.get(cache_key, ()))
+    return _store_fetch(cache_key, fetch_fn)
+
+
+def _register_panels():
+    for cache_key, (interval, priority) in PANEL_SCHEDULE.items():
+        fetch_fn = PANEL_FETCHERS.get(cache_key)
+        if fetch_fn is None:
+            logger.warning(f"Scheduler: unknown panel '{cache_key}'")
+            continue
+        scheduler.add(
+            cache_key,
+            lambda k=cache_key, fn=fetch_fn: _refresh_panel(k, fn),
+            interval=interval,
+            priority=priority,
+        )
+
+
+_register_panels()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Warmup — 바인드 후 백그라운드 준비 + /healthz · /readyz
+# ═══════════════════════════════════════════════════════════════════
+
+_warmed_panels = set()
+
+
+def _rehydrate_intraday():
+    """장중 시계열 복원: 재기동 직후에도 연속 증가 · 기울기 판정이 이어지도록"""
+    intraday.prune()
+    return hong_scanner.rehydrate()
+
+
+def _warm_panels():
+    """WARMUP_PANELS 첫 스냅샷 — 스케줄러 워커 수만큼 병렬 (쿼터 limiter 공유)"""
+    keys = [k for k in WARMUP_PANELS if k in PANEL_FETCHERS]
+    for k in set(WARMUP_PANELS) - set(keys):
+        logger.warning(f"Warmup: unknown panel '{k}'")
+    failed = {}
+    with ContextExecutor(max_workers=SCHEDULER_WORKERS, thread_name_prefix="warmup") as pool:
+        futures = {pool.submit(_store_fetch, k, PANEL_FETCHERS[k]): k for k in keys}
+        for fut in as_completed(futures):
+            cache_key = futures[fut]
+            try:
+                fut.result()
+                _warmed_panels.add(cache_key)
+            except Exception as e:
+                failed[cache_key] = str(e)
+                metrics.FETCH_ERRORS.labels(cache_key).inc()
+    return {"ok": sorted(_warmed_panels), "failed": failed}
+
+
+def _start_scheduler():
+    """첫 스냅샷이 준비된 패널은 한 주기 뒤부터 갱신"""
+    scheduler.start(warm=_warmed_panels)
+    return {"jobs": len(scheduler.status()), "deferred": len(_warmed_panels & set(PANEL_SCHEDULE))}
+
+
+warmup.add("references", kiwoom.load_references)
+if intraday is not None:
+    warmup.add("intraday", _rehydrate_intraday)
+warmup.add("token", kiwoom.warm_token, required=True)
+warmup.add("sector_map", kiwoom.warm_sector_map)
+if WARMUP_PANELS:
+    warmup.add("panels", _warm_panels)
+if SCHEDULER_ENABLED:
+    warmup.add("scheduler", _start_scheduler)
+
+logger.info(f"AX RADAR v5.3 | Kiwoom: {'LIVE' if kiwoom._tm.is_valid else 'TOKEN PENDING'}")
+
+# debug reloader 부모 프로세스에서는 시작하지 않음 (자식 프로세스만 실행)
+if not DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+    if WARMUP_ENABLED:
+        warmup.start()
+    else:
+        # 기동 준비를 직접 실행하는 경우에도 토큰 선제 갱신 · 패널 스케줄러는 바로 시작
+        # (이후 warmup.run()의 token · scheduler 단계는 이미 실행 중이면 건너뜀)
+        kiwoom._tm.start_refresher()
+        if SCHEDULER_ENABLED:
+            scheduler.start()
+
+
+@app.route("/healthz")
+def healthz():
+    """프로세스 생존 확인 (준비 여부와 무관하게 200)"""
+    status = warmup.status()
+    resp = jsonify({
+        "status": "ok",
+        "uptimeSec": round(time.monotonic() - _boot_t0, 1),
+        "ready": status["ready"],
+        "warmup": status["progress"],
+    })
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
+@app.route("/readyz")
+def readyz():
+    """
+    트래픽 수신 가능 여부: 준비 단계가 모두 끝나면 200, 진행 중이면 503.
+    필수 단계(토큰)가 WARMUP_MAX_SEC 내에 실패하면 degraded=true로 200 (전체 인스턴스 동시 이탈 방지).
+    """
+    status = warmup.status()
+    resp = jsonify({"status": "ready" if status["ready"] else "warming", **status})
+    resp.status_code = 200 if status["ready"] else 503
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Dashboard API — 전체 패널 일괄 응답 (1회 요청 = 1회 갱신)
+# ═══════════════════════════════════════════════════════════════════
+
+# 프론트엔드 패널명 → 패널 캐시 키
+DASHBOARD_PANELS = {
+    "indices": "indices",
+    "foreignTop": "foreign_top20",
+    "foreignSector": "foreign_sector",
+    "inst": "institutions",
+    "accumulation": "accumulation_radar",
+    "programTop": "program_top",
+    "consecutiveBuy": "consecutive_buy",
+}
+
+_dashboard_pool = ContextExecutor(max_workers=len(DASHBOARD_PANELS), thread_name_prefix="dashboard")
+
+
+def _dashboard_panel(cache_key):
+    return _resolve(cache_key, PANEL_FETCHERS[cache_key], f"Dashboard [{cache_key}]")
+
+
+# 마지막으로 조립한 대시보드 본문 — 패널 구성(스냅샷 ETag · 상태)이 같으면 직렬화 · 압축본 재사용
+_dashboard_body = {"key": None, "encoded": None}
+_dashboard_lock = threading.Lock()
+
+
+def _dashboard_encoded(panels):
+    """panels: {name: (snapshot | None, cached, error, pending)} → EncodedBody (구성 불변 시 캐시본)"""
+    key = tuple(
+        (name, snap.etag if snap is not None else "", cached, error, pending)
+        for name, (snap, cached, error, pending) in panels.items()
+    )
+    with _dashboard_lock:
+        if _dashboard_body["key"] == key:
+            return _dashboard_body["encoded"]
+    data = {}
+    for name, (snap, cached, error, pending) in panels.items():
+        if snap is not None:
+            data[name] = {"status": "ok", "data": snap.data, "cached": cached}
+        elif pending:
+            data[name] = {"status": "pending"}
+        else:
+            data[name] = {"status": "error", "message": error}
+    encoded = EncodedBody({"status": "ok", "data": data})
+    with _dashboard_lock:
+        _dashboard_body.update(key=key, encoded=encoded)
+    return encoded
+
+
+@app.route("/api/v3/dashboard")
+def api_v3_dashboard():
+    """
+    대시보드 전체 패널 일괄 조회.
+
+    패널별 {status, data, cached} — 한 패널의 실패/지연이 다른 패널을 막지 않음.
+    DASHBOARD_PANEL_TIMEOUT 내에 끝나지 않은 패널은 status="pending"
+    (fetch는 백그라운드에서 계속되어 다음 갱신 때 스냅샷으로 제공).
+
+    본문은 패널 내용만 담아 ETag가 스냅샷이 바뀔 때만 변함 (무변화 폴링 → 304).
+    패널별 경과 시간(초)은 X-Panel-Age 헤더 ("indices=1.2, foreignTop=30.0").
+    """
+    futures = {
+        _dashboard_pool.submit(_dashboard_panel, cache_key): name
+        for name, cache_key in DASHBOARD_PANELS.items()
+    }
+    done, _ = wait(futures, timeout=DASHBOARD_PANEL_TIMEOUT)
+
+    panels = {}
+    for future, name in futures.items():
+        if future in done:
+            snap, stale, error = future.result()
+            panels[name] = (snap, stale, error, False)
+        else:
+            snap = snapshots.get(DASHBOARD_PANELS[name])
+            panels[name] = (snap, True, "", snap is None)
+
+    resp = _send_encoded(_dashboard_encoded(panels))
+    resp.headers["X-Panel-Age"] = ", ".join(
+        f"{name}={snap.age:.1f}" for name, (snap, *_) in panels.items() if snap is not None)
+    return resp
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Live Stream (SSE) — 스냅샷 내용이 바뀔 때만 패널 푸시
+# ═══════════════════════════════════════════════════════════════════
+
+_PANEL_NAMES = {cache_key: name for name, cache_key in DASHBOARD_PANELS.items()}
+
+
+def _panel_frame(snap):
+    """event: panel / data: {"panel", "etag", "body": 스냅샷 응답 본문} — 본문은 재직렬화 없이 그대로 사용"""
+    name = _PANEL_NAMES[snap.key]
+    data = b'{"panel":"%s","etag":"%s","body":%s}' % (name.encode(), snap.etag.encode(), snap.encoded.body)
+    return sse_frame("panel", data, f"{name}:{snap.version}")
+
+
+@snapshots.on_change
+def _push_panel(snap):
+    if snap.key in _PANEL_NAMES:
+        broadcaster.publish(_panel_frame(snap))
+
+
+@app.route("/api/v3/stream")
+def api_v3_stream():
+    """
+    대시보드 패널 SSE 스트림.
+
+    접속 직후: hello(scheduled 여부) + 보유 중인 패널 스냅샷 전체
+    이후: 스냅샷 ETag가 바뀐 패널만 push, 무변화 구간은 SSE_HEARTBEAT 간격 주석 핑.
+    구독 상한 초과 시 503 → 클라이언트는 폴링 유지.
+    """
+    sub = broadcaster.subscribe()
+    if sub is None:
+        return jsonify({"status": "error", "message": "Too many stream clients"}), 503
+
+    def generate():
+        try:
+            yield b"retry: 5000\n\n"
+            yield sse_frame("hello", dumps({"scheduled": scheduler.running, "panels": list(DASHBOARD_PANELS)}))
+            for cache_key in _PANEL_NAMES:
+                snap = snapshots.get(cache_key)
+                if snap is not None:
+                    yield _panel_frame(snap)
+            while not sub.closed:
+                try:
+                    yield sub.queue.get(timeout=SSE_HEARTBEAT)
+                except queue.Empty:
+                    yield b": ping\n\n"
+        finally:
+            broadcaster.unsubscribe(sub)
+
+    resp = Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    # 제너레이터가 한 번도 실행되지 않고 닫혀도(첫 프레임 전 연결 종료 등) 구독 슬롯 반납
+    resp.call_on_close(lambda: broadcaster.unsubscribe(sub))
+    return resp
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Diagnostics
+# ═══════════════════════════════════════════════════════════════════
 
-    def fetch():
-        pn = kiwoom._parse_float
-
-        # 코스피
-        kospi = kiwoom._api.call("ka90003", "/api/dostk/stkinfo", {
-            "trde_upper_tp": "2", "amt_qty_tp": "1",
-            "mrkt_tp": "P00101", "stex_tp": "1",
-        })
-        time.sleep(0.3)
-
-        # 코스닥
-        kosdaq = kiwoom._api.call("ka90003", "/api/dostk/stkinfo", {
-            "trde_upper_tp": "2", "amt_qty_tp": "1",
-            "mrkt_tp": "P10102", "stex_tp": "1",
-        })
-
-        def extract(data):
-            items = data.get("prm_netprps_upper_50", [])
-            if not items:
-                for k, v in data.items():
-                    if isinstance(v, list) and v and isinstance(v[0], dict):
-                        items = v
-                        break
-            return items
-
-        kospi_items = extract(kospi)
-        kosdaq_items = extract(kosdaq)
-
-        for item in kospi_items:
-            item["_market"] = "KOSPI"
-        for item in kosdaq_items:
-            item["_market"] = "KOSDAQ"
-
-        combined = kospi_items + kosdaq_items
-        combined.sort(key=lambda x: abs(pn(x.get("prm_netprps_amt", "0"))), reverse=True)
-
-        result = []
-        for i, item in enumerate(combined[:50]):
-            cd = str(item.get("stk_cd", "")).replace("_NX", "").replace("_AL", "").strip()
-            if not cd or len(cd) != 6:
-                continue
-            net = pn(item.get("prm_netprps_amt", "0"))
-            result.append({
-                "rank": i + 1,
-                "stk_cd": cd,
-                "stk_nm": str(item.get("stk_nm", "")).strip(),
-                "market": item.get("_market", ""),
-                "cur_prc": abs(kiwoom._parse_int(item.get("cur_prc", "0"))),
-                "flu_rt": pn(item.get("flu_rt", "0")),
-                "prm_netprps_amt": net,
-            })
-        return result
-
-    return _cached_api("program_top", fetch, "Program TOP API")
+@app.route("/api/v3/transport-stats")
+def api_v3_transport_stats():
+    """키움 HTTP 커넥션 풀 재사용 통계 (신규 연결 vs 재사용)"""
+    return jsonify({"status": "ok", "data": {
+        "poolConnections": kiwoom._http.pool_connections,
+        "poolMaxsize": kiwoom._http.pool_maxsize,
+        "hosts": kiwoom.transport_stats(),
+        "cassette": kiwoom.cassette.stats(),
+        "token": kiwoom._tm.status(),
+        "rateLimit": {
+            "waits": kiwoom._api.limiter.waits,
+            "waitedSec": round(kiwoom._api.limiter.waited_sec, 2),
+        },
+    }})
+
+
+@app.route("/api/v3/cache-stats")
+def api_v3_cache_stats():
+    """KiwoomLogic 캐시 엔진 통계 (키 계열별 hit/miss/eviction) + 참조 저장소 · 심볼 마스터 상태"""
+    return jsonify({"status": "ok", "data": {
+        **kiwoom.cache_stats(),
+        "references": kiwoom.refs.status(),
+        "symbols": kiwoom.symbols.stats(),
+        "intraday": intraday.status() if intraday is not None else None,
+    }})
+
+
+@app.route("/api/v3/scheduler")
+def api_v3_scheduler():
+    """백그라운드 갱신 작업 상태 + 패널 스냅샷 경과 시간(초)"""
+    return jsonify({"status": "ok", "data": {
+        "running": scheduler.running,
+        "jobs": scheduler.status(),
+        "snapshotAges": snapshots.ages(),
+        "stream": {
+            "clients": broadcaster.clients(),
+            "published": broadcaster.published,
+            "dropped": broadcaster.dropped,
+        },
+    }})
 
 
 if __name__ == "__main__":
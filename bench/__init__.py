@@ -0,0 +1 @@
+"""AX RADAR offline benchmarks (python -m bench.run)."""
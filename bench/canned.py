@@ -0,0 +1,67 @@
+"""
+AX RADAR v5.3 - Canned Kiwoom Transport (benchmarks)
+tools/fake_kiwoom 합성 시장을 고정 시점으로 멈춰 두고, 그 Flask 앱을 프로세스 안에서 호출해 응답을 만든다.
+같은 요청(api-id + 경로 + 본문 + next-key)은 첫 응답 바이트를 재사용 — 측정 구간에는 합성 비용이 없고,
+매 호출 JSON 파싱은 실제 requests 경로와 같게 남긴다.
+
+    canned = CannedTransport(symbols=2500, seed=7, sim_time="11:00:00")
+    kiwoom._tm.transport = kiwoom._api.transport = canned
+"""
+import json
+import threading
+
+from modules.cassette import CassetteResponse
+from tools.fake_kiwoom import Faults, Market, create_app
+
+
+def _sim_seconds(hhmmss: str) -> int:
+    h, m, s = (int(x) for x in hhmmss.split(":"))
+    return h * 3600 + m * 60 + s
+
+
+class CannedTransport:
+    """PooledTransport 대체 (post · stats · close)."""
+
+    def __init__(self, symbols: int = 2500, seed: int = 7, sim_time: str = "11:00:00", page_size: int = 40):
+        self.market = Market(symbols, seed, speed=0.0)
+        self.market.advance_to(_sim_seconds(sim_time))
+        faults = Faults(latency_ms=0, latency_sigma=0, rate=0, burst=0, error_rate=0, seed=seed)
+        self._client = create_app(self.market, faults, page_size).test_client()
+        self._lock = threading.Lock()
+        self._responses: dict = {}       # key → (status, headers, raw bytes)
+        self.calls = 0
+
+    @staticmethod
+    def _key(url: str, headers: dict, body) -> str:
+        path = "/" + url.split("://", 1)[-1].split("/", 1)[-1]
+        api_id = headers.get("api-id", "")
+        if api_id == "au10001":
+            return api_id
+        return json.dumps([api_id, path, body, headers.get("next-key", "")], sort_keys=True, ensure_ascii=False)
+
+    def post(self, url: str, headers: dict | None = None, json=None, **kwargs):
+        headers = headers or {}
+        key = self._key(url, headers, json)
+        with self._lock:
+            self.calls += 1
+            hit = self._responses.get(key)
+            if hit is None:
+                path = "/" + url.split("://", 1)[-1].split("/", 1)[-1]
+                resp = self._client.post(path, headers=headers, json=json)
+                hit = self._responses[key] = (
+                    resp.status_code,
+                    {k: resp.headers[k] for k in ("cont-yn", "next-key") if k in resp.headers},
+                    resp.get_data(),
+                )
+        status, resp_headers, raw = hit
+        return CassetteResponse(status, resp_headers, _loads(raw), url)
+
+    def stats(self) -> dict:
+        return {"canned": {"keys": len(self._responses), "calls": self.calls, "symbols": self.market.n}}
+
+    def close(self):
+        pass
+
+
+def _loads(raw: bytes):
+    return json.loads(raw)
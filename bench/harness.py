@@ -0,0 +1,115 @@
+"""
+AX RADAR v5.3 - Benchmark Harness
+케이스 1개 = 측정 함수 + (선택) 매 반복 전 setup. 시간 측정과 메모리 측정은 분리된 패스로 실행
+(tracemalloc 추적이 켜진 동안의 시간은 결과에 섞이지 않는다).
+
+결과 필드:
+    ops          측정 반복 수
+    opsPerSec    ops / Σ소요 시간
+    meanMs · p50Ms · p99Ms · maxMs
+    peakKiB      tracemalloc 최대 할당량 (setup 이후 1회 실행 기준)
+    upstream     반복당 Kiwoom 호출 수 (canned 모드)
+"""
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+
+class Case:
+    __slots__ = ("name", "group", "fn", "setup", "iterations", "warmup", "check")
+
+    def __init__(self, name: str, group: str, fn, setup=None, iterations: int = 50, warmup: int = 2, check=None):
+        self.name = name
+        self.group = group
+        self.fn = fn
+        self.setup = setup
+        self.iterations = iterations
+        self.warmup = warmup
+        self.check = check          # check(첫 실행 결과) → 오류 메시지 또는 None (None이면 측정 진행)
+
+
+def measure(case: Case, scale: float = 1.0, counter=None) -> dict:
+    """counter: 누적 upstream 호출 수를 반환하는 함수 (없으면 upstream 생략)."""
+    if case.setup:
+        case.setup()
+    first = case.fn()
+    if case.check is not None:
+        problem = case.check(first)
+        if problem:
+            return {"group": case.group, "skipped": problem}
+    for _ in range(case.warmup):
+        if case.setup:
+            case.setup()
+        case.fn()
+
+    n = max(1, int(round(case.iterations * scale)))
+    samples = np.empty(n)
+    calls0 = counter() if counter else 0
+    gc.collect()
+    for i in range(n):
+        if case.setup:
+            case.setup()
+        t0 = time.perf_counter_ns()
+        case.fn()
+        samples[i] = time.perf_counter_ns() - t0
+    calls = (counter() - calls0) / n if counter else None
+
+    ms = samples / 1e6
+    total = ms.sum() / 1000
+    result = {
+        "group": case.group,
+        "ops": n,
+        "opsPerSec": round(n / total, 2) if total > 0 else None,
+        "meanMs": round(float(ms.mean()), 4),
+        "p50Ms": round(float(np.percentile(ms, 50)), 4),
+        "p99Ms": round(float(np.percentile(ms, 99)), 4),
+        "maxMs": round(float(ms.max()), 4),
+        "peakKiB": _peak_kib(case),
+    }
+    if calls is not None:
+        result["upstream"] = round(calls, 2)
+    return result
+
+
+def _peak_kib(case: Case) -> float:
+    if case.setup:
+        case.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round((peak - base) / 1024, 1)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Comparison
+# ═══════════════════════════════════════════════════════════════════
+
+def compare(current: dict, baseline: dict, threshold: float = 0.15) -> list:
+    """
+    케이스별 p50 · p99 · peakKiB 변화율. p50 · peakKiB가 threshold 넘게 증가하면 regression
+    (p99는 짧은 케이스에서 흔들림이 커서 참고용으로만 표시).
+    Returns: [{name, metric, before, after, change, regression}, ...]
+    """
+    rows = []
+    for name, cur in current.get("results", {}).items():
+        old = baseline.get("results", {}).get(name)
+        if not old or "skipped" in cur or "skipped" in old:
+            continue
+        for metric in ("p50Ms", "p99Ms", "peakKiB"):
+            before, after = old.get(metric), cur.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            rows.append({
+                "name": name, "metric": metric, "before": before, "after": after,
+                "change": round(change, 4), "regression": metric != "p99Ms" and change > threshold,
+            })
+    return rows
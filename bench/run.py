@@ -0,0 +1,297 @@
+"""
+AX RADAR v5.3 - Offline Benchmark Suite
+네트워크 · 자격 증명 없이 엔진 핫패스와 Flask 라우트 전체를 측정하고 결과를 JSON으로 남긴다.
+
+    python -m bench.run                           # 전체, bench/results/{시각}-{커밋}.json
+    python -m bench.run --quick --filter route    # 반복 20%, 이름에 "route" 포함 케이스만
+    python -m bench.run --compare bench/results/<이전>.json --fail-on-regression
+    python -m bench.run --cassette data/cassettes/default   # 합성 응답 대신 기록된 카세트로 재생
+
+응답 공급:
+- 기본: bench.canned.CannedTransport — tools/fake_kiwoom 합성 시장(--symbols, --seed)을 --sim-time에 고정
+- --cassette: CASSETTE_MODE=replay (pykrx · yfinance 기록이 있으면 indices · foreign-top도 측정)
+
+케이스:
+- engine   parse_int · parse_float · decode · calc_slope · ContentManager · AccumulationEngine.analyze ·
+           HongSignalScanner.scan / scan_strategy · get_program_top(병합) · get_ib_sector_flow
+- route    /api/* 전 라우트 (warm = 스냅샷 · 캐시 적중, cold = 매 반복 캐시 비움) + "/" 렌더링
+           /api/v3/stream(SSE 장기 연결)은 제외. 첫 응답이 5xx인 라우트는 skipped로 기록 (예: pykrx 미설치)
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")
+
+# /api/* 중 측정하지 않는 라우트 (사유)
+EXCLUDED_ROUTES = {"/api/v3/stream": "long-lived SSE"}
+
+
+def _prepare_env(args, workdir: str):
+    """config import 전에 호출 — 운영 .env 값과 무관하게 오프라인 · 무제한 쿼터로 고정."""
+    os.environ.update({
+        "SCHEDULER_ENABLED": "false",
+        "WARMUP_ENABLED": "false",          # transport 교체 후 _boot에서 직접 실행
+        "WARMUP_PANELS": "",
+        "WARMUP_MAX_SEC": "0",
+        "INTRADAY_ENABLED": "true",
+        "INTRADAY_DIR": os.path.join(workdir, "intraday"),
+        "REF_DATA_DIR": os.path.join(workdir, "ref"),
+        "KIWOOM_TOKEN_PATH": os.path.join(workdir, "token.json"),
+        "KIWOOM_RATE_LIMIT": "1000000",
+        "KIWOOM_RATE_BURST": "1000000",
+        "KIWOOM_RATE_LIMIT_PER_API": "",
+        "KIWOOM_APPKEY": "bench",
+        "KIWOOM_SECRETKEY": "bench",
+        "KIWOOM_BASE_URL": "http://kiwoom.bench.invalid",
+    })
+    if args.cassette:
+        os.environ.update({"CASSETTE_MODE": "replay", "CASSETTE_DIR": os.path.abspath(args.cassette),
+                           "CASSETTE_LATENCY": "false"})
+    else:
+        os.environ["CASSETTE_MODE"] = "off"
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Cases
+# ═══════════════════════════════════════════════════════════════════
+
+def build_cases(app_module, canned, codes: list) -> list:
+    import numpy as np
+
+    from modules.decoder import decode, parse_float, parse_int
+    from modules.hong_signal import calc_slope
+    from tools.fake_kiwoom import ka10032
+
+    from .harness import Case
+
+    kiwoom = app_module.kiwoom
+    content = app_module.content
+    client = app_module.app.test_client()
+
+    def cold():
+        app_module.snapshots.clear()
+        kiwoom._cache.clear()
+
+    rng = np.random.default_rng(0)
+    raw_ints = [f"{'+-'[i % 2]}{v:,}" if i % 3 else str(v) for i, v in enumerate(rng.integers(0, 10**9, 10_000))]
+    raw_floats = [f"{v:+.2f}" for v in rng.normal(0, 5, 10_000)]
+    rank_rows = {"trde_prica_upper": ka10032(canned.market, {"mrkt_tp": "000"})[1]} if canned else None
+    series = np.cumsum(rng.normal(0, 100, 390)).tolist()
+    categories = ("wsj", "radar", "etf", "column")
+
+    cases = [
+        Case("engine.parse_int x10k", "engine", lambda: [parse_int(v) for v in raw_ints], iterations=30),
+        Case("engine.parse_float x10k", "engine", lambda: [parse_float(v) for v in raw_floats], iterations=30),
+        Case("engine.calc_slope 390pts", "engine", lambda: calc_slope(series, 10), iterations=2000),
+        Case("engine.content.get_article", "engine",
+             lambda: [content.get_article(c) for c in categories], iterations=200),
+        Case("engine.content.list_articles", "engine",
+             lambda: [content.list_articles(c) for c in categories], iterations=200),
+        Case("engine.accumulation.analyze top30", "engine",
+             lambda: app_module.accumulation_engine.analyze(top_n=30), setup=cold, iterations=10),
+        Case(f"engine.hong.scan x{len(codes)}", "engine",
+             lambda: app_module.hong_scanner.scan(codes, "0"), setup=cold, iterations=20),
+        Case("engine.hong.scan_strategy KOSPI", "engine",
+             lambda: app_module.hong_scanner.scan_strategy("0"), setup=cold, iterations=30),
+        Case("engine.kiwoom.get_program_top 50", "engine",
+             lambda: kiwoom.get_program_top(50), setup=cold, iterations=50),
+        Case("engine.kiwoom.get_ib_sector_flow", "engine",
+             kiwoom.get_ib_sector_flow, setup=cold, iterations=30),
+    ]
+    if rank_rows is not None:
+        cases.insert(2, Case("engine.decode ka10032", "engine", lambda: decode("ka10032", rank_rows), iterations=300))
+
+    def get(path):
+        return lambda: client.get(path)
+
+    def ok(resp):
+        if resp.status_code >= 500:
+            body = resp.get_json(silent=True) or {}
+            return f"HTTP {resp.status_code}: {body.get('message', '')}"[:200]
+        return None
+
+    code = codes[0]
+    routes = [
+        ("/", 200),
+        ("/api/v3/article/wsj", 200),
+        ("/api/v3/indices", 50),
+        ("/api/v3/institutions", 50),
+        (f"/api/v3/stock/{code}", 200),
+        ("/api/v3/foreign-top", 50),
+        ("/api/v3/foreign-sector", 100),
+        ("/api/v3/ib-sector", 30),
+        (f"/api/v3/hong-signal?codes={','.join(codes)}", 20),
+        ("/api/v3/program-slope", 100),
+        ("/api/v4/strategy/signals?market=0", 30),
+        ("/api/v3/replay?day={today}&market=0", 10),
+        ("/api/v3/accumulation", 10),
+        (f"/api/v3/accumulation/{code}", 100),
+        ("/api/v3/consecutive-buy", 100),
+        ("/api/v3/program-top", 50),
+        ("/api/v3/dashboard", 10),
+        ("/api/v3/transport-stats", 300),
+        ("/api/v3/cache-stats", 300),
+        ("/api/v3/scheduler", 300),
+    ]
+    day = app_module.today()
+    for path, iterations in routes:
+        path = path.format(today=day)
+        label = path.split("?")[0]
+        cases.append(Case(f"route.warm GET {label}", "route", get(path), iterations=max(iterations, 50) * 2, check=ok))
+        cases.append(Case(f"route.cold GET {label}", "route", get(path), setup=cold, iterations=iterations, check=ok))
+
+    covered = {p.split("?")[0] for p, _ in routes}
+    for rule in app_module.app.url_map.iter_rules():
+        path = rule.rule.replace("<category>", "wsj").replace("<code>", code).replace("<stk_cd>", code)
+        if rule.rule.startswith("/api/") and path not in covered and rule.rule not in EXCLUDED_ROUTES:
+            logging.getLogger("bench").warning(f"Route not benchmarked: {rule.rule}")
+    return cases
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Main
+# ═══════════════════════════════════════════════════════════════════
+
+def _sim_clock(hhmmss: str):
+    """최근 평일 --sim-time부터 흐르는 시계 — 실행 요일 · 시각과 무관하게 장중 스캔 경로를 측정."""
+    day = datetime.now()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    base = datetime.combine(day.date(), datetime.strptime(hhmmss, "%H:%M:%S").time()).timestamp()
+    t0 = time.time()
+    return lambda: base + (time.time() - t0)
+
+
+def _boot(args):
+    """환경 고정 → (canned 모드) 토큰 선발급 → app import → 기동 준비 단계."""
+    workdir = tempfile.mkdtemp(prefix="axradar-bench-")
+    _prepare_env(args, workdir)
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    canned = None
+    if not args.cassette:
+        from modules.kiwoom import TokenManager
+
+        from .canned import CannedTransport
+        canned = CannedTransport(args.symbols, args.seed, args.sim_time)
+        # KIWOOM_TOKEN_PATH에 저장 → app import 시 디스크 복원 (백그라운드 발급이 실제 호스트로 나가지 않음)
+        if not TokenManager(canned).get_token():
+            raise SystemExit("Canned token issue failed")
+
+    import app as app_module
+    logging.getLogger().setLevel(logging.ERROR)         # 측정 중 로그 출력 비용 · 잡음 제거
+    logging.getLogger("bench").setLevel(logging.WARNING)
+    if canned is not None:
+        app_module.kiwoom._tm.transport = app_module.kiwoom._api.transport = canned
+    app_module.hong_scanner.clock = _sim_clock(args.sim_time)
+    app_module.warmup.run()                             # 참조 데이터 · 장중 복원 · 업종 맵 (패널 제외)
+    return app_module, canned
+
+
+def _print_table(results: dict):
+    print(f"{'case':<52} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak KiB':>10} {'calls':>6}")
+    for name, r in results.items():
+        if "skipped" in r:
+            print(f"{name:<52} skipped: {r['skipped']}")
+            continue
+        print(f"{name:<52} {r['opsPerSec'] or 0:>10.1f} {r['p50Ms']:>10.3f} {r['p99Ms']:>10.3f} "
+              f"{r['peakKiB']:>10.1f} {r.get('upstream', ''):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AX RADAR offline benchmarks")
+    parser.add_argument("--filter", default="", help="케이스 이름 부분 일치 (콤마로 여러 개)")
+    parser.add_argument("--scale", type=float, default=1.0, help="반복 수 배율")
+    parser.add_argument("--quick", action="store_true", help="--scale 0.2")
+    parser.add_argument("--symbols", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--sim-time", default="11:00:00", help="합성 시장 고정 시각")
+    parser.add_argument("--scan-codes", type=int, default=30, help="hong.scan 종목 수")
+    parser.add_argument("--cassette", default="", help="합성 응답 대신 재생할 카세트 디렉터리")
+    parser.add_argument("--out", default="", help="결과 JSON 경로 (기본 bench/results/{시각}-{커밋}.json)")
+    parser.add_argument("--compare", default="", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="regression 판정 증가율")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+    scale = 0.2 if args.quick else args.scale
+
+    app_module, canned = _boot(args)
+    if canned is not None:
+        step = max(1, canned.market.n // args.scan_codes)
+        codes = canned.market.codes[::step][:args.scan_codes].tolist()
+    else:
+        codes = list(app_module.kiwoom.ax_universe)[:args.scan_codes] or ["005930", "000660"]
+
+    from .harness import compare, measure
+
+    filters = [f for f in args.filter.split(",") if f]
+    counter = (lambda: canned.calls) if canned is not None else None
+    results = {}
+    t0 = time.perf_counter()
+    for case in build_cases(app_module, canned, codes):
+        if filters and not any(f in case.name for f in filters):
+            continue
+        try:
+            results[case.name] = measure(case, scale, counter)
+        except Exception as e:
+            results[case.name] = {"group": case.group, "skipped": f"{type(e).__name__}: {e}"[:200]}
+        print(f"  {case.name}", file=sys.stderr)
+
+    commit = _git_commit()
+    doc = {
+        "meta": {
+            "commit": commit,
+            "createdAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "source": f"cassette:{args.cassette}" if args.cassette else "canned",
+            "symbols": args.symbols if canned is not None else None,
+            "seed": args.seed,
+            "simTime": args.sim_time,
+            "scale": scale,
+            "elapsedSec": round(time.perf_counter() - t0, 1),
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+
+    _print_table(results)
+    print(f"\nresults → {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(doc, baseline, args.threshold)
+        regressions = [r for r in rows if r["regression"]]
+        print(f"\nvs {args.compare} (commit {baseline.get('meta', {}).get('commit', '?')})")
+        for r in rows:
+            mark = "  REGRESSION" if r["regression"] else ""
+            print(f"{r['name']:<52} {r['metric']:<8} {r['before']:>10} → {r['after']:<10} {r['change']:+.1%}{mark}")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
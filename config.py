@@ -6,16 +6,144 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # ── Flask ──
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 SECRET_KEY = os.getenv("SECRET_KEY", "ax-radar-v3.2-secret")
 REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL", "30000"))
 
+# ── API Response Freshness (초, _cached_api 단일 요청 병합 + 캐시 응답 기준) ──
+# 키 정확 일치 우선, 없으면 접두어(prefix) 일치, 그 외 API_FRESH_TTL_DEFAULT
+API_FRESH_TTL_DEFAULT = int(os.getenv("API_FRESH_TTL_DEFAULT", "25"))
+API_FRESH_TTL = {
+    "indices": 30,
+    "institutions": 60,
+    "stock_": 15,
+    "foreign_top20": 120,
+    "foreign_sector": 60,
+    "ib_sector": 120,
+    "strategy_signals_": 25,
+    "accumulation_radar": 120,
+    "consecutive_buy": 60,
+    "program_top": 25,
+}
+
+# /api/v3/dashboard: 패널별 최대 대기(초) — 초과 패널은 "pending"으로 응답
+DASHBOARD_PANEL_TIMEOUT = float(os.getenv("DASHBOARD_PANEL_TIMEOUT", "8"))
+
+# /api/v3/stream (SSE): 동시 구독 상한 · 구독자별 대기 프레임 수 · 하트비트(초)
+SSE_MAX_CLIENTS = int(os.getenv("SSE_MAX_CLIENTS", "100"))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "64"))
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "15"))
+
+# /metrics (Prometheus 텍스트 형식): 라우트 · api-id별 지연 히스토그램, 오류 · 429 · 캐시 대체 응답 카운터
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# 요청 프로파일링 (opt-in): X-Profile 헤더 = PROFILE_TOKEN 이거나 표본 비율에 걸린 요청을 cProfile로 기록
+# PROFILE_TOKEN 미설정 시 헤더 트리거 · /admin/profiles 비활성 (표본 프로파일은 디스크에만 기록)
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))      # 0~1, 0 = 표본 프로파일 끔
+PROFILE_SAMPLE_PATHS = tuple(p.strip() for p in os.getenv("PROFILE_SAMPLE_PATHS", "/api/").split(",") if p.strip())
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "data", "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))                     # 최근 N건만 보관
+
+# ── KiwoomLogic Cache Engine (LRU + fresh/stale TTL) ──
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# 키 또는 접두어("_"로 끝남) → (fresh TTL 초, stale TTL 초)
+CACHE_POLICY_DEFAULT = (60, 600)
+CACHE_POLICIES = {
+    "market_indices": (60, 600),
+    "nasdaq_index": (120, 1800),
+    "foreign_top20_data": (300, 1800),
+    "foreign_sector_flow": (600, 1800),
+    "ib_sector_flow": (600, 1800),
+    "stock_": (15, 600),
+    "prov_rank_": (25, 120),
+    "top_volume_": (60, 600),
+}
+
+# ── Reference Data Store (업종 맵 · ax_universe · 종목명 디스크 영속화) ──
+REF_DATA_DIR = os.getenv("REF_DATA_DIR", os.path.join(BASE_DIR, "data", "ref"))
+REF_FLUSH_INTERVAL = int(os.getenv("REF_FLUSH_INTERVAL", "60"))   # 종목명 병합분 디스크 기록 간격(초)
+
+# ── Intraday Column Store (장중 시계열 거래일별 기록 · 재기동 시 복원) ──
+INTRADAY_ENABLED = os.getenv("INTRADAY_ENABLED", "true").lower() == "true"
+INTRADAY_DIR = os.getenv("INTRADAY_DIR", os.path.join(BASE_DIR, "data", "intraday"))
+INTRADAY_KEEP_DAYS = int(os.getenv("INTRADAY_KEEP_DAYS", "20"))   # 보관 거래일 수
+
+# ── Record / Replay Cassettes (오프라인 재생 · 성능 회귀 측정) ──
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").lower()         # off | record | replay
+CASSETTE_DIR = os.getenv("CASSETTE_DIR", os.path.join(BASE_DIR, "data", "cassettes", "default"))
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "false").lower() == "true"   # 재생 시 기록된 소요 시간만큼 대기
+CASSETTE_LATENCY_SCALE = float(os.getenv("CASSETTE_LATENCY_SCALE", "1.0"))
+
+# ── Background Refresh Scheduler (패널 사전 계산) ──
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "3"))
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.15"))   # 주기 대비 ±15% 무작위 분산
+# 패널 캐시 키 → (갱신 주기 초, 우선순위 — 작을수록 먼저)
+PANEL_SCHEDULE = {
+    "indices": (30, 0),
+    "program_top": (30, 1),
+    "strategy_signals_0": (30, 1),
+    "institutions": (60, 2),
+    "consecutive_buy": (60, 3),
+    "accumulation_radar": (120, 3),
+    "foreign_sector": (300, 4),
+    "foreign_top20": (300, 4),
+    "ib_sector": (300, 5),
+}
+# 장외 시간(평일 09:30~16:00 외) 전략 스캔 갱신 주기 — 추세 · 기관 가집계 이력은 장중에만 기록
+STRATEGY_OFF_HOURS_INTERVAL = int(os.getenv("STRATEGY_OFF_HOURS_INTERVAL", "1800"))
+
+# ── Startup Warmup (바인드 후 백그라운드 준비 → /readyz) ──
+# false: import 시 자동 시작하지 않음 (벤치마크 · 임베딩용 — warmup.run() 직접 호출)
+#        토큰 선제 갱신 · 스케줄러(SCHEDULER_ENABLED)는 이 값과 무관하게 import 시 시작
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+# 첫 스냅샷을 미리 채울 패널 캐시 키 (기본: 스케줄 대상 전체, 빈 값이면 생략)
+WARMUP_PANELS = tuple(k.strip() for k in os.getenv("WARMUP_PANELS", ",".join(PANEL_SCHEDULE)).split(",") if k.strip())
+WARMUP_MAX_SEC = float(os.getenv("WARMUP_MAX_SEC", "120"))     # 필수 단계(토큰) 재시도 상한 — 초과 시 degraded로 준비 완료
+WARMUP_RETRY_SEC = float(os.getenv("WARMUP_RETRY_SEC", "5"))
+
 # ── Kiwoom REST API ──
 KIWOOM_BASE_URL = os.getenv("KIWOOM_BASE_URL", "https://api.kiwoom.com")
 KIWOOM_APPKEY = os.getenv("KIWOOM_APPKEY", "")
 KIWOOM_SECRETKEY = os.getenv("KIWOOM_SECRETKEY", "")
 
+# ── Token (au10001) ──
+KIWOOM_TOKEN_PATH = os.getenv("KIWOOM_TOKEN_PATH", os.path.join(BASE_DIR, "data", ".kiwoom_token.json"))
+KIWOOM_TOKEN_REFRESH_AHEAD = int(os.getenv("KIWOOM_TOKEN_REFRESH_AHEAD", "1800"))  # 만료 30분 전 선제 갱신
+KIWOOM_TOKEN_RETRY_SEC = int(os.getenv("KIWOOM_TOKEN_RETRY_SEC", "30"))            # 발급 실패 후 재시도 간격
+
+# ── HTTP Connection Pool (keep-alive) ──
+KIWOOM_POOL_CONNECTIONS = int(os.getenv("KIWOOM_POOL_CONNECTIONS", "4"))   # 호스트별 풀 개수
+KIWOOM_POOL_MAXSIZE = int(os.getenv("KIWOOM_POOL_MAXSIZE", "10"))          # 호스트당 유지 소켓 수
+KIWOOM_IO_WORKERS = int(os.getenv("KIWOOM_IO_WORKERS", "8"))               # call_async HTTP 실행 스레드 수
+KIWOOM_MAX_PAGES = int(os.getenv("KIWOOM_MAX_PAGES", "5"))                 # 연속조회(next-key) 최대 페이지 수
+
+# ── Rate Limit (token bucket, KiwoomAPI.call 내부 적용) ──
+# 기본값 3.3회/초 · burst 1 = 기존 time.sleep(0.3) 간격과 동일한 쿼터
+KIWOOM_RATE_LIMIT = float(os.getenv("KIWOOM_RATE_LIMIT", "3.3"))
+KIWOOM_RATE_BURST = int(os.getenv("KIWOOM_RATE_BURST", "1"))
+# api-id별 예산: "ka10008:2,ka10039:1.5:2" (api_id:rate[:burst])
+KIWOOM_RATE_LIMIT_PER_API = {
+    parts[0]: (float(parts[1]), int(parts[2]) if len(parts) > 2 else 1)
+    for parts in (
+        spec.strip().split(":")
+        for spec in os.getenv("KIWOOM_RATE_LIMIT_PER_API", "").split(",")
+        if spec.strip()
+    )
+}
+
+# ── Accumulation Engine ──
+ACCUMULATION_WORKERS = int(os.getenv("ACCUMULATION_WORKERS", "4"))  # ka10008 후보 상세 동시 조회 수
+
+# ── Hong Signal: 기관 가집계 이력 ──
+INST_TALLY_DEPTH = int(os.getenv("INST_TALLY_DEPTH", "30"))       # 종목별 보관 샘플 수
+INST_TALLY_TTL = int(os.getenv("INST_TALLY_TTL", "3600"))         # 이 시간(초) 동안 갱신 없는 종목은 제거
+
 # ── Institution Member Codes (ka10102 confirmed) ──
 INSTITUTION_CODES = {
     "MS": {"code": "036", "name": "Morgan Stanley"},
@@ -6,9 +6,16 @@ ka10036(한도소진율증가상위) + ka10008(외국인종목별매매동향) +
 → Accumulation Score(0~100) 산출.
 """
 import logging
-import time
+from concurrent.futures import as_completed
 from typing import List
 
+import numpy as np
+
+from config import ACCUMULATION_WORKERS
+
+from .aio import ContextExecutor
+from .decoder import Columns, decode
+
 logger = logging.getLogger("accumulation")
 
 # ── Grade Thresholds ──
@@ -86,237 +93,182 @@ class AccumulationEngine:
 
     CANDIDATE_LIMIT = 30  # 상세 조회 최대 종목 수
 
-    def __init__(self, kiwoom_logic):
+    def __init__(self, kiwoom_logic, workers: int = ACCUMULATION_WORKERS):
         """
         Args:
             kiwoom_logic: KiwoomLogic 인스턴스 (기존 modules/kiwoom.py)
+            workers: 후보 상세 조회 동시 실행 수 (쿼터는 KiwoomAPI limiter가 관리)
         """
         self.logic = kiwoom_logic
         self.api = kiwoom_logic._api
-
-    # ── Parsing helper ──
-
-    @staticmethod
-    def _pn(val) -> float:
-        """키움 API 숫자 파싱: '+26.10' → 26.10, '-3441' → -3441.0"""
-        if not val:
-            return 0.0
-        try:
-            return float(str(val).replace("+", "").replace(",", "").strip())
-        except (ValueError, TypeError):
-            return 0.0
-
-    @staticmethod
-    def _clean_code(code: str) -> str:
-        return str(code).replace("_NX", "").replace("_AL", "").strip()
+        self.workers = max(1, workers)
 
     # ── 1차 스크리닝: ka10036 한도소진율증가상위 ──
 
-    def get_exhaustion_surge_stocks(self, market: str = "000", period: str = "5") -> list:
+    def get_exhaustion_surge_stocks(self, market: str = "000", period: str = "5",
+                                    limit: int | None = None) -> list:
+        """limit 지정 시 유효 종목 limit개까지만 연속조회 (이후 페이지 미요청)."""
         body = {"mrkt_tp": market, "dt": period, "stex_tp": "1"}
-        result = self.api.call("ka10036", "/api/dostk/rkinfo", body)
-        items = result.get("for_limit_exh_rt_incrs_upper", [])
-        if not items:
-            for k, v in result.items():
-                if isinstance(v, list) and v and isinstance(v[0], dict):
-                    items = v
-                    break
-        return self._parse_exhaustion_items(items)
+        cols = self.api.decode_pages("ka10036", "/api/dostk/rkinfo", body, limit)
+        rows = cols.records()
+        self.logic._remember_names(rows, "stk_cd", "stk_nm", market)
+        return rows
 
     # ── 2차 상세: ka10008 외국인종목별매매동향 ──
 
+    def get_foreign_weight_columns(self, stk_cd: str) -> Columns:
+        """ka10008 일자별 비중 시계열 (최신일 우선) → 컬럼 (dt, wght, chg_qty, trde_qty, ...)."""
+        result = self.api.call("ka10008", "/api/dostk/frgnistt", {"stk_cd": stk_cd})
+        return decode("ka10008", result)
+
     def get_foreign_weight_history(self, stk_cd: str) -> list:
-        body = {"stk_cd": stk_cd}
-        result = self.api.call("ka10008", "/api/dostk/frgnistt", body)
-        items = result.get("stk_frgnr", [])
-        if not items:
-            for k, v in result.items():
-                if isinstance(v, list) and v and isinstance(v[0], dict):
-                    items = v
-                    break
-        return self._parse_weight_items(items)
+        cols = self.get_foreign_weight_columns(stk_cd)
+        return cols.records()
 
     # ── 3차 보조: ka10034 외인기간별매매상위 ──
 
-    def get_foreign_period_top(self, market: str = "001", period: str = "5") -> list:
+    def get_foreign_period_top(self, market: str = "001", period: str = "5") -> dict:
+        """{종목코드: 순위} (순위 없는 행 제외)."""
         body = {"mrkt_tp": market, "trde_tp": "2", "dt": period, "stex_tp": "1"}
-        result = self.api.call("ka10034", "/api/dostk/rkinfo", body)
-        items = result.get("for_dt_trde_upper", [])
-        if not items:
-            for k, v in result.items():
-                if isinstance(v, list) and v and isinstance(v[0], dict):
-                    items = v
-                    break
-        return items
+        cols = decode("ka10034", self.api.call("ka10034", "/api/dostk/rkinfo", body))
+        cols = cols.take(cols["rank"] > 0)
+        return dict(zip(cols["stk_cd"].tolist(), cols["rank"].tolist()))
 
     # ── 종합 분석 파이프라인 ──
 
     def analyze(self, top_n: int = 15) -> list:
         results = []
 
-        # Step 1: 1차 스크리닝 — 5일 + 20일 한도소진율 증가 종목 합집합
-        try:
-            surge_5d = self.get_exhaustion_surge_stocks(market="000", period="5")
-        except Exception as e:
-            logger.warning(f"ka10036 5d error: {e}")
-            surge_5d = []
+        with ContextExecutor(max_workers=self.workers) as pool:
+            # Step 1: 1차 스크리닝 — 5일 + 20일 한도소진율 증가 + 기간별 순매수 TOP 동시 호출
+            # 후보 순서는 20일 목록이 결정 → 20일은 CANDIDATE_LIMIT행까지만, 5일은 덮어쓰기용 전체
+            f_5d = pool.submit(self.get_exhaustion_surge_stocks, market="000", period="5")
+            f_20d = pool.submit(self.get_exhaustion_surge_stocks, market="000", period="20",
+                                limit=self.CANDIDATE_LIMIT)
+            f_top = pool.submit(self.get_foreign_period_top, market="001", period="5")
+
+            surge_5d = self._result_or(f_5d, [], "ka10036 5d")
+            surge_20d = self._result_or(f_20d, [], "ka10036 20d")
+
+            # 합집합 (5일 데이터 우선)
+            candidates = {}
+            for item in surge_20d + surge_5d:
+                cd = item["stk_cd"]
+                if cd and len(cd) == 6:
+                    if cd not in candidates:
+                        candidates[cd] = item
+                    else:
+                        candidates[cd].update(item)
+
+            if not candidates:
+                logger.warning("Accumulation: no candidates from screening")
+                return []
+
+            # Step 3 (선행 제출): 각 후보 종목 상세 조회 (최대 CANDIDATE_LIMIT개)
+            # 워커 수로 동시성 제한, 실제 호출 간격은 KiwoomAPI 쿼터 limiter가 결정
+            candidate_list = list(candidates.items())[:self.CANDIDATE_LIMIT]
+            futures = {
+                pool.submit(self.get_foreign_weight_columns, stk_cd): (idx, stk_cd, screening_data)
+                for idx, (stk_cd, screening_data) in enumerate(candidate_list)
+            }
+
+            # Step 2: 기간별 순매수 TOP 매핑
+            period_top_map = self._result_or(f_top, {}, "ka10034")
+
+            # Step 3: 도착 순서대로 채점
+            for future in as_completed(futures):
+                idx, stk_cd, screening_data = futures[future]
+                try:
+                    weight_history = future.result()
+                except Exception as e:
+                    logger.debug(f"ka10008 [{stk_cd}] error: {e}")
+                    continue
+
+                entry = self._score_candidate(
+                    stk_cd, screening_data, weight_history, period_top_map.get(stk_cd, 0)
+                )
+                if entry is not None:
+                    results.append((idx, entry))
+
+        # 점수 내림차순 정렬 (동점은 스크리닝 순서 유지) 후 순위 부여
+        results.sort(key=lambda x: (-x[1]["accumulation_score"], x[0]))
+        results = [entry for _, entry in results[:top_n]]
+        for i, item in enumerate(results):
+            item["rank"] = i + 1
 
-        time.sleep(0.3)
+        logger.info(f"Accumulation analysis complete: {len(results)} stocks")
+        return results
 
+    @staticmethod
+    def _result_or(future, default, label: str):
         try:
-            surge_20d = self.get_exhaustion_surge_stocks(market="000", period="20")
-        except Exception as e:
-            logger.warning(f"ka10036 20d error: {e}")
-            surge_20d = []
-
-        # 합집합 (5일 데이터 우선)
-        candidates = {}
-        for item in surge_20d + surge_5d:
-            cd = item["stk_cd"]
-            if cd and len(cd) == 6:
-                if cd not in candidates:
-                    candidates[cd] = item
-                else:
-                    candidates[cd].update(item)
-
-        if not candidates:
-            logger.warning("Accumulation: no candidates from screening")
-            return []
-
-        # Step 2: 기간별 순매수 TOP 매핑
-        time.sleep(0.3)
-        period_top_map = {}
-        try:
-            period_top_5d = self.get_foreign_period_top(market="001", period="5")
-            for item in period_top_5d:
-                cd = self._clean_code(item.get("stk_cd", ""))
-                rank = int(item.get("rank", 0)) if item.get("rank") else 0
-                if cd and len(cd) == 6 and rank > 0:
-                    period_top_map[cd] = rank
+            return future.result()
         except Exception as e:
-            logger.warning(f"ka10034 error: {e}")
-
-        # Step 3: 각 후보 종목 상세 분석 (최대 CANDIDATE_LIMIT개)
-        candidate_list = list(candidates.items())[:self.CANDIDATE_LIMIT]
-
-        for stk_cd, screening_data in candidate_list:
-            time.sleep(0.3)
-
-            try:
-                weight_history = self.get_foreign_weight_history(stk_cd)
-            except Exception as e:
-                logger.debug(f"ka10008 [{stk_cd}] error: {e}")
-                continue
-
-            if not weight_history or len(weight_history) < 2:
-                continue
-
-            # 비중 시계열에서 5일전, 20일전 추출
-            wght_now = weight_history[0]["wght"]
-            wght_5d = weight_history[min(4, len(weight_history) - 1)]["wght"]
-            wght_20d = weight_history[min(19, len(weight_history) - 1)]["wght"]
-
-            # 스파크라인용 최근 비중 추이 (오래된 것부터)
-            sparkline = [h["wght"] for h in reversed(weight_history[:20])]
-
-            # 거래량 대비 매수비중 (최근 1일)
-            latest = weight_history[0]
-            vol_dominance = (
-                abs(latest["chg_qty"]) / latest["trde_qty"]
-                if latest["trde_qty"] > 0
-                else 0
-            )
-
-            # 연속매수일 추정: weight_history에서 chg_qty > 0인 연속일 수
-            consecutive_days = 0
-            for h in weight_history:
-                if h["chg_qty"] > 0:
-                    consecutive_days += 1
-                else:
-                    break
-
-            # 순매수 순위
-            period_rank = period_top_map.get(stk_cd, 0)
-
-            # Score 계산
-            s1 = calc_weight_change_score(wght_now, wght_5d, wght_20d)
-            s2 = calc_exhaustion_score(screening_data["exh_rt_incrs"])
-            s3 = calc_consecutive_score(consecutive_days)
-            s4 = calc_ranking_score(period_rank)
-            s5 = calc_volume_dominance_score(latest["chg_qty"], latest["trde_qty"])
-
-            total_score = s1 + s2 + s3 + s4 + s5
-            grade = get_grade(total_score)
-            signal = SIGNAL_MAP.get(grade, "WATCHING")
-
-            results.append({
-                "stk_cd": stk_cd,
-                "stk_nm": screening_data["stk_nm"],
-                "cur_prc": screening_data["cur_prc"],
-                "pred_pre": screening_data["pred_pre"],
-                "pred_pre_sig": screening_data["pred_pre_sig"],
-                "accumulation_score": round(total_score, 1),
-                "grade": grade,
-                "wght_now": round(wght_now, 2),
-                "wght_5d_ago": round(wght_5d, 2),
-                "wght_20d_ago": round(wght_20d, 2),
-                "wght_change_5d": round(wght_now - wght_5d, 2),
-                "wght_change_20d": round(wght_now - wght_20d, 2),
-                "exh_rt_incrs": screening_data["exh_rt_incrs"],
-                "consecutive_days": consecutive_days,
-                "period_rank": period_rank,
-                "volume_dominance": round(vol_dominance, 4),
-                "detail_scores": {
-                    "weight_change": round(s1, 1),
-                    "exhaustion": round(s2, 1),
-                    "consecutive": round(s3, 1),
-                    "ranking": round(s4, 1),
-                    "volume": round(s5, 1),
-                },
-                "signal": signal,
-                "sparkline": sparkline,
-            })
-
-        # 점수 내림차순 정렬 후 순위 부여
-        results.sort(key=lambda x: x["accumulation_score"], reverse=True)
-        for i, item in enumerate(results[:top_n]):
-            item["rank"] = i + 1
-
-        logger.info(f"Accumulation analysis complete: {len(results[:top_n])} stocks")
-        return results[:top_n]
-
-    # ── 내부 파서 ──
-
-    def _parse_exhaustion_items(self, items: list) -> list:
-        parsed = []
-        for item in items:
-            cd = self._clean_code(item.get("stk_cd", ""))
-            if not cd or len(cd) != 6:
-                continue
-            parsed.append({
-                "rank": int(item.get("rank", 0)) if item.get("rank") else 0,
-                "stk_cd": cd,
-                "stk_nm": str(item.get("stk_nm", "")).strip(),
-                "cur_prc": str(item.get("cur_prc", "0")),
-                "pred_pre_sig": str(item.get("pred_pre_sig", "3")),
-                "pred_pre": str(item.get("pred_pre", "0")),
-                "poss_stkcnt": self._pn(item.get("poss_stkcnt", "0")),
-                "base_limit_exh_rt": self._pn(item.get("base_limit_exh_rt", "0")),
-                "limit_exh_rt": self._pn(item.get("limit_exh_rt", "0")),
-                "exh_rt_incrs": self._pn(item.get("exh_rt_incrs", "0")),
-            })
-        return parsed
-
-    def _parse_weight_items(self, items: list) -> list:
-        parsed = []
-        for item in items:
-            parsed.append({
-                "dt": item.get("dt", ""),
-                "close_pric": self._pn(item.get("close_pric", "0")),
-                "chg_qty": self._pn(item.get("chg_qty", "0")),
-                "trde_qty": self._pn(item.get("trde_qty", "0")),
-                "poss_stkcnt": self._pn(item.get("poss_stkcnt", "0")),
-                "wght": self._pn(item.get("wght", "0")),
-                "limit_exh_rt": self._pn(item.get("limit_exh_rt", "0")),
-            })
-        return parsed
+            logger.warning(f"{label} error: {e}")
+            return default
+
+    def _score_candidate(self, stk_cd: str, screening_data: dict,
+                         weight_history: Columns, period_rank: int) -> dict | None:
+        """ka10008 비중 시계열 컬럼(최신일 우선) + 스크리닝 데이터 → Accumulation Score 항목."""
+        n = len(weight_history)
+        if n < 2:
+            return None
+        wght = weight_history["wght"]
+        chg_qty = weight_history["chg_qty"]
+
+        # 비중 시계열에서 5일전, 20일전 추출
+        wght_now = float(wght[0])
+        wght_5d = float(wght[min(4, n - 1)])
+        wght_20d = float(wght[min(19, n - 1)])
+
+        # 스파크라인용 최근 비중 추이 (오래된 것부터)
+        sparkline = wght[:20][::-1].tolist()
+
+        # 거래량 대비 매수비중 (최근 1일)
+        latest_chg = float(chg_qty[0])
+        latest_trde = float(weight_history["trde_qty"][0])
+        vol_dominance = abs(latest_chg) / latest_trde if latest_trde > 0 else 0
+
+        # 연속매수일 추정: 최신일부터 chg_qty > 0인 연속일 수
+        buying = chg_qty > 0
+        consecutive_days = n if buying.all() else int(np.argmin(buying))
+
+        # Score 계산
+        s1 = calc_weight_change_score(wght_now, wght_5d, wght_20d)
+        s2 = calc_exhaustion_score(screening_data["exh_rt_incrs"])
+        s3 = calc_consecutive_score(consecutive_days)
+        s4 = calc_ranking_score(period_rank)
+        s5 = calc_volume_dominance_score(latest_chg, latest_trde)
+
+        total_score = s1 + s2 + s3 + s4 + s5
+        grade = get_grade(total_score)
+        signal = SIGNAL_MAP.get(grade, "WATCHING")
+
+        return {
+            "stk_cd": stk_cd,
+            "stk_nm": screening_data["stk_nm"] or self.logic.symbols.name(stk_cd),
+            "sector": self.logic.symbols.sector(stk_cd),
+            "cur_prc": screening_data["cur_prc"],
+            "pred_pre": screening_data["pred_pre"],
+            "pred_pre_sig": screening_data["pred_pre_sig"],
+            "accumulation_score": round(total_score, 1),
+            "grade": grade,
+            "wght_now": round(wght_now, 2),
+            "wght_5d_ago": round(wght_5d, 2),
+            "wght_20d_ago": round(wght_20d, 2),
+            "wght_change_5d": round(wght_now - wght_5d, 2),
+            "wght_change_20d": round(wght_now - wght_20d, 2),
+            "exh_rt_incrs": screening_data["exh_rt_incrs"],
+            "consecutive_days": consecutive_days,
+            "period_rank": period_rank,
+            "volume_dominance": round(vol_dominance, 4),
+            "detail_scores": {
+                "weight_change": round(s1, 1),
+                "exhaustion": round(s2, 1),
+                "consecutive": round(s3, 1),
+                "ranking": round(s4, 1),
+                "volume": round(s5, 1),
+            },
+            "signal": signal,
+            "sparkline": sparkline,
+        }
@@ -0,0 +1,61 @@
+"""
+AX RADAR v5.3 - Background Event Loop
+전용 스레드에서 도는 asyncio 이벤트 루프 — 동기 코드(Flask 라우트, 스케줄러)는 run(coro)로 진입.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# True인 컨텍스트(프로파일링 중인 요청)에서는 run()이 공유 루프 대신 호출 스레드의 임시 루프에서 실행
+# → 요청 스레드의 cProfile이 코루틴 실행까지 관측
+inline = contextvars.ContextVar("aio_inline", default=False)
+
+
+class ContextExecutor(ThreadPoolExecutor):
+    """submit 시점의 contextvars를 워커 스레드로 전달 (run_in_executor 경유 포함)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class EventLoopThread:
+    """
+    프로세스 내 asyncio 루프 1개 (첫 사용 시 기동, daemon 스레드).
+
+    run(coro)은 호출 스레드를 블록하고 결과를 반환한다.
+    루프 스레드 안에서 run()을 부르면 교착되므로 RuntimeError — 코루틴 안에서는 await 사용.
+    """
+
+    def __init__(self, name: str = "aio"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, coro):
+        """코루틴 예약 → concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float | None = None):
+        if inline.get():
+            return asyncio.run(asyncio.wait_for(coro, timeout) if timeout else coro)
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("EventLoopThread.run() called from its own loop; await the coroutine instead")
+        return self.submit(coro).result(timeout)
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,65 @@
+"""
+AX RADAR v5.3 - Server-Sent Events Broadcaster
+스냅샷 변경 1회 → SSE 프레임 1회 생성 → 모든 구독자 큐로 팬아웃.
+"""
+import logging
+import queue
+import threading
+
+logger = logging.getLogger("broadcast")
+
+
+def sse_frame(event: str, data: bytes, event_id: str = "") -> bytes:
+    """SSE 프레임 직렬화 (data는 개행 없는 JSON bytes)."""
+    head = f"event: {event}\n"
+    if event_id:
+        head += f"id: {event_id}\n"
+    return head.encode("utf-8") + b"data: " + data + b"\n\n"
+
+
+class Subscriber:
+    """구독자 1명: 프레임 큐 + 종료 플래그 (느린 소비자는 끊고 재접속으로 전체 상태 수신)."""
+
+    __slots__ = ("queue", "closed")
+
+    def __init__(self, maxsize: int):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.closed = False
+
+
+class Broadcaster:
+    def __init__(self, max_clients: int = 100, queue_size: int = 64):
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subs: set = set()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> Subscriber | None:
+        """구독 등록. 상한 초과 시 None (클라이언트는 폴링으로 대체)."""
+        with self._lock:
+            if len(self._subs) >= self.max_clients:
+                return None
+            sub = Subscriber(self.queue_size)
+            self._subs.add(sub)
+            return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        sub.closed = True
+        with self._lock:
+            self._subs.discard(sub)
+
+    def publish(self, frame: bytes):
+        with self._lock:
+            subs = list(self._subs)
+        self.published += 1
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(frame)
+            except queue.Full:
+                self.dropped += 1
+                self.unsubscribe(sub)
+
+    def clients(self) -> int:
+        return len(self._subs)
@@ -0,0 +1,247 @@
+"""
+AX RADAR v5.3 - Cache Engine
+KiwoomLogic 내부 캐시: LRU + 메모리 상한 + 키 계열별 fresh/stale TTL + stale-while-revalidate.
+"""
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from config import CACHE_MAX_BYTES, CACHE_MAX_ENTRIES, CACHE_POLICIES, CACHE_POLICY_DEFAULT
+
+from .singleflight import SingleFlight
+
+logger = logging.getLogger("cache")
+
+
+def approx_size(value, _depth: int = 0) -> int:
+    """dict/list/str 중첩 구조의 대략적인 메모리 크기(bytes)."""
+    size = sys.getsizeof(value)
+    if _depth > 6:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set)):
+        for v in value:
+            size += approx_size(v, _depth + 1)
+    return size
+
+
+class Uncached:
+    """
+    loader 반환값을 저장하지 않고 호출자에게만 돌려줄 때 감싼다 (장 시작 전 빈 응답 등 일시적 결과).
+    get_or_load는 value를 반환하고, 백그라운드 재검증은 기존 값을 유지한다.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _Entry:
+    __slots__ = ("value", "ts", "size", "family", "invalid")
+
+    def __init__(self, value, ts: float, size: int, family: str):
+        self.value = value
+        self.ts = ts
+        self.size = size
+        self.family = family
+        self.invalid = False            # invalidate() 이후: 신선도 조회에서는 miss, 실패 대체용 get()에는 반환
+
+
+class CacheEngine:
+    """
+    키 계열(family)별 정책을 갖는 LRU 캐시.
+
+    정책: CACHE_POLICIES = {키 또는 접두어: (fresh_ttl, stale_ttl)}
+      age <= fresh            → fresh hit
+      fresh < age <= stale    → stale (get_or_load는 즉시 반환 + 백그라운드 재검증)
+      age > stale             → 만료 (삭제)
+
+    상한: max_entries 개 / max_bytes 바이트 초과 시 가장 오래 사용되지 않은 항목부터 제거.
+    miss · invalidate된 키의 get_or_load는 키당 loader 1회 (동시 호출자는 결과 공유).
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 policies: dict | None = None, default_policy: tuple = CACHE_POLICY_DEFAULT):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policies = dict(CACHE_POLICIES if policies is None else policies)
+        self.default_policy = default_policy
+        self._data: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._revalidating: set = set()
+        self._flight = SingleFlight()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-revalidate")
+        self._stats: dict = {}
+
+    # ── 정책 ──
+
+    def family_of(self, key: str) -> str:
+        if key in self.policies:
+            return key
+        for prefix in self.policies:
+            if prefix.endswith("_") and key.startswith(prefix):
+                return prefix
+        return "default"
+
+    def policy(self, family: str) -> tuple:
+        return self.policies.get(family, self.default_policy)
+
+    def _count(self, family: str, field: str):
+        stats = self._stats.get(family)
+        if stats is None:
+            stats = self._stats[family] = {
+                "hits": 0, "staleHits": 0, "misses": 0,
+                "evictions": 0, "expirations": 0, "revalidations": 0,
+            }
+        stats[field] += 1
+
+    # ── 기본 연산 ──
+
+    def set(self, key: str, value):
+        family = self.family_of(key)
+        size = approx_size(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._data[key] = _Entry(value, time.time(), size, family)
+            self._bytes += size
+            self._evict()
+
+    def get(self, key: str, ttl: float | None = None):
+        """
+        ttl 지정 시 age <= ttl 인 경우만 반환 (기존 _get_cache(key, ttl) 의미).
+        ttl 미지정 시 stale TTL 이내면 반환 (실패 시 대체 데이터 용도).
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self._count(self.family_of(key), "misses")
+                return None
+            fresh_ttl, _ = self.policy(entry.family)
+            age = time.time() - entry.ts
+            if ttl is not None and ttl > 0 and (age > ttl or entry.invalid):
+                self._count(entry.family, "misses")
+                return None
+            self._count(entry.family, "hits" if age <= (ttl or fresh_ttl) else "staleHits")
+            return entry.value
+
+    def get_or_load(self, key: str, loader):
+        """
+        Stale-while-revalidate 조회.
+          fresh → 즉시 반환
+          stale → 즉시 반환 + 백그라운드에서 loader() 재실행 (키당 1개)
+          없음/만료/invalidate → loader() 동기 실행 후 저장 (키당 1회, 동시 호출자는 대기 후 공유)
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and not entry.invalid:
+                fresh_ttl, _ = self.policy(entry.family)
+                if time.time() - entry.ts <= fresh_ttl:
+                    self._count(entry.family, "hits")
+                    return entry.value
+                self._count(entry.family, "staleHits")
+                self._revalidate(key, loader)
+                return entry.value
+            self._count(self.family_of(key), "misses")
+
+        def load():
+            value = loader()
+            if isinstance(value, Uncached):
+                return value.value
+            self.set(key, value)
+            return value
+
+        return self._flight.do(key, load)[0]
+
+    def invalidate(self, *keys: str):
+        """다음 get_or_load · get(ttl)이 새로 읽도록 표시. 값은 실패 대체용 get()을 위해 유지."""
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is not None:
+                    entry.invalid = True
+
+    def delete(self, key: str):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def age(self, key: str) -> float | None:
+        with self._lock:
+            entry = self._data.get(key)
+            return None if entry is None else time.time() - entry.ts
+
+    # ── 내부 ──
+
+    def _lookup(self, key: str):
+        """LRU 갱신 + stale TTL 초과 항목 제거. lock 보유 상태에서 호출."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        _, stale_ttl = self.policy(entry.family)
+        if time.time() - entry.ts > stale_ttl:
+            del self._data[key]
+            self._bytes -= entry.size
+            self._count(entry.family, "expirations")
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self._count(entry.family, "evictions")
+
+    def _revalidate(self, key: str, loader):
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+        self._count(self.family_of(key), "revalidations")
+
+        def run():
+            try:
+                value = loader()
+                if not isinstance(value, Uncached):
+                    self.set(key, value)
+            except Exception as e:
+                logger.warning(f"Cache revalidate [{key}] failed: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._pool.submit(run)
+
+    # ── 통계 ──
+
+    def stats(self) -> dict:
+        with self._lock:
+            families = {k: dict(v) for k, v in self._stats.items()}
+            for stats in families.values():
+                total = stats["hits"] + stats["staleHits"] + stats["misses"]
+                stats["hitRatio"] = round((stats["hits"] + stats["staleHits"]) / total, 3) if total else 0.0
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "families": families,
+            }
@@ -0,0 +1,212 @@
+"""
+AX RADAR v5.3 - Record / Replay Cassettes
+실제 응답을 기록해 두었다가 오프라인에서 그대로 재생 (자격 증명 · 장 시간 없이 라우트 실행 · 성능 회귀 측정).
+
+    CASSETTE_MODE=record  → Kiwoom POST · pykrx · yfinance 응답을 {CASSETTE_DIR}/*.jsonl 에 추가 기록
+    CASSETTE_MODE=replay  → 기록본으로 응답 (네트워크 호출 없음), CASSETTE_LATENCY=true 면 기록된 소요 시간만큼 대기
+
+키:
+- Kiwoom: api-id + path + 요청 본문(정렬 JSON) + next-key — 연속조회 페이지도 각각 기록
+- 외부 데이터: 함수명 + 인자
+같은 키가 여러 번 기록되면 순서대로 재생, 소진 후에는 마지막 응답 반복.
+정확히 일치하는 키가 없으면 같은 api-id(함수)의 가장 최근 기록으로 대체 (날짜 인자 등, stats의 loose로 집계).
+
+au10001 토큰 응답은 토큰 값을 가려서 기록 (appkey · secretkey · authorization 헤더는 저장하지 않음).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import CASSETTE_DIR, CASSETTE_LATENCY, CASSETTE_LATENCY_SCALE, CASSETTE_MODE
+
+logger = logging.getLogger("cassette")
+
+REDACTED_TOKEN = "cassette-token"
+
+
+def _key(*parts) -> str:
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24]
+
+
+class CassetteMiss(ConnectionError):
+    """재생 모드에서 기록되지 않은 호출."""
+
+
+class Cassette:
+    def __init__(self, root: str = CASSETTE_DIR, mode: str = CASSETTE_MODE,
+                 latency: bool = CASSETTE_LATENCY, latency_scale: float = CASSETTE_LATENCY_SCALE):
+        self.root = root
+        self.mode = mode if mode in ("record", "replay") else "off"
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._tracks: dict = {}         # key → [episode, ...]
+        self._latest: dict = {}         # group(api-id / 함수명) → 마지막 episode
+        self._cursor: dict = {}
+        self.counts = {"recorded": 0, "played": 0, "loose": 0, "misses": 0}
+        if self.mode == "replay":
+            for name in ("kiwoom", "external"):
+                self._load(name)
+            logger.info(f"Cassette replay: {len(self._tracks)} keys from {self.root}")
+
+    @property
+    def active(self) -> bool:
+        return self.mode != "off"
+
+    # ── 파일 I/O ──
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.jsonl")
+
+    def _load(self, name: str):
+        try:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def _index(self, episode: dict):
+        self._tracks.setdefault(episode["key"], []).append(episode)
+        self._latest[episode["group"]] = episode
+
+    def _append(self, name: str, episode: dict):
+        line = json.dumps(episode, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self._path(name), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._index(episode)
+            self.counts["recorded"] += 1
+
+    # ── 재생 ──
+
+    def _play(self, key: str, group: str) -> dict:
+        with self._lock:
+            track = self._tracks.get(key)
+            if track:
+                i = self._cursor.get(key, 0)
+                self._cursor[key] = i + 1
+                episode = track[min(i, len(track) - 1)]
+                self.counts["played"] += 1
+            else:
+                episode = self._latest.get(group)
+                if episode is None:
+                    self.counts["misses"] += 1
+                    raise CassetteMiss(f"No cassette recording for {group}")
+                self.counts["loose"] += 1
+        if self.latency and episode.get("elapsed"):
+            time.sleep(episode["elapsed"] * self.latency_scale)
+        return episode
+
+    # ── 외부 데이터 (pykrx · yfinance DataFrame) ──
+
+    def frame(self, name: str, args: tuple, loader):
+        """loader() 결과 DataFrame을 기록/재생. off 모드면 loader() 그대로."""
+        if self.mode == "off":
+            return loader()
+        key = _key(name, args)
+        if self.mode == "replay":
+            return _frame_from_json(self._play(key, name)["frame"])
+        t0 = time.perf_counter()
+        df = loader()
+        elapsed = time.perf_counter() - t0
+        self._append("external", {
+            "key": key, "group": name, "args": list(args), "elapsed": round(elapsed, 4),
+            "frame": _frame_to_json(df),
+        })
+        return df
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "root": self.root, "latency": self.latency, "keys": len(self._tracks), **self.counts}
+
+
+def _frame_to_json(df) -> str:
+    return df.to_json(orient="split", date_format="iso", force_ascii=False)
+
+
+def _frame_from_json(doc: str):
+    from io import StringIO
+
+    import pandas as pd
+    # 종목코드 인덱스("005930")가 숫자로 바뀌지 않도록 축 · 값 변환 없이 복원
+    return pd.read_json(StringIO(doc), orient="split", dtype=False, convert_axes=False)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Kiwoom transport
+# ═══════════════════════════════════════════════════════════════════
+
+class CassetteResponse:
+    """재생용 응답 — KiwoomAPI · TokenManager가 쓰는 requests.Response 일부만 구현."""
+
+    def __init__(self, status_code: int, headers: dict, body, url: str = ""):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self._body = body
+        self.url = url
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("Recorded response has no JSON body")
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error (cassette) for url: {self.url}", response=self)
+
+
+class CassetteTransport:
+    """PooledTransport 대체: post()를 기록하거나 기록본으로 응답."""
+
+    def __init__(self, inner, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    @staticmethod
+    def _request_key(api_id: str, path: str, headers: dict, body) -> str:
+        if api_id == "au10001":
+            return _key(api_id, path)     # 자격 증명은 키에 넣지 않음
+        return _key(api_id, path, body, headers.get("next-key", ""))
+
+    def post(self, url: str, headers: dict | None = None, json=None, **kwargs):
+        headers = headers or {}
+        api_id = headers.get("api-id", "")
+        path = "/" + url.split("://", 1)[-1].split("/", 1)[-1]
+        key = self._request_key(api_id, path, headers, json)
+        if self.cassette.mode == "replay":
+            ep = self.cassette._play(key, api_id)
+            return CassetteResponse(ep["status"], ep["headers"], ep["body"], url)
+
+        t0 = time.perf_counter()
+        resp = self.inner.post(url, headers=headers, json=json, **kwargs)
+        elapsed = time.perf_counter() - t0
+        try:
+            body = resp.json()
+        except ValueError:
+            body = None
+        if api_id == "au10001" and isinstance(body, dict):
+            body = {**body, "token": REDACTED_TOKEN, "expires_dt": "20991231235959"}
+        self.cassette._append("kiwoom", {
+            "key": key, "group": api_id, "path": path,
+            "body_in": None if api_id == "au10001" else json,
+            "status": resp.status_code,
+            "headers": {k: resp.headers.get(k, "") for k in ("cont-yn", "next-key") if k in resp.headers},
+            "body": body,
+            "elapsed": round(elapsed, 4),
+        })
+        return resp
+
+    def stats(self) -> dict:
+        return self.inner.stats()
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,303 @@
+"""
+AX RADAR v5.3 - Kiwoom Row Decoder
+api-id별 스키마로 응답 행 목록을 NumPy 컬럼으로 일괄 변환.
+
+    cols = decode("ka10032", data)          # data: 응답 본문 dict 또는 행 list
+    cols["trde_prica"]                      # np.int64 배열 (유효 종목코드 행만)
+    cols.records({"code": "stk_cd", "amount": amount_array})
+
+- 필드 값 추출은 map(dict.get, rows, ...) 1회 — 행별 Python 루프 없음
+- 숫자: "+1,234" / "-3441" / "26.10" → 열을 한 문자열로 결합해 콤마 · "+" 일괄 제거 → map(int/float)
+- 종목코드: _AL / _NX 접미사 제거 + 6자리 영숫자 검증 → 불량 행은 전 컬럼에서 제외
+- 문자열 열은 object 배열 (원본 str 재사용), 열 전체 변환이 실패하면(비정형 값 혼입) 해당 열만 행별 파서로 대체
+"""
+from itertools import repeat
+
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════
+#  Scalar parsers (행별 대체 경로 · 단건 응답용)
+# ═══════════════════════════════════════════════════════════════════
+
+
+def parse_int(val) -> int:
+    if not val:
+        return 0
+    try:
+        s = str(val).replace(",", "").replace("+", "").strip()
+        neg = s.startswith("-")
+        s = s.replace("-", "")
+        if not s:
+            return 0
+        return -int(s) if neg else int(s)
+    except (ValueError, TypeError):
+        return 0
+
+
+def parse_float(val) -> float:
+    if not val:
+        return 0.0
+    try:
+        return float(str(val).replace(",", "").replace("+", "").strip())
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def clean_code(code) -> str:
+    return str(code).replace("_AL", "").replace("_NX", "").strip()
+
+
+def extract_items(data: dict, key: str = "") -> list:
+    """응답 본문의 행 목록: key 필드 우선, 없으면 첫 번째 list[dict] 필드."""
+    items = data.get(key, []) if key else []
+    if not items:
+        for v in data.values():
+            if isinstance(v, list) and v and isinstance(v[0], dict):
+                return v
+    return items
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Schema
+# ═══════════════════════════════════════════════════════════════════
+
+class Field:
+    """
+    컬럼 1개.
+      kind: "code" | "str" | "int" | "abs_int" | "float"
+      keys: 원본 필드명 (앞에서부터 존재하는 첫 키 사용 — 응답 버전별 필드명 차이 대응)
+    """
+
+    __slots__ = ("name", "kind", "keys")
+
+    def __init__(self, name: str, kind: str, *alts: str):
+        self.name = name
+        self.kind = kind
+        self.keys = (name,) + alts
+
+
+class Schema:
+    __slots__ = ("key", "fields")
+
+    def __init__(self, key: str, *fields: Field):
+        self.key = key
+        self.fields = fields
+
+
+F = Field
+
+SCHEMAS = {
+    # 기관별 매매 상위
+    "ka10039": Schema(
+        "sec_trde_upper",
+        F("stk_cd", "code"), F("stk_nm", "str"), F("netprps_amt", "int"), F("flu_rt", "float"),
+    ),
+    # 투자자별 가집계 순매수 상위 (rkinfo)
+    "ka10065": Schema(
+        "opmr_invsr_trde_upper",
+        F("stk_cd", "code"), F("stk_nm", "str"),
+        F("buy_qty", "int"), F("sel_qty", "int"), F("netslmt", "int"),
+    ),
+    # 거래대금 상위
+    "ka10032": Schema(
+        "trde_prica_upper",
+        F("stk_cd", "code"), F("stk_nm", "str"),
+        F("trde_prica", "int", "trde_amt", "trde_val"),
+        F("cur_prc", "abs_int", "prc"), F("flu_rt", "float"),
+    ),
+    # 프로그램 순매수 상위 50
+    "ka90003": Schema(
+        "prm_netprps_upper_50",
+        F("stk_cd", "code"), F("stk_nm", "str"),
+        F("cur_prc", "abs_int"), F("flu_rt", "float"), F("prm_netprps_amt", "float"),
+    ),
+    # 외인 연속 순매매 상위
+    "ka10035": Schema(
+        "for_cont_nettrde_upper",
+        F("stk_cd", "code"), F("stk_nm", "str"), F("pred_pre_sig", "str"),
+        F("cur_prc", "abs_int"), F("pred_pre", "int"),
+        F("dm1", "int"), F("dm2", "int"), F("dm3", "int"), F("tot", "int"),
+        F("limit_exh_rt", "float"),
+    ),
+    # 업종별 투자자 순매수
+    "ka10051": Schema(
+        "inds_netprps",
+        F("inds_nm", "str"), F("frgnr_netprps", "int"), F("orgn_netprps", "int"),
+    ),
+    # 업종별 종목 시세
+    "ka20002": Schema(
+        "inds_stkpc",
+        F("stk_cd", "code"), F("stk_nm", "str"),
+    ),
+    # 외국인 한도소진율 증가 상위
+    "ka10036": Schema(
+        "for_limit_exh_rt_incrs_upper",
+        F("stk_cd", "code"), F("stk_nm", "str"), F("rank", "int"),
+        F("cur_prc", "str"), F("pred_pre_sig", "str"), F("pred_pre", "str"),
+        F("poss_stkcnt", "float"), F("base_limit_exh_rt", "float"),
+        F("limit_exh_rt", "float"), F("exh_rt_incrs", "float"),
+    ),
+    # 외국인 종목별 매매동향 (일자별)
+    "ka10008": Schema(
+        "stk_frgnr",
+        F("dt", "str"), F("close_pric", "float"), F("chg_qty", "float"), F("trde_qty", "float"),
+        F("poss_stkcnt", "float"), F("wght", "float"), F("limit_exh_rt", "float"),
+    ),
+    # 외인 기간별 매매 상위
+    "ka10034": Schema(
+        "for_dt_trde_upper",
+        F("stk_cd", "code"), F("rank", "int"),
+    ),
+}
+
+_DEFAULTS = {"code": "", "str": "", "int": "0", "abs_int": "0", "float": "0"}
+_DTYPES = {"code": object, "str": object, "int": np.int64, "abs_int": np.int64, "float": np.float64}
+_STR_DEFAULTS = {"pred_pre_sig": "3", "cur_prc": "0", "pred_pre": "0"}   # 문자열 유지 필드의 기본값
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Columns
+# ═══════════════════════════════════════════════════════════════════
+
+class Columns:
+    """
+    디코딩 결과: 이름 → ndarray (모두 같은 길이).
+    index = 원본 행 목록에서의 위치 (순위 산정 등 원본 순서가 필요할 때), total = 원본 행 수.
+    """
+
+    __slots__ = ("data", "index", "total")
+
+    def __init__(self, data: dict, index: np.ndarray, total: int | None = None):
+        self.data = data
+        self.index = index
+        self.total = len(index) if total is None else total
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.data
+
+    def take(self, idx) -> "Columns":
+        """행 선택 (slice / 정수 배열 / bool 마스크)."""
+        return Columns({k: v[idx] for k, v in self.data.items()}, self.index[idx], self.total)
+
+    def records(self, mapping: dict | None = None) -> list:
+        """
+        JSON 직렬화 가능한 dict 목록.
+        mapping: 출력 키 → 컬럼명 또는 같은 길이 배열 (미지정 시 전 컬럼을 원래 이름으로).
+        """
+        if mapping is None:
+            mapping = {name: name for name in self.data}
+        keys = list(mapping)
+        cols = [(self.data[v] if isinstance(v, str) else v).tolist() for v in mapping.values()]
+        return list(map(dict, map(zip, repeat(keys), zip(*cols))))
+
+    @staticmethod
+    def concat(parts: list) -> "Columns":
+        """페이지별 Columns 병합 (index는 전체 행 기준 위치로 이어 붙임)."""
+        if not parts:
+            return Columns({}, np.empty(0, dtype=np.int64))
+        if len(parts) == 1:
+            return parts[0]
+        offsets = np.cumsum([0] + [p.total for p in parts[:-1]])
+        data = {k: np.concatenate([p.data[k] for p in parts]) for k in parts[0].data}
+        index = np.concatenate([p.index + off for p, off in zip(parts, offsets)])
+        return Columns(data, index, sum(p.total for p in parts))
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Decode
+# ═══════════════════════════════════════════════════════════════════
+
+_SEP = "\x1f"                                   # 열 결합 구분자 (응답 값에 나오지 않는 제어 문자)
+_SIGNS = str.maketrans("", "", ",+")
+_MISSING = object()
+
+
+def _column(rows: list, keys: tuple, default: str) -> list:
+    """
+    필드 1개의 원본 값 목록 — 앞에서부터 존재하는 첫 키, 값이 비었으면 default.
+    dict.get을 map으로 열 전체에 적용 (행별 Python 프레임 없음), 대체 키는 빠진 행에만.
+    """
+    vals = list(map(dict.get, rows, repeat(keys[0]), repeat(_MISSING)))
+    for alt in keys[1:]:
+        missing = [i for i, v in enumerate(vals) if v is _MISSING]
+        if not missing:
+            break
+        for i in missing:
+            vals[i] = rows[i].get(alt, _MISSING)
+    if _MISSING not in vals and all(vals):
+        return vals if all(type(v) is str for v in vals) else [str(v) for v in vals]
+    return [str(v) if v and v is not _MISSING else default for v in vals]
+
+
+def _numeric(vals: list, kind: str) -> np.ndarray:
+    """열 결합 → 콤마 · "+" 일괄 제거 → int/float 변환 1회 (map, C 루프)."""
+    cast, dtype = (float, np.float64) if kind == "float" else (int, np.int64)
+    try:
+        tokens = _SEP.join(vals).translate(_SIGNS).split(_SEP)
+        if len(tokens) != len(vals):
+            raise ValueError("separator in value")
+        if "" in tokens:
+            tokens = [t or "0" for t in tokens]
+        out = np.fromiter(map(cast, tokens), dtype=dtype, count=len(tokens))
+    except (ValueError, OverflowError):
+        # "--1234" · "12.5" · 공백만 있는 값 등 비정형 값 → 행별 파서 (기존 _parse_int/_parse_float 의미 유지)
+        parse = parse_float if kind == "float" else parse_int
+        out = np.fromiter(map(parse, vals), dtype=dtype, count=len(vals))
+    return np.abs(out) if kind == "abs_int" else out
+
+
+def _codes(vals: list) -> tuple:
+    """_AL / _NX 접미사 제거 → (코드 목록, 6자리 영숫자 마스크)."""
+    text = _SEP.join(vals)
+    if "_" in text:
+        text = text.replace("_AL", "").replace("_NX", "")
+    codes = list(map(str.strip, text.split(_SEP)))
+    n = len(vals)
+    if len(codes) != n:                         # 값에 구분자 포함 → 행별
+        codes = [clean_code(v) for v in vals]
+    valid = (np.fromiter(map(len, codes), dtype=np.int64, count=n) == 6) \
+        & np.fromiter(map(str.isalnum, codes), dtype=bool, count=n)
+    return codes, valid
+
+
+def _objects(vals: list) -> np.ndarray:
+    """문자열 열 → object 배열 (원본 str 객체 그대로 — 고정폭 유니코드 변환 · tolist 재생성 비용 없음)."""
+    out = np.empty(len(vals), dtype=object)
+    out[:] = vals
+    return out
+
+
+def decode(api_id: str, payload) -> Columns:
+    """응답 본문(dict) 또는 행 목록(list) → Columns. 스키마에 없는 api-id는 KeyError."""
+    schema = SCHEMAS[api_id]
+    rows = extract_items(payload, schema.key) if isinstance(payload, dict) else list(payload)
+    n = len(rows)
+    if not n:
+        return Columns({f.name: np.empty(0, dtype=_DTYPES[f.kind]) for f in schema.fields},
+                       np.empty(0, dtype=np.int64), 0)
+    data = {}
+    mask = None
+    for field in schema.fields:
+        default = _STR_DEFAULTS.get(field.name, "") if field.kind == "str" else _DEFAULTS[field.kind]
+        vals = _column(rows, field.keys, default)
+        if field.kind == "code":
+            codes, valid = _codes(vals)
+            col = _objects(codes)
+            mask = valid if mask is None else mask & valid
+        elif field.kind == "str":
+            col = _objects(list(map(str.strip, vals)))
+        else:
+            col = _numeric(vals, field.kind)
+        data[field.name] = col
+
+    index = np.arange(n)
+    if mask is not None and not mask.all():
+        index = index[mask]
+        data = {k: v[mask] for k, v in data.items()}
+    return Columns(data, index, n)
@@ -0,0 +1,77 @@
+"""
+AX RADAR v5.3 - JSON Response Encoding
+응답 본문 직렬화 1회 + content-hash ETag + 압축본(gzip/br) 캐시.
+
+brotli는 선택 의존성: 설치되어 있으면 br, 없으면 gzip만 협상.
+"""
+import gzip
+import hashlib
+import json
+import threading
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+MIN_COMPRESS_BYTES = 512   # 이보다 작은 본문은 압축 이득 없음
+
+
+def dumps(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def content_etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+
+def negotiate(accept_encoding: str, size: int) -> str:
+    """Accept-Encoding → "br" / "gzip" / "identity" (q=0 제외)."""
+    if size < MIN_COMPRESS_BYTES or not accept_encoding:
+        return "identity"
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(token)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return "identity"
+
+
+class EncodedBody:
+    """
+    캐시 쓰기 1회당 한 번 만들어지는 응답 본문.
+
+    body / etag는 생성 시 계산, 압축본은 첫 요청 시 만들어 보관한다
+    (읽지 않는 패널은 압축 비용을 내지 않음).
+    """
+
+    __slots__ = ("body", "etag", "_variants", "_lock")
+
+    def __init__(self, payload):
+        self.body = dumps(payload)
+        self.etag = content_etag(self.body)
+        self._variants = {"identity": self.body}
+        self._lock = threading.Lock()
+
+    def get(self, encoding: str) -> bytes:
+        data = self._variants.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self._variants.get(encoding)
+                if data is None:
+                    data = self._variants[encoding] = compress(self.body, encoding)
+        return data
@@ -14,11 +14,17 @@ Signal 2: 기관 가집계 순매수 증가 (ka10065)
 Combined: 프로그램 기울기 양전환 + 기관 가집계 증가 = 매수 후보
 ═══════════════════════════════════════════════════════════════════
 """
+import asyncio
 import logging
+import threading
 import time
 from collections import defaultdict, deque
 from datetime import datetime
 
+from config import INST_TALLY_DEPTH, INST_TALLY_TTL
+from .intraday import batches
+from .tally import InstTallyStore
+
 logger = logging.getLogger("hong_signal")
 
 
@@ -42,6 +48,86 @@ def calc_slope(values: list, window: int = 10) -> float:
     return numer / denom if denom != 0 else 0.0
 
 
+class RollingSlope:
+    """
+    고정 구간 선형회귀 기울기 — 샘플 1개당 O(1) 갱신.
+
+    구간 내 x = 0..n-1 에 대해 S = Σy, T = Σi·y 만 유지:
+      slope = (T - x̄·S) / Σ(i - x̄)²,  Σ(i - x̄)² = n(n²-1)/12
+    구간이 가득 찬 뒤 가장 오래된 y0가 빠지면 나머지 인덱스가 1씩 당겨지므로
+    T ← T - (S - y0). 정수 입력이면 S/T도 정수로 유지되어 누적 오차 없음.
+    calc_slope(values, window)와 같은 값을 낸다.
+    """
+
+    __slots__ = ("window", "_buf", "_s", "_t")
+
+    def __init__(self, window: int):
+        self.window = max(2, int(window))
+        self._buf = deque(maxlen=self.window)
+        self._s = 0
+        self._t = 0
+
+    def push(self, y) -> float:
+        buf = self._buf
+        i = len(buf)                # 새 샘플의 인덱스
+        if i == self.window:
+            y0 = buf[0]             # append 시 deque가 밀어낼 값
+            self._t -= self._s - y0
+            self._s -= y0
+            i -= 1
+        self._t += i * y
+        self._s += y
+        buf.append(y)
+        return self.slope
+
+    @property
+    def slope(self) -> float:
+        n = len(self._buf)
+        if n < 2:
+            return 0.0
+        denom = n * (n * n - 1) / 12.0
+        return (self._t - (n - 1) / 2.0 * self._s) / denom
+
+
+class TrendTracker:
+    """
+    시장(mrkt_tp) 1개의 프로그램 순매수 시계열 추세.
+
+    windows[0]이 기본 기울기 구간. 구간별 기울기 이력을 보관하여
+    가속도 = 현재 기울기 - 한 구간 전 기울기 (이력이 짧으면 가장 오래된 값과 비교).
+    """
+
+    def __init__(self, windows: tuple, history: int = 60):
+        self.windows = tuple(dict.fromkeys(max(2, int(w)) for w in windows))
+        self._fits = {w: RollingSlope(w) for w in self.windows}
+        self._slopes = {w: deque(maxlen=w) for w in self.windows}   # hist[0] = 한 구간(w샘플) 전 기울기
+        self.history = history
+        self.count = 0
+        self.latest = 0
+        self._last: dict = {}
+        self._lock = threading.Lock()
+
+    def push(self, y) -> tuple:
+        """샘플 추가 → (누적 포인트 수, {window: (slope, acceleration)})."""
+        with self._lock:
+            self.count = min(self.count + 1, self.history)
+            self.latest = y
+            out = {}
+            for w, fit in self._fits.items():
+                slope = fit.push(y)
+                hist = self._slopes[w]
+                accel = slope - hist[0] if hist else 0.0
+                hist.append(slope)
+                out[w] = (slope, accel)
+            self._last = out
+            return self.count, out
+
+    def peek(self) -> tuple:
+        """샘플 추가 없이 마지막 push() 결과 조회 (장외 시간 스캔용)."""
+        with self._lock:
+            return self.count, dict(self._last)
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  HongSignalScanner
 # ═══════════════════════════════════════════════════════════════════
@@ -74,27 +160,40 @@ class HongSignalScanner:
         }
     """
 
-    def __init__(self, kiwoom_logic):
+    def __init__(self, kiwoom_logic, journal=None, clock=None):
+        """
+        journal: IntradayStore — 지정 시 스캔마다 시계열 기록, rehydrate()로 당일 상태 복원.
+        clock:   현재 시각(epoch 초) 함수 — 기본 time.time, 리플레이 시 기록 시각 주입.
+        """
         self.kiwoom = kiwoom_logic
+        self.journal = journal
+        self.clock = clock or time.time
 
-        # ── 기관 가집계 이력 저장소 (종목별) ──
-        self._inst_history = defaultdict(lambda: deque(maxlen=30))
-        self._inst_ts = defaultdict(lambda: deque(maxlen=30))
+        # ── 기관 가집계 이력 저장소 (종목별 링버퍼, 비활성 종목 자동 제거) ──
+        self._inst_tally = InstTallyStore(depth=INST_TALLY_DEPTH, ttl=INST_TALLY_TTL)
 
         # ═══════════════ 전략 파라미터 (튜닝 가능) ═══════════════
         self.program_slope_window = 10      # 기울기 계산 구간 (시간대 포인트 수)
+        self.program_slope_windows = (30,)  # 추가 기울기 구간 (응답 slopes 필드)
         self.inst_increase_count = 3        # 기관 가집계 연속 증가 판정 기준
         self.min_inst_net = 500             # 최소 기관 순매수 수량(주) 필터
         self.min_sector_count = 3           # 주도 섹터 판정: 동일 업종 최소 종목 수
 
+        # ── 프로그램 순매수 추세 (시장별 — KOSPI/KOSDAQ 샘플 분리) ──
+        self._prog_trends: dict = {}
+        self._prog_lock = threading.Lock()
+
     # ═══════════════════════════════════════════════════════════════
     #  Phase 1: 프로그램 매수 기울기 분석 (ka90005)
     # ═══════════════════════════════════════════════════════════════
 
-    def get_program_slope(self, mrkt_tp: str = "0") -> dict:
+    def get_program_slope(self, mrkt_tp: str = "0", prog_ranking: list | None = None,
+                          record: bool = True) -> dict:
         """
         프로그램 순매수 기울기 분석.
         ka10065 orgn_tp=9000 (프로그램 가집계 랭킹) 총 순매수를 추적하여 기울기 산출.
+        prog_ranking 지정 시 해당 랭킹 사용 (호출부에서 이미 조회한 경우).
+        record=False면 추세 · 장중 기록에 샘플을 넣지 않고 마지막 기울기만 조회 (장외 시간).
 
         Returns:
             slope      — 기울기 값 (양수=매수세 유입)
@@ -102,25 +201,30 @@ class HongSignalScanner:
             cumNet     — 프로그램 총 순매수
             trend      — ACCELERATING / POSITIVE / FLAT / NEGATIVE / COLLECTING / NO_DATA
             dataPoints — 분석 데이터 포인트 수
+            acceleration — 기본 구간 기울기의 한 구간 전 대비 변화
+            slopes     — 구간별 기울기 {"10": ..., "30": ...}
         """
         # ── ka10065 프로그램 가집계 랭킹 ──
-        try:
-            prog_ranking = self.kiwoom.get_provisional_ranking(
-                orgn_tp="9000", trde_tp="1", mrkt_tp=mrkt_tp
-            )
-        except Exception as e:
-            logger.warning(f"Program ranking error: {e}")
-            prog_ranking = []
+        if prog_ranking is None:
+            try:
+                prog_ranking = self.kiwoom.get_provisional_ranking(
+                    orgn_tp="9000", trde_tp="1", mrkt_tp=mrkt_tp
+                )
+            except Exception as e:
+                logger.warning(f"Program ranking error: {e}")
+                prog_ranking = []
 
         # 총 프로그램 순매수 계산
         total_net = sum(s["netQty"] for s in prog_ranking) if prog_ranking else 0
 
-        # 시계열 추적
-        if not hasattr(self, "_prog_history"):
-            self._prog_history = deque(maxlen=60)
-        self._prog_history.append(total_net)
-
-        cum_values = list(self._prog_history)
+        # 시계열 추적 (시장별, 샘플당 O(1) 갱신)
+        tracker = self._program_trend(mrkt_tp)
+        if record:
+            data_points, fits = tracker.push(total_net)
+            if self.journal is not None:
+                self.journal.append_program(mrkt_tp, self.clock(), total_net)
+        else:
+            data_points, fits = tracker.peek()
 
         if not prog_ranking:
             return {
@@ -128,22 +232,15 @@ class HongSignalScanner:
                 "latestNet": 0, "dataPoints": 0, "trend": "NO_DATA",
             }
 
-        if len(cum_values) < 2:
+        if data_points < 2 or not fits:
             return {
                 "slope": 0, "positive": total_net > 0, "cumNet": total_net,
                 "latestNet": total_net, "dataPoints": 1, "trend": "COLLECTING",
             }
 
-        # ── 기울기 계산 ──
-        slope = calc_slope(cum_values, self.program_slope_window)
-
-        # ── 가속도 판정: 전반부 vs 후반부 기울기 비교 ──
-        accelerating = False
-        if len(cum_values) > self.program_slope_window:
-            half = len(cum_values) // 2
-            slope_1st = calc_slope(cum_values[:half], min(half, self.program_slope_window))
-            slope_2nd = calc_slope(cum_values[half:], min(len(cum_values) - half, self.program_slope_window))
-            accelerating = slope_2nd > slope_1st and slope_2nd > 0
+        # ── 기울기 · 가속도 (기본 구간) ──
+        slope, accel = fits[tracker.windows[0]]
+        accelerating = data_points > tracker.windows[0] and accel > 0 and slope > 0
 
         # ── 추세 판정 ──
         if accelerating:
@@ -160,10 +257,31 @@ class HongSignalScanner:
             "positive": slope > 0,
             "cumNet": total_net,
             "latestNet": total_net,
-            "dataPoints": len(cum_values),
+            "dataPoints": data_points,
             "trend": trend,
+            "acceleration": round(accel, 2),
+            "slopes": {str(w): round(v[0], 2) for w, v in fits.items()},
         }
 
+    def _program_trend(self, mrkt_tp: str) -> TrendTracker:
+        trend = self._prog_trends.get(mrkt_tp)
+        if trend is None:
+            with self._prog_lock:
+                trend = self._prog_trends.get(mrkt_tp)
+                if trend is None:
+                    windows = (self.program_slope_window, *self.program_slope_windows)
+                    trend = self._prog_trends[mrkt_tp] = TrendTracker(windows)
+        return trend
+
+    def is_market_hours(self, ts: float | None = None) -> bool:
+        """평일 09:30 ~ 16:00 (scanner clock 기준)."""
+        now = datetime.fromtimestamp(self.clock() if ts is None else ts)
+        return (
+            now.weekday() < 5
+            and now.hour >= 9 and (now.hour > 9 or now.minute >= 30)
+            and now.hour < 16
+        )
+
     # ═══════════════════════════════════════════════════════════════
     #  Phase 2: 기관 가집계 추적 (ka10065)
     # ═══════════════════════════════════════════════════════════════
@@ -184,47 +302,78 @@ class HongSignalScanner:
             ...
         }
         """
-        results = {}
-        now = time.time()
+        results = dict.fromkeys(stock_codes)
+        fetched = {}
 
-        for code in stock_codes:
+        for code in results:
             try:
-                prov = self.kiwoom.get_inst_provisional(code)
-                inst_net = prov["instNet"]
-
-                history = self._inst_history[code]
-                ts_history = self._inst_ts[code]
-
-                # 이전 값 대비 변화량
-                delta = inst_net - history[-1] if history else 0
-
-                history.append(inst_net)
-                ts_history.append(now)
-
-                # 연속 증가 횟수 계산 (뒤에서부터 탐색)
-                consecutive = 0
-                vals = list(history)
-                for i in range(len(vals) - 1, 0, -1):
-                    if vals[i] > vals[i - 1]:
-                        consecutive += 1
-                    else:
-                        break
-
-                results[code] = {
-                    "instNet": inst_net,
-                    "foreignNet": prov["foreignNet"],
-                    "programNet": prov["programNet"],
-                    "delta": delta,
-                    "consecutive": consecutive,
-                    "increasing": consecutive >= self.inst_increase_count,
-                    "samples": len(history),
-                }
+                fetched[code] = self.kiwoom.get_inst_provisional(code)
             except Exception as e:
                 logger.warning(f"ka10065 [{code}] error: {e}")
                 results[code] = {"error": str(e)}
 
+        # 이력 기록 + 변화량 · 연속 증가 횟수 일괄 계산
+        codes = list(fetched)
+        tally = self._record_inst(codes, [fetched[c]["instNet"] for c in codes])
+        for code, delta, consecutive, samples in zip(
+            codes, tally["delta"].tolist(), tally["consecutive"].tolist(), tally["samples"].tolist()
+        ):
+            prov = fetched[code]
+            results[code] = {
+                "instNet": prov["instNet"],
+                "foreignNet": prov["foreignNet"],
+                "programNet": prov["programNet"],
+                "delta": delta,
+                "consecutive": consecutive,
+                "increasing": consecutive >= self.inst_increase_count,
+                "samples": samples,
+            }
+
         return results
 
+    def _record_inst(self, codes: list, nets: list, now: float | None = None) -> dict:
+        """기관 가집계 배치 1회 → 이력 저장소 + 장중 기록."""
+        now = self.clock() if now is None else now
+        tally = self._inst_tally.record(codes, nets, now=now)
+        if self.journal is not None and codes:
+            self.journal.append_inst(now, codes, nets)
+        return tally
+
+    # ═══════════════════════════════════════════════════════════════
+    #  재기동 복원 (IntradayStore)
+    # ═══════════════════════════════════════════════════════════════
+
+    def rehydrate(self, day: str | None = None) -> dict:
+        """당일 기록을 순서대로 다시 넣어 프로그램 추세 · 기관 가집계 이력 복원."""
+        if self.journal is None:
+            return {}
+        t0 = time.perf_counter()
+        points = 0
+        for table in self.journal.tables(day):
+            if not table.startswith("program_"):
+                continue
+            tracker = self._program_trend(table[len("program_"):])
+            for net in self.journal.read(table, day)["net"].tolist():
+                tracker.push(net)
+                points += 1
+
+        inst = self.journal.read("inst", day)
+        codes = inst["code"].astype(str).tolist()
+        nets = inst["net"].tolist()
+        spans = batches(inst["ts"])
+        for start, end in spans:
+            batch = dict(zip(codes[start:end], nets[start:end]))
+            self._inst_tally.record(list(batch), list(batch.values()), now=float(inst["ts"][start]))
+
+        summary = {
+            "programPoints": points,
+            "instBatches": len(spans),
+            "instCodes": len(self._inst_tally),
+            "ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+        logger.info(f"Hong scanner rehydrated: {summary}")
+        return summary
+
     # ═══════════════════════════════════════════════════════════════
     #  Phase 3: 통합 스캔 — 매수 신호 조합
     # ═══════════════════════════════════════════════════════════════
@@ -264,17 +413,9 @@ class HongSignalScanner:
             if data["instNet"] < self.min_inst_net:
                 continue
 
-            # 종목명 조회
-            name = code
-            try:
-                info = self.kiwoom.get_stock_info(code)
-                name = info.get("name", code)
-            except Exception:
-                pass
-
             entry = {
                 "code": code,
-                "name": name,
+                "name": self.kiwoom.symbols.name(code, code),   # 심볼 마스터 (API 호출 없음)
                 "instNet": data["instNet"],
                 "foreignNet": data["foreignNet"],
                 "programNet": data["programNet"],
@@ -293,7 +434,7 @@ class HongSignalScanner:
         watchlist.sort(key=lambda x: -x["strength"])
 
         return {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": datetime.fromtimestamp(self.clock()).strftime("%Y-%m-%d %H:%M:%S"),
             "program": program,
             "marketReady": market_ready,
             "signals": signals,
@@ -306,6 +447,30 @@ class HongSignalScanner:
     # ═══════════════════════════════════════════════════════════════
 
     def scan_strategy(self, mrkt_tp: str = "0") -> dict:
+        """scan_strategy_async 동기 래퍼."""
+        return self.kiwoom._run(self.scan_strategy_async(mrkt_tp))
+
+    async def _strategy_inputs(self, mrkt_tp: str) -> tuple:
+        """ka10032 · ka10065(기관/프로그램) · 업종 맵 동시 조회. 실패 항목은 빈 값으로 대체."""
+        k = self.kiwoom
+        results = await asyncio.gather(
+            k.get_top_volume_stocks_async(mrkt_tp, count=50),
+            asyncio.to_thread(k._get_sector_map),
+            k.get_provisional_ranking_async(orgn_tp="9100", trde_tp="1", mrkt_tp=mrkt_tp),
+            k.get_provisional_ranking_async(orgn_tp="9000", trde_tp="1", mrkt_tp=mrkt_tp),
+            return_exceptions=True,
+        )
+        labels = ("ka10032", "Sector map", "Institutional ranking", "Program ranking")
+        defaults = ([], {}, [], [])
+        out = []
+        for label, value, default in zip(labels, results, defaults):
+            if isinstance(value, Exception):
+                logger.warning(f"{label} error: {value}")
+                value = default
+            out.append(value)
+        return tuple(out)
+
+    async def scan_strategy_async(self, mrkt_tp: str = "0") -> dict:
         """
         홍인기 수급 주도주 전략 — 풀 스캔.
 
@@ -321,25 +486,18 @@ class HongSignalScanner:
             signals        — 최종 시그널 [{code, name, sector, level, ...}]
             totalScanned   — 스캔 종목 수
         """
-        now = datetime.now()
-        is_market_hours = (
-            now.weekday() < 5
-            and now.hour >= 9 and (now.hour > 9 or now.minute >= 30)
-            and now.hour < 16
-        )
+        ts = self.clock()
+        now = datetime.fromtimestamp(ts)
+        is_market_hours = self.is_market_hours(ts)
 
-        # ── Phase 1: 거래대금 상위 종목 ──
-        try:
-            top_stocks = self.kiwoom.get_top_volume_stocks(mrkt_tp, count=50)
-        except Exception as e:
-            logger.warning(f"ka10032 error: {e}")
-            top_stocks = []
+        # ── Phase 1: 거래대금 상위 종목 + 업종 맵 + 가집계 랭킹 (동시 조회) ──
+        top_stocks, _, inst_ranking, prog_ranking = await self._strategy_inputs(mrkt_tp)
 
-        # ── Phase 2: 업종 클러스터링 ──
-        sector_map = self.kiwoom._get_sector_map()
+        # ── Phase 2: 업종 클러스터링 (업종 맵은 심볼 마스터에 반영되어 있음) ──
+        sector_of = self.kiwoom.symbols.sector
         sector_clusters = defaultdict(list)
         for stock in top_stocks:
-            sector = sector_map.get(stock["code"], "기타")
+            sector = sector_of(stock["code"])
             sector_clusters[sector].append(stock)
 
         leading_sectors = {}
@@ -361,7 +519,8 @@ class HongSignalScanner:
                 }
 
         # ── Phase 3: 프로그램 기울기 ──
-        program = self.get_program_slope(mrkt_tp)
+        # 장외 시간: 추세 · 가집계 이력 · 장중 기록은 건드리지 않고 마지막 상태만 조회
+        program = self.get_program_slope(mrkt_tp, prog_ranking, record=is_market_hours)
 
         # ── Phase 4: 주도 섹터 종목의 기관 가집계 체크 (ka10065 랭킹) ──
         leading_codes = []
@@ -373,48 +532,27 @@ class HongSignalScanner:
                 code_sector_map[s["code"]] = sec_name
                 code_stock_map[s["code"]] = s
 
-        # 기관 가집계 랭킹 (한 번의 호출로 100종목)
-        try:
-            inst_ranking = self.kiwoom.get_provisional_ranking(
-                orgn_tp="9100", trde_tp="1", mrkt_tp=mrkt_tp
-            )
-        except Exception as e:
-            logger.warning(f"Institutional ranking error: {e}")
-            inst_ranking = []
-
+        # 기관 가집계 랭킹 (한 번의 호출로 100종목) + 프로그램 가집계 (교차 확인용)
         inst_map = {s["code"]: s["netQty"] for s in inst_ranking}
-
-        # 프로그램 가집계 (교차 확인용)
-        try:
-            prog_ranking = self.kiwoom.get_provisional_ranking(
-                orgn_tp="9000", trde_tp="1", mrkt_tp=mrkt_tp
-            )
-        except Exception:
-            prog_ranking = []
         prog_map = {s["code"]: s["netQty"] for s in prog_ranking}
 
-        signals = []
-        now_ts = time.time()
-
-        for code in leading_codes:
-            inst_net = inst_map.get(code, 0)
-
-            # 이력 추적 및 연속 증가 판정
-            history = self._inst_history[code]
-            ts_history = self._inst_ts[code]
-
-            delta = inst_net - history[-1] if history else 0
-            history.append(inst_net)
-            ts_history.append(now_ts)
+        # 이력 기록 + 변화량 · 연속 증가 횟수 일괄 계산
+        inst_nets = [inst_map.get(code, 0) for code in leading_codes]
+        if is_market_hours:
+            tally = self._record_inst(leading_codes, inst_nets, now=ts)
+            if self.journal is not None:
+                # 리플레이 입력: 같은 ts로 거래대금 상위 + 가집계 랭킹 스냅샷
+                self.journal.append_volume(mrkt_tp, ts, top_stocks)
+                self.journal.append_ranking("9100", mrkt_tp, ts, inst_ranking)
+                self.journal.append_ranking("9000", mrkt_tp, ts, prog_ranking)
+        else:
+            tally = self._inst_tally.peek(leading_codes)
 
-            consecutive = 0
-            vals = list(history)
-            for i in range(len(vals) - 1, 0, -1):
-                if vals[i] > vals[i - 1]:
-                    consecutive += 1
-                else:
-                    break
+        signals = []
 
+        for code, inst_net, delta, consecutive in zip(
+            leading_codes, inst_nets, tally["delta"].tolist(), tally["consecutive"].tolist()
+        ):
             is_inst_increasing = consecutive >= self.inst_increase_count
 
             stock_info = code_stock_map.get(code, {})
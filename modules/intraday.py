@@ -0,0 +1,176 @@
+"""
+AX RADAR v5.3 - Intraday Column Store
+장중 시계열(프로그램 순매수 · 기관 가집계 · ka10065 랭킹 스냅샷)의 거래일별 append-only 저장소.
+
+디렉터리 구조: {INTRADAY_DIR}/{YYYYMMDD}/{table}.{column}.bin
+    program_0.ts.bin   program_0.net.bin          ← float64 / int64 원시 배열
+    inst.ts.bin        inst.code.bin  inst.net.bin
+    rank_9100_0.ts.bin rank_9100_0.code.bin ...
+    volume_0.ts.bin    volume_0.code.bin  volume_0.amt.bin  volume_0.price.bin  volume_0.chg.bin
+
+- 쓰기: 컬럼별 파일에 tobytes() 이어 쓰기 (헤더 · 인덱스 없음, 프로세스 재시작 후에도 그대로 이어짐)
+  테이블별 첫 append 전(및 쓰기 실패 후)에는 모든 컬럼 파일을 공통 최소 행 수로 잘라 정렬 복구
+  → 중단된 쓰기(컬럼 일부만 기록) 뒤에 이어 쓴 행이 컬럼 간 어긋나지 않음
+- 읽기: np.memmap (복사 없이 매핑), 쓰기 도중 중단된 꼬리는 컬럼 최소 길이로 잘라 무시
+- 오래된 거래일 디렉터리는 prune()으로 정리
+"""
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from config import INTRADAY_DIR, INTRADAY_KEEP_DAYS
+
+logger = logging.getLogger("intraday")
+
+# 테이블 계열(이름의 첫 "_" 앞) → 컬럼 스키마
+SCHEMAS = {
+    "program": {"ts": "<f8", "net": "<i8"},
+    "inst": {"ts": "<f8", "code": "S6", "net": "<i8"},
+    "rank": {"ts": "<f8", "code": "S6", "net": "<i8"},
+    "volume": {"ts": "<f8", "code": "S6", "amt": "<i8", "price": "<i8", "chg": "<f8"},
+}
+
+
+def today() -> str:
+    return datetime.now().strftime("%Y%m%d")
+
+
+class IntradayStore:
+    def __init__(self, root: str = INTRADAY_DIR, keep_days: int = INTRADAY_KEEP_DAYS):
+        self.root = root
+        self.keep_days = keep_days
+        self._lock = threading.Lock()
+        self._aligned: set = set()      # 이번 프로세스에서 정렬 확인을 마친 (day, table)
+        self.rows_written = 0
+        self.repairs = 0
+
+    @staticmethod
+    def _schema(table: str) -> dict:
+        return SCHEMAS[table.split("_", 1)[0]]
+
+    def _path(self, day: str, table: str, column: str) -> str:
+        return os.path.join(self.root, day, f"{table}.{column}.bin")
+
+    # ═══════════════════════════════════════════════════════════════
+    #  Write
+    # ═══════════════════════════════════════════════════════════════
+
+    def append(self, table: str, day: str | None = None, **columns):
+        """한 배치 추가 (컬럼 길이 동일, 스칼라는 길이 1). 실패는 경고만 — 스캔을 막지 않는다."""
+        schema = self._schema(table)
+        arrays = {c: np.atleast_1d(np.asarray(columns[c], dtype=dt)) for c, dt in schema.items()}
+        n = len(arrays["ts"])
+        if not n or any(len(a) != n for a in arrays.values()):
+            return
+        day = day or today()
+        with self._lock:
+            try:
+                os.makedirs(os.path.join(self.root, day), exist_ok=True)
+                if (day, table) not in self._aligned:
+                    self._align(day, table, schema)
+                    self._aligned.add((day, table))
+                for c, arr in arrays.items():
+                    with open(self._path(day, table, c), "ab") as f:
+                        f.write(arr.tobytes())
+                self.rows_written += n
+            except OSError as e:
+                self._aligned.discard((day, table))     # 일부 컬럼만 기록됐을 수 있음 → 다음 append 전 재정렬
+                logger.warning(f"Intraday [{day}/{table}] append failed: {e}")
+
+    def _align(self, day: str, table: str, schema: dict):
+        """컬럼 파일을 공통 최소 행 수로 절단 (lock 보유 상태에서 호출)."""
+        sizes = {}
+        for c, dt in schema.items():
+            try:
+                sizes[c] = os.path.getsize(self._path(day, table, c))
+            except FileNotFoundError:
+                sizes[c] = 0
+        rows = min(size // np.dtype(schema[c]).itemsize for c, size in sizes.items())
+        for c, size in sizes.items():
+            keep = rows * np.dtype(schema[c]).itemsize
+            if size > keep:
+                os.truncate(self._path(day, table, c), keep)
+                self.repairs += 1
+                logger.warning(f"Intraday [{day}/{table}.{c}] truncated torn tail: {size - keep} bytes")
+
+    def append_program(self, mrkt_tp: str, ts: float, net: int):
+        self.append(f"program_{mrkt_tp}", ts=ts, net=net)
+
+    def append_inst(self, ts: float, codes: list, nets):
+        self.append("inst", ts=np.full(len(codes), ts), code=codes, net=nets)
+
+    def append_ranking(self, orgn_tp: str, mrkt_tp: str, ts: float, rows: list):
+        """ka10065 랭킹 스냅샷 (행: {code, netQty})."""
+        self.append(
+            f"rank_{orgn_tp}_{mrkt_tp}",
+            ts=np.full(len(rows), ts),
+            code=[r["code"] for r in rows],
+            net=[r["netQty"] for r in rows],
+        )
+
+    def append_volume(self, mrkt_tp: str, ts: float, rows: list):
+        """ka10032 거래대금 상위 스냅샷 (행: {code, tradeAmt, curPrc, changePct})."""
+        self.append(
+            f"volume_{mrkt_tp}",
+            ts=np.full(len(rows), ts),
+            code=[r["code"] for r in rows],
+            amt=[r["tradeAmt"] for r in rows],
+            price=[r["curPrc"] for r in rows],
+            chg=[r["changePct"] for r in rows],
+        )
+
+    # ═══════════════════════════════════════════════════════════════
+    #  Read
+    # ═══════════════════════════════════════════════════════════════
+
+    def read(self, table: str, day: str | None = None) -> dict:
+        """컬럼명 → 읽기 전용 배열 (memmap). 없으면 길이 0 배열."""
+        schema = self._schema(table)
+        day = day or today()
+        cols = {}
+        for c, dt in schema.items():
+            path = self._path(day, table, c)
+            dtype = np.dtype(dt)
+            try:
+                size = os.path.getsize(path) // dtype.itemsize
+            except OSError:
+                size = 0
+            cols[c] = np.memmap(path, dtype=dtype, mode="r", shape=(size,)) if size else np.empty(0, dtype)
+        n = min(len(a) for a in cols.values())
+        return {c: a[:n] for c, a in cols.items()}
+
+    def tables(self, day: str | None = None) -> list:
+        try:
+            names = os.listdir(os.path.join(self.root, day or today()))
+        except OSError:
+            return []
+        return sorted({name.split(".", 1)[0] for name in names if name.endswith(".bin")})
+
+    def days(self) -> list:
+        try:
+            return sorted(d for d in os.listdir(self.root) if d.isdigit() and len(d) == 8)
+        except OSError:
+            return []
+
+    def prune(self):
+        """최근 keep_days 거래일만 남기고 삭제."""
+        for day in self.days()[:-self.keep_days] if self.keep_days > 0 else []:
+            shutil.rmtree(os.path.join(self.root, day), ignore_errors=True)
+            logger.info(f"Intraday [{day}] pruned")
+
+    def status(self) -> dict:
+        return {"day": today(), "tables": self.tables(), "days": len(self.days()), "rowsWritten": self.rows_written,
+                "repairs": self.repairs}
+
+
+def batches(ts: np.ndarray) -> list:
+    """같은 ts로 기록된 연속 구간 → [(start, end), ...] (한 번의 스캔 = 한 배치)."""
+    if not len(ts):
+        return []
+    cuts = np.flatnonzero(ts[1:] != ts[:-1]) + 1
+    bounds = np.concatenate(([0], cuts, [len(ts)]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
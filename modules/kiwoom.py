@@ -2,14 +2,15 @@
 AX RADAR v5.3 - Kiwoom REST API Module
 TokenManager + KiwoomAPI + KiwoomLogic
 """
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import threading
 import time
 from datetime import datetime, timedelta
 
-import requests
-
 from config import (
     INDUSTRY_SECTORS,
     INDUSTRY_SECTOR_NAMES,
@@ -17,8 +18,36 @@ from config import (
     KA10051_SECTOR_MAP,
     KIWOOM_APPKEY,
     KIWOOM_BASE_URL,
+    KIWOOM_IO_WORKERS,
+    KIWOOM_MAX_PAGES,
     KIWOOM_SECRETKEY,
+    KIWOOM_TOKEN_PATH,
+    KIWOOM_TOKEN_REFRESH_AHEAD,
+    KIWOOM_TOKEN_RETRY_SEC,
+)
+
+import numpy as np
+
+from .aio import ContextExecutor, EventLoopThread
+from .cache import CacheEngine, Uncached
+from .cassette import Cassette, CassetteTransport
+from .decoder import Columns, decode, extract_items, parse_float, parse_int
+from .metrics import (
+    EXTERNAL_ERRORS,
+    EXTERNAL_SECONDS,
+    KIWOOM_INFLIGHT,
+    KIWOOM_REQUESTS,
+    KIWOOM_SECONDS,
+    TOKEN_ISSUES,
+    TOKEN_SECONDS,
+    result_of,
+    track_inflight,
 )
+from .profiling import record_external, record_upstream, record_wait
+from .refstore import ReferenceStore
+from .ratelimit import RateLimiter, kiwoom_limiter
+from .symbols import SymbolMaster
+from .transport import PooledTransport
 
 logger = logging.getLogger("kiwoom")
 
@@ -28,11 +57,28 @@ logger = logging.getLogger("kiwoom")
 # ═══════════════════════════════════════════════════════════════════
 
 class TokenManager:
-    """Kiwoom REST API OAuth2 token manager (au10001)."""
-
-    def __init__(self):
+    """
+    Kiwoom REST API OAuth2 token manager (au10001).
+
+    - 발급은 lock 아래 단일 실행: 만료 시점에 동시 요청이 몰려도 au10001 1회
+    - 발급 실패 후 KIWOOM_TOKEN_RETRY_SEC 동안은 재시도 없이 즉시 "" 반환
+    - 토큰을 KIWOOM_TOKEN_PATH에 0600 권한으로 저장 → 재기동 시 네트워크 없이 재사용
+    - start_refresher(): 만료 KIWOOM_TOKEN_REFRESH_AHEAD초 전에 백그라운드 선제 갱신
+    """
+
+    def __init__(self, transport: PooledTransport, path: str = KIWOOM_TOKEN_PATH):
+        self.transport = transport
+        self.path = path
         self.token: str = ""
         self.expires_at: datetime = datetime.min
+        self.issued_count = 0
+        self.loaded_from_disk = False
+        self._lock = threading.Lock()
+        self._fail_until = 0.0
+        self._lifetime = float("inf")       # 마지막 발급 토큰의 수명(초), 디스크 복원본은 알 수 없음
+        self._wake = threading.Event()
+        self._refresher: threading.Thread | None = None
+        self._load()
 
     @property
     def is_valid(self) -> bool:
@@ -41,7 +87,95 @@ class TokenManager:
     def get_token(self) -> str:
         if self.is_valid:
             return self.token
-        return self._issue_token()
+        with self._lock:
+            if self.is_valid:
+                return self.token  # 대기 중 다른 스레드가 발급 완료
+            if time.monotonic() < self._fail_until:
+                return ""
+            return self._issue_token()
+
+    # ── 선제 갱신 ──
+
+    def start_refresher(self):
+        """만료 전 백그라운드 갱신 스레드 시작 (키 미설정 시 무시). 중복 호출 안전."""
+        if not KIWOOM_APPKEY or (self._refresher and self._refresher.is_alive()):
+            return
+        self._refresher = threading.Thread(target=self._refresh_loop, name="token-refresher", daemon=True)
+        self._refresher.start()
+
+    def _refresh_delay(self) -> float:
+        """
+        다음 선제 갱신까지 남은 초 (0 이하 = 지금 갱신).
+        만료 KIWOOM_TOKEN_REFRESH_AHEAD초 전, 수명이 그보다 짧은 토큰은 수명의 절반 시점.
+        """
+        if not self.is_valid:
+            return 0.0
+        remaining = (self.expires_at - datetime.now()).total_seconds()
+        return remaining - min(KIWOOM_TOKEN_REFRESH_AHEAD, self._lifetime / 2)
+
+    def _refresh_loop(self):
+        while True:
+            delay = self._refresh_delay()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+            with self._lock:
+                if self._refresh_delay() <= 0:
+                    self._issue_token()
+            # 발급 성공 · 실패와 무관하게 au10001 호출 간 최소 간격 (수명이 비정상적으로 짧거나 시계가 어긋난 경우 포함)
+            self._wake.clear()
+            self._wake.wait(KIWOOM_TOKEN_RETRY_SEC)
+            self._wake.clear()
+
+    # ── 영속화 ──
+
+    @staticmethod
+    def _fingerprint() -> str:
+        raw = f"{KIWOOM_BASE_URL}|{KIWOOM_APPKEY}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()[:16]
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Token file unreadable: {e}")
+            return
+        if doc.get("fingerprint") != self._fingerprint():
+            return  # 다른 appkey / 도메인으로 발급된 토큰
+        try:
+            expires_at = datetime.strptime(doc.get("expires_at", ""), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return
+        if doc.get("token") and datetime.now() < expires_at:
+            self.token = doc["token"]
+            self.expires_at = expires_at
+            self.loaded_from_disk = True
+            logger.info(f"Token restored from disk, expires {self.expires_at:%Y-%m-%d %H:%M}")
+
+    def _save(self):
+        if not self.path:
+            return
+        doc = {
+            "token": self.token,
+            "expires_at": self.expires_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "fingerprint": self._fingerprint(),
+        }
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(doc, f)
+            os.chmod(tmp, 0o600)  # umask 무관하게 소유자 전용
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Token persist failed: {e}")
+
+    # ── 발급 (lock 보유 상태에서 호출) ──
 
     def _issue_token(self) -> str:
         url = f"{KIWOOM_BASE_URL}/oauth2/token"
@@ -52,26 +186,49 @@ class TokenManager:
             "secretkey": KIWOOM_SECRETKEY,
         }
 
+        t0 = time.perf_counter()
         try:
-            resp = requests.post(url, headers=headers, json=body, timeout=10)
+            resp = self.transport.post(url, headers=headers, json=body, timeout=10)
             resp.raise_for_status()
             data = resp.json()
 
-            self.token = data.get("token", "")
+            token = data.get("token", "")
+            if not token:
+                raise ValueError(data.get("return_msg", "empty token"))
             expires_dt = data.get("expires_dt", "")
 
             if expires_dt:
-                self.expires_at = datetime.strptime(expires_dt, "%Y%m%d%H%M%S") - timedelta(minutes=5)
+                expires_at = datetime.strptime(expires_dt, "%Y%m%d%H%M%S") - timedelta(minutes=5)
             else:
-                self.expires_at = datetime.now() + timedelta(hours=23)
-
+                expires_at = datetime.now() + timedelta(hours=23)
+
+            self.token, self.expires_at = token, expires_at
+            self._lifetime = max((expires_at - datetime.now()).total_seconds(), 0.0)
+            self.issued_count += 1
+            self._fail_until = 0.0
+            self._save()
+            self._wake.set()
+            TOKEN_ISSUES.labels("ok").inc()
             logger.info(f"Token issued, expires {self.expires_at:%Y-%m-%d %H:%M}")
             return self.token
 
         except Exception as e:
+            TOKEN_ISSUES.labels(result_of(e)).inc()
             logger.error(f"Token issue failed: {e}")
-            self.token = ""
-            return ""
+            if not self.is_valid:
+                self.token = ""
+            self._fail_until = time.monotonic() + KIWOOM_TOKEN_RETRY_SEC
+            return self.token
+        finally:
+            TOKEN_SECONDS.observe(time.perf_counter() - t0)
+
+    def status(self) -> dict:
+        return {
+            "valid": self.is_valid,
+            "expiresAt": self.expires_at.strftime("%Y-%m-%d %H:%M:%S") if self.token else "",
+            "issued": self.issued_count,
+            "loadedFromDisk": self.loaded_from_disk,
+        }
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -79,28 +236,126 @@ class TokenManager:
 # ═══════════════════════════════════════════════════════════════════
 
 class KiwoomAPI:
-    """Kiwoom REST API POST wrapper with auto-token."""
+    """
+    Kiwoom REST API POST wrapper with auto-token, pooled transport and quota pacing.
 
-    def __init__(self, token_mgr: TokenManager):
+    call()       — 동기 (호출 스레드에서 쿼터 대기 + HTTP)
+    call_async() — 코루틴 (쿼터 대기는 이벤트 루프, HTTP는 io 스레드 풀)
+    두 경로는 TokenManager · RateLimiter · 커넥션 풀을 공유한다.
+
+    연속조회: 응답 헤더 cont-yn=Y 이면 next-key를 요청 헤더에 실어 다음 페이지.
+    iter_pages() / iter_pages_async()는 페이지를 소비 시점에 요청하고,
+    decode_pages() / decode_pages_async()는 페이지 단위로 컬럼 디코딩 — 유효 행이 limit개에 도달하면
+    다음 페이지는 요청하지 않는다.
+    """
+
+    def __init__(self, token_mgr: TokenManager, transport: PooledTransport,
+                 limiter: RateLimiter = kiwoom_limiter, io_workers: int = KIWOOM_IO_WORKERS):
         self.token_mgr = token_mgr
+        self.transport = transport
+        self.limiter = limiter
+        self._io = ContextExecutor(max_workers=io_workers, thread_name_prefix="kiwoom-io")
 
-    def call(self, api_id: str, path: str, body: dict, cont_key: str = "") -> dict:
-        token = self.token_mgr.get_token()
+    @staticmethod
+    def _headers(api_id: str, token: str, cont_key: str) -> dict:
         if not token:
             raise ConnectionError("No valid token")
-
-        url = f"{KIWOOM_BASE_URL}{path}"
         headers = {
             "api-id": api_id,
             "authorization": f"Bearer {token}",
             "Content-Type": "application/json;charset=UTF-8",
         }
         if cont_key:
+            headers["cont-yn"] = "Y"
             headers["next-key"] = cont_key
+        return headers
+
+    def _post(self, path: str, headers: dict, body: dict) -> tuple:
+        api_id = headers["api-id"]
+        error = None
+        t0 = time.perf_counter()
+        try:
+            with track_inflight(KIWOOM_INFLIGHT, api_id):
+                resp = self.transport.post(f"{KIWOOM_BASE_URL}{path}", headers=headers, json=body, timeout=15)
+                resp.raise_for_status()
+                cont = {"cont-yn": resp.headers.get("cont-yn", "N"), "next-key": resp.headers.get("next-key", "")}
+                return resp.json(), cont
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            t1 = time.perf_counter()
+            KIWOOM_SECONDS.labels(api_id).observe(t1 - t0)
+            KIWOOM_REQUESTS.labels(api_id, result_of(error)).inc()
+            record_upstream(api_id, t0, t1)
+
+    def call_raw(self, api_id: str, path: str, body: dict, cont_key: str = "") -> tuple:
+        """(응답 본문, {"cont-yn", "next-key"})"""
+        headers = self._headers(api_id, self.token_mgr.get_token(), cont_key)
+        record_wait(self.limiter.acquire(api_id))
+        return self._post(path, headers, body)
 
-        resp = requests.post(url, headers=headers, json=body, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
+    def call(self, api_id: str, path: str, body: dict, cont_key: str = "") -> dict:
+        return self.call_raw(api_id, path, body, cont_key)[0]
+
+    async def call_raw_async(self, api_id: str, path: str, body: dict, cont_key: str = "") -> tuple:
+        loop = asyncio.get_running_loop()
+        tm = self.token_mgr
+        # 유효 토큰은 즉시 사용, 발급이 필요할 때만 io 스레드에서 (발급 lock 공유)
+        token = tm.token if tm.is_valid else await loop.run_in_executor(self._io, tm.get_token)
+        headers = self._headers(api_id, token, cont_key)
+        record_wait(await self.limiter.acquire_async(api_id))
+        return await loop.run_in_executor(self._io, self._post, path, headers, body)
+
+    async def call_async(self, api_id: str, path: str, body: dict, cont_key: str = "") -> dict:
+        return (await self.call_raw_async(api_id, path, body, cont_key))[0]
+
+    def iter_pages(self, api_id: str, path: str, body: dict, key: str = "", max_pages: int = KIWOOM_MAX_PAGES):
+        """연속조회 페이지(행 목록) 제너레이터 — 다음 페이지는 소비 시점에 요청."""
+        cont_key = ""
+        for _ in range(max_pages):
+            data, cont = self.call_raw(api_id, path, body, cont_key)
+            yield extract_items(data, key)
+            cont_key = cont["next-key"]
+            if cont["cont-yn"] != "Y" or not cont_key:
+                return
+
+    async def iter_pages_async(self, api_id: str, path: str, body: dict, key: str = "",
+                               max_pages: int = KIWOOM_MAX_PAGES):
+        """iter_pages()의 비동기 제너레이터 판."""
+        cont_key = ""
+        for _ in range(max_pages):
+            data, cont = await self.call_raw_async(api_id, path, body, cont_key)
+            yield extract_items(data, key)
+            cont_key = cont["next-key"]
+            if cont["cont-yn"] != "Y" or not cont_key:
+                return
+
+    def decode_pages(self, api_id: str, path: str, body: dict, limit: int | None = None) -> Columns:
+        """
+        연속조회 + 페이지별 컬럼 디코딩 (decoder.SCHEMAS[api_id]).
+        유효 행이 limit개에 도달하면 다음 페이지를 요청하지 않는다.
+        """
+        parts, n = [], 0
+        for page in self.iter_pages(api_id, path, body):
+            cols = decode(api_id, page)
+            parts.append(cols)
+            n += len(cols)
+            if limit and n >= limit:
+                break
+        cols = Columns.concat(parts) if parts else decode(api_id, [])
+        return cols.take(slice(0, limit)) if limit else cols
+
+    async def decode_pages_async(self, api_id: str, path: str, body: dict, limit: int | None = None) -> Columns:
+        parts, n = [], 0
+        async for page in self.iter_pages_async(api_id, path, body):
+            cols = decode(api_id, page)
+            parts.append(cols)
+            n += len(cols)
+            if limit and n >= limit:
+                break
+        cols = Columns.concat(parts) if parts else decode(api_id, [])
+        return cols.take(slice(0, limit)) if limit else cols
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -111,71 +366,137 @@ class KiwoomLogic:
     """High-level business logic for AX RADAR dashboard."""
 
     def __init__(self):
-        self._tm = TokenManager()
-        self._api = KiwoomAPI(self._tm)
-        self._cache: dict = {}
-        self._cache_ts: dict = {}
-        self._cache_ttl = 60  # seconds
-
-        # ax_universe.json
+        self._http = PooledTransport()
+        # CASSETTE_MODE=record|replay → 모든 Kiwoom POST가 카세트를 거침 (pykrx · yfinance는 _frame)
+        self.cassette = Cassette()
+        transport = CassetteTransport(self._http, self.cassette) if self.cassette.active else self._http
+        self._tm = TokenManager(transport)
+        self._api = KiwoomAPI(self._tm, transport)
+        self._cache = CacheEngine()
+        self.refs = ReferenceStore()
+        self.symbols = SymbolMaster(self.refs)
+        self._aio = EventLoopThread("kiwoom-aio")
+
+        # ax_universe.json → 참조 저장소 (적재는 기동 준비 단계의 load_references)
         base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        universe_path = os.path.join(base, "data", "ax_universe.json")
-        try:
-            with open(universe_path, "r", encoding="utf-8") as f:
-                self.ax_universe = json.load(f)
-        except Exception:
-            self.ax_universe = {}
+        self._universe_path = os.path.join(base, "data", "ax_universe.json")
 
     @property
-    def connected(self) -> bool:
+    def ax_universe(self) -> dict:
+        return self.refs.peek("ax_universe", {})
+
+    def _read_universe(self) -> dict:
         try:
-            return bool(self._tm.get_token())
+            with open(self._universe_path, "r", encoding="utf-8") as f:
+                return json.load(f)
         except Exception:
+            return {}
+
+    def _universe_changed(self, entry: dict) -> bool:
+        try:
+            mtime = datetime.fromtimestamp(os.path.getmtime(self._universe_path))
+        except OSError:
             return False
+        return mtime.strftime("%Y-%m-%d %H:%M:%S") > entry.get("builtAt", "")
+
+    def stock_name(self, code: str, default: str = "") -> str:
+        """심볼 마스터의 종목명 (응답에서 수집된 code → name)."""
+        return self.symbols.name(code, default)
+
+    def _remember_names(self, rows: list, code_key: str = "code", name_key: str = "name", market: str = ""):
+        self.symbols.update(rows, code_key, name_key, market)
+
+    @property
+    def connected(self) -> bool:
+        """토큰 보유 여부 (논블로킹). 발급/선제 갱신은 백그라운드 스레드가 담당."""
+        self._tm.start_refresher()
+        return self._tm.is_valid
+
+    # ── 기동 준비 단계 (modules/warmup.Warmup이 백그라운드에서 순서대로 호출) ──
+
+    def load_references(self) -> dict:
+        """ax_universe.json → 참조 저장소 (원본 파일이 저장본보다 새로우면 재적재)."""
+        universe = self.refs.get("ax_universe", self._read_universe, stale_fn=self._universe_changed)
+        return {"universe": len(universe)}
+
+    def warm_token(self) -> dict:
+        """토큰 확보 (디스크 복원본 또는 au10001 발급) + 선제 갱신 스레드 시작."""
+        self._tm.start_refresher()
+        if not self._tm.get_token():
+            raise RuntimeError("au10001 token unavailable")
+        return self._tm.status()
+
+    def warm_sector_map(self) -> dict:
+        """업종 맵 (디스크 저장본 또는 ka20002 재구축)."""
+        sector_map = self._get_sector_map()
+        if not sector_map:
+            raise ValueError("sector map unavailable")
+        return {"stocks": len(sector_map)}
+
+    def _run(self, coro):
+        """동기 getter → 백그라운드 루프에서 코루틴 실행 후 결과 반환."""
+        return self._aio.run(coro)
+
+    def transport_stats(self) -> dict:
+        """Kiwoom 호스트별 keep-alive 커넥션 재사용 통계."""
+        return self._http.stats()
 
     # ── Cache helpers ──
 
     def _set_cache(self, key: str, data):
-        self._cache[key] = data
-        self._cache_ts[key] = time.time()
+        self._cache.set(key, data)
 
     def _get_cache(self, key: str, ttl: int | None = None):
-        if key not in self._cache:
-            return None
-        ts = self._cache_ts.get(key, 0)
-        age = time.time() - ts
-        if ttl and age > ttl:
-            return None
-        return self._cache[key]
+        """ttl 지정 시 age <= ttl 만 반환, 미지정 시 키 계열의 stale TTL 이내면 반환."""
+        return self._cache.get(key, ttl)
 
-    # ── Parsing helpers ──
+    def invalidate(self, *keys: str):
+        """스케줄 갱신 전 호출 — 패널이 캐시된 이전 결과를 다시 스냅샷하지 않도록."""
+        self._cache.invalidate(*keys)
 
-    @staticmethod
-    def _parse_int(val) -> int:
-        if not val:
-            return 0
-        try:
-            s = str(val).replace(",", "").replace("+", "").strip()
-            neg = s.startswith("-")
-            s = s.replace("-", "")
-            if not s:
-                return 0
-            return -int(s) if neg else int(s)
-        except (ValueError, TypeError):
-            return 0
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+    # ── External data (pykrx · yfinance, 카세트 기록/재생 경유) ──
+
+    def _pykrx(self, fn_name: str, *args, **kwargs):
+        def load():
+            from pykrx import stock as pykrx_stock
+            return getattr(pykrx_stock, fn_name)(*args, **kwargs)
+        return self._external("pykrx", fn_name, lambda: self.cassette.frame(f"pykrx.{fn_name}", (args, kwargs), load))
+
+    def _yf_history(self, symbol: str, period: str):
+        def load():
+            import yfinance as yf
+            return yf.Ticker(symbol).history(period=period)
+        return self._external("yfinance", "history", lambda: self.cassette.frame("yfinance.history", (symbol, period), load))
 
     @staticmethod
-    def _parse_float(val) -> float:
-        if not val:
-            return 0.0
+    def _external(source: str, fn_name: str, fetch):
+        t0 = time.perf_counter()
         try:
-            return float(str(val).replace(",", "").replace("+", "").strip())
-        except (ValueError, TypeError):
-            return 0.0
+            return fetch()
+        except Exception:
+            EXTERNAL_ERRORS.labels(source, fn_name).inc()
+            raise
+        finally:
+            t1 = time.perf_counter()
+            EXTERNAL_SECONDS.labels(source, fn_name).observe(t1 - t0)
+            record_external(source, fn_name, t0, t1)
+
+    # ── Parsing helpers ──
+
+    # 단건 응답용 (행 목록은 decoder.decode로 컬럼 단위 변환)
+    _parse_int = staticmethod(parse_int)
+    _parse_float = staticmethod(parse_float)
 
     # ═══════════════ Institution Top (ka10039) ═══════════════
 
     def get_institution_top(self, inst_key: str, trade_type: str = "1", days: str = "5") -> list:
+        """ka10039 동기 래퍼 (get_institution_top_async)."""
+        return self._run(self.get_institution_top_async(inst_key, trade_type, days))
+
+    async def get_institution_top_async(self, inst_key: str, trade_type: str = "1", days: str = "5") -> list:
         """
         ka10039: Institution buy/sell top stocks.
         trade_type: "1"=buy, "2"=sell
@@ -193,42 +514,64 @@ class KiwoomLogic:
             "stex_tp": "3",
         }
 
-        data = self._api.call("ka10039", "/api/dostk/rkinfo", body)
-        items = data.get("sec_trde_upper", [])
+        data = await self._api.call_async("ka10039", "/api/dostk/rkinfo", body)
+        cols = decode("ka10039", data)
+        cols = cols.take(cols.index < 20)  # 원본 상위 20행
 
-        if not items:
-            for k, v in data.items():
-                if isinstance(v, list) and v and isinstance(v[0], dict):
-                    items = v
-                    break
+        # netprps_amt 원본 단위: 천원(1,000원)
+        # 천원 → 억원 변환: ÷100,000 (1억 = 100,000천원)
+        amt_eok = np.round(cols["netprps_amt"] / 100_000, 1)
 
-        result = []
-        for item in items[:20]:
-            code = str(item.get("stk_cd", "")).replace("_AL", "").replace("_NX", "").strip()
-            if not code or len(code) != 6:
-                continue
+        # Sort by absolute amount descending
+        order = np.argsort(-np.abs(amt_eok), kind="stable")
+        result = cols.take(order).records({
+            "code": "stk_cd",
+            "name": "stk_nm",
+            "amount": amt_eok[order],
+            "changePct": "flu_rt",
+        })
+        self._remember_names(result)
+        return result
 
-            amt_raw = self._parse_int(item.get("netprps_amt", "0"))
-            # netprps_amt 원본 단위: 천원(1,000원)
-            # 천원 → 억원 변환: ÷100,000 (1억 = 100,000천원)
-            amt_eok = round(amt_raw / 100_000, 1)
-            flu = self._parse_float(item.get("flu_rt", "0"))
+    def get_institution_summary(self, top: int = 5) -> dict:
+        """3사 순매수/순매도 TOP N 동기 래퍼 (get_institution_summary_async)."""
+        return self._run(self.get_institution_summary_async(top))
 
-            result.append({
-                "code": code,
-                "name": str(item.get("stk_nm", "")).strip(),
-                "amount": amt_eok,
-                "changePct": flu,
-            })
+    async def get_institution_summary_async(self, top: int = 5) -> dict:
+        """
+        MS/JP/GS × 매수/매도 ka10039 6회를 동시에 조회 (5영업일 누적).
 
-        # Sort by absolute amount descending
-        result.sort(key=lambda x: abs(x["amount"]), reverse=True)
+        Returns: {"MS": {"name", "buyTop", "sellTop"}, ...}
+        Raises: 6회 모두 비어 있으면 Exception (캐시된 이전 스냅샷 사용 유도)
+        """
+        keys = ("MS", "JP", "GS")
+        rows = await asyncio.gather(
+            *(self.get_institution_top_async(k, trade_type=t, days="5") for k in keys for t in ("1", "2")),
+            return_exceptions=True,
+        )
+        result = {}
+        for i, inst in enumerate(keys):
+            buy_top, sell_top = rows[2 * i], rows[2 * i + 1]
+            error = next((r for r in (buy_top, sell_top) if isinstance(r, Exception)), None)
+            if error is not None:
+                logger.warning(f"Institution [{inst}] data error: {error}")
+                buy_top, sell_top = [], []
+            result[inst] = {
+                "name": INSTITUTION_CODES[inst]["name"],
+                "buyTop": buy_top[:top],
+                "sellTop": sell_top[:top],
+            }
+        if not any(r["buyTop"] or r["sellTop"] for r in result.values()):
+            raise Exception("All institution data empty")
         return result
 
     # ═══════════════ Stock Info (ka10001) ═══════════════
 
     def get_stock_info(self, code: str) -> dict:
-        """ka10001: Stock basic info for popup."""
+        """ka10001: Stock basic info for popup. (stale-while-revalidate cache)"""
+        return self._cache.get_or_load(f"stock_{code}", lambda: self._load_stock_info(code))
+
+    def _load_stock_info(self, code: str) -> dict:
         body = {"stk_cd": code}
         data = self._api.call("ka10001", "/api/dostk/stkinfo", body)
 
@@ -259,28 +602,26 @@ class KiwoomLogic:
 
     def get_foreign_top20(self) -> dict:
         """외국인 순매수/순매도 TOP 20 (최근 5영업일, pykrx 기반) + 당일 등락률"""
-        cached = self._get_cache("foreign_top20_data", ttl=300)
-        if cached:
-            return cached
-
-        from pykrx import stock as pykrx_stock
+        return self._cache.get_or_load("foreign_top20_data", self._load_foreign_top20)
 
+    def _load_foreign_top20(self) -> dict:
         end = datetime.now().strftime("%Y%m%d")
         start = (datetime.now() - timedelta(days=10)).strftime("%Y%m%d")
 
-        df = pykrx_stock.get_market_net_purchases_of_equities_by_ticker(
-            start, end, market="KOSPI", investor="외국인"
+        df = self._pykrx(
+            "get_market_net_purchases_of_equities_by_ticker", start, end, market="KOSPI", investor="외국인"
         )
 
         if df.empty:
-            return {"buy": [], "sell": []}
+            # 일시적 빈 응답(장 시작 전 · pykrx 지연)은 캐시하지 않음 → 다음 조회에서 재시도
+            return Uncached({"buy": [], "sell": []})
 
         # 최근 거래일 등락률 가져오기 (주말/공휴일 대비 최근 7일 탐색)
         chg_map = {}
         try:
             for offset in range(0, 7):
                 d = (datetime.now() - timedelta(days=offset)).strftime("%Y%m%d")
-                ohlcv = pykrx_stock.get_market_ohlcv_by_ticker(d, market="KOSPI")
+                ohlcv = self._pykrx("get_market_ohlcv_by_ticker", d, market="KOSPI")
                 if not ohlcv.empty and "등락률" in ohlcv.columns:
                     vol_col = [c for c in ohlcv.columns if "거래량" in c]
                     if vol_col and ohlcv[vol_col[0]].sum() > 0:
@@ -310,93 +651,99 @@ class KiwoomLogic:
                 })
             return items
 
-        result = {"buy": build_list(buy_df), "sell": build_list(sell_df)}
-        self._set_cache("foreign_top20_data", result)
-        return result
+        return {"buy": build_list(buy_df), "sell": build_list(sell_df)}
 
     # ═══════════════ Sector Map (ka20002) ═══════════════
 
     def _get_sector_map(self) -> dict:
-        """ka20002: 업종별 종목 리스트로 종목코드→업종명 매핑. 24h cache."""
-        cached = self._get_cache("sector_map_kiwoom", ttl=86400)
-        if cached:
-            return cached
+        """ka20002: 업종별 종목 리스트로 종목코드→업종명 매핑. 디스크 저장본, 일 1회 백그라운드 재구축."""
+        try:
+            return self.refs.get("sector_map", self._build_sector_map)
+        except ValueError as e:
+            logger.warning(f"Sector map unavailable: {e}")
+            return {}
 
+    def _build_sector_map(self) -> dict:
         sector_map = {}
+        names = {}
         for inds_code, sector_name in INDUSTRY_SECTORS.items():
             try:
                 body = {"mrkt_tp": "0", "inds_cd": inds_code, "stex_tp": "3"}
-                data = self._api.call("ka20002", "/api/dostk/sect", body)
-                items = data.get("inds_stkpc", [])
-                for item in items:
-                    stk_cd = str(item.get("stk_cd", "")).replace("_AL", "").replace("_NX", "").strip()
-                    if len(stk_cd) == 6:
-                        sector_map[stk_cd] = sector_name
+                cols = self._api.decode_pages("ka20002", "/api/dostk/sect", body)
+                for stk_cd, stk_nm in zip(cols["stk_cd"].tolist(), cols["stk_nm"].tolist()):
+                    sector_map[stk_cd] = sector_name
+                    names[stk_cd] = stk_nm
             except Exception as e:
                 logger.warning(f"Sector map [{inds_code}:{sector_name}] error: {e}")
 
-        if sector_map:
-            self._set_cache("sector_map_kiwoom", sector_map)
-            logger.info(f"Sector map built: {len(sector_map)} stocks across {len(INDUSTRY_SECTORS)} sectors")
+        if not sector_map:
+            raise ValueError("ka20002 returned no stocks")
+        self.symbols.update([{"code": c, "name": n} for c, n in names.items()], market="KOSPI")
+        logger.info(f"Sector map built: {len(sector_map)} stocks across {len(INDUSTRY_SECTORS)} sectors")
         return sector_map
 
     # ═══════════════ Sector Flow (ka10051) ═══════════════
 
     def get_foreign_sector_flow(self) -> list:
         """ka10051: 업종별 외국인+기관 순매수. [{sector, foreignAmt, instAmt}]"""
-        cached = self._get_cache("foreign_sector_flow", ttl=600)
-        if cached:
-            return cached
+        return self._cache.get_or_load("foreign_sector_flow", self._load_foreign_sector_flow)
 
+    def _load_foreign_sector_flow(self) -> list:
         body = {"mrkt_tp": "0", "amt_qty_tp": "0", "stex_tp": "3"}
         data = self._api.call("ka10051", "/api/dostk/sect", body)
-        items = data.get("inds_netprps", [])
+        cols = decode("ka10051", data)
 
-        result = []
-        for item in items:
-            raw_nm = str(item.get("inds_nm", "")).strip()
-            sector_nm = KA10051_SECTOR_MAP.get(raw_nm)
-            if not sector_nm:
-                continue
-            frgnr = self._parse_int(item.get("frgnr_netprps", "0"))
-            orgn = self._parse_int(item.get("orgn_netprps", "0"))
-            result.append({"sector": sector_nm, "foreignAmt": frgnr, "instAmt": orgn})
+        sectors = np.array([KA10051_SECTOR_MAP.get(nm, "") for nm in cols["inds_nm"].tolist()], dtype=str)
+        keep = sectors != ""
+        cols, sectors = cols.take(keep), sectors[keep]
 
-        result.sort(key=lambda x: -x["foreignAmt"])
-        self._set_cache("foreign_sector_flow", result)
-        return result
+        order = np.argsort(-cols["frgnr_netprps"], kind="stable")
+        return cols.take(order).records({
+            "sector": sectors[order],
+            "foreignAmt": "frgnr_netprps",
+            "instAmt": "orgn_netprps",
+        })
 
     # ═══════════════ IB Sector Flow (ka10039 + sector_map) ═══════════════
 
     def get_ib_sector_flow(self) -> dict:
         """ka10039 + sector_map: 기관별(MS/JP/GS) 종목 매매를 업종별로 합산"""
-        cached = self._get_cache("ib_sector_flow", ttl=600)
-        if cached:
-            return cached
-
-        sector_map = self._get_sector_map()
+        return self._cache.get_or_load("ib_sector_flow", self._load_ib_sector_flow)
+
+    def _load_ib_sector_flow(self) -> dict:
+        return self._run(self._load_ib_sector_flow_async())
+
+    async def _load_ib_sector_flow_async(self) -> dict:
+        keys = ("MS", "JP", "GS")
+        # 업종 맵(디스크 저장본, 없으면 ka20002 구축 → 심볼 마스터 반영)과 ka10039 6회를 동시에
+        sector_map, *rows = await asyncio.gather(
+            asyncio.to_thread(self._get_sector_map),
+            *(self.get_institution_top_async(k, trade_type=t, days="5") for k in keys for t in ("1", "2")),
+            return_exceptions=True,
+        )
+        if isinstance(sector_map, Exception):
+            logger.warning(f"Sector map unavailable: {sector_map}")
+        sector_of = self.symbols.sector
         result = {}
 
-        for inst_key in ("MS", "JP", "GS"):
-            try:
-                buy_stocks = self.get_institution_top(inst_key, trade_type="1", days="5")[:20]
-                sell_stocks = self.get_institution_top(inst_key, trade_type="2", days="5")[:20]
-            except Exception:
+        for i, inst_key in enumerate(keys):
+            buy_stocks, sell_stocks = rows[2 * i], rows[2 * i + 1]
+            if isinstance(buy_stocks, Exception) or isinstance(sell_stocks, Exception):
                 buy_stocks, sell_stocks = [], []
+            buy_stocks, sell_stocks = buy_stocks[:20], sell_stocks[:20]
 
             sector_totals = {}
             for s in buy_stocks:
-                sec = sector_map.get(s["code"], "기타")
+                sec = sector_of(s["code"])
                 sector_totals[sec] = sector_totals.get(sec, 0) + s["amount"]
             for s in sell_stocks:
-                sec = sector_map.get(s["code"], "기타")
+                sec = sector_of(s["code"])
                 sector_totals[sec] = sector_totals.get(sec, 0) - abs(s["amount"])
 
             items = [{"sector": k, "amount": round(v, 1)} for k, v in sector_totals.items()]
             items.sort(key=lambda x: -x["amount"])
             result[inst_key] = items
 
-        self._set_cache("ib_sector_flow", result)
         return result
 
     # ═══════════════ Foreign Consecutive Buy Top (ka10035) ═══════════════
@@ -417,52 +764,38 @@ class KiwoomLogic:
             "stex_tp": "1",        # 1 = KRX
         })
 
-        items = data.get("for_cont_nettrde_upper", [])
-        if not items:
-            for k, v in data.items():
-                if isinstance(v, list) and v and isinstance(v[0], dict):
-                    items = v
-                    break
-
-        result = []
-        for i, row in enumerate(items):
-            cd = str(row.get("stk_cd", "")).replace("_NX", "").replace("_AL", "").strip()
-            if not cd or len(cd) != 6:
-                continue
-            cur_prc = abs(self._parse_int(row.get("cur_prc", "0")))
-            pred_pre = self._parse_int(row.get("pred_pre", "0"))
-            flu_rt = round(pred_pre / cur_prc * 100, 2) if cur_prc else 0
-
-            result.append({
-                "rank": i + 1,
-                "stk_cd": cd,
-                "stk_nm": str(row.get("stk_nm", "")).strip(),
-                "cur_prc": cur_prc,
-                "pred_pre_sig": str(row.get("pred_pre_sig", "3")),
-                "flu_rt": flu_rt,
-                "dm1": self._parse_int(row.get("dm1", "0")),
-                "dm2": self._parse_int(row.get("dm2", "0")),
-                "dm3": self._parse_int(row.get("dm3", "0")),
-                "tot": self._parse_int(row.get("tot", "0")),
-                "limit_exh_rt": self._parse_float(row.get("limit_exh_rt", "0")),
-            })
+        cols = decode("ka10035", data)
+        cur_prc = cols["cur_prc"]
+        flu_rt = np.round(cols["pred_pre"] / np.where(cur_prc > 0, cur_prc, 1) * 100, 2)
+        flu_rt[cur_prc == 0] = 0
+
+        result = cols.records({
+            "rank": cols.index + 1,  # 원본 순위
+            "stk_cd": "stk_cd",
+            "stk_nm": "stk_nm",
+            "cur_prc": "cur_prc",
+            "pred_pre_sig": "pred_pre_sig",
+            "flu_rt": flu_rt,
+            "dm1": "dm1",
+            "dm2": "dm2",
+            "dm3": "dm3",
+            "tot": "tot",
+            "limit_exh_rt": "limit_exh_rt",
+        })
+        self._remember_names(result, "stk_cd", "stk_nm", mrkt_tp)
         return result
 
     # ═══════════════ Market Indices (yfinance) ═══════════════
 
     def get_market_indices(self) -> dict:
         """KOSPI / KOSDAQ 현재 지수 (yfinance)."""
-        cached = self._get_cache("market_indices", ttl=60)
-        if cached:
-            return cached
-
-        import yfinance as yf
+        return self._cache.get_or_load("market_indices", self._load_market_indices)
 
+    def _load_market_indices(self) -> dict:
         indices = {}
         for ticker_sym, idx_name in [("^KS11", "KOSPI"), ("^KQ11", "KOSDAQ")]:
             try:
-                ticker = yf.Ticker(ticker_sym)
-                hist = ticker.history(period="2d")
+                hist = self._yf_history(ticker_sym, "2d")
                 if hist.empty or len(hist) < 1:
                     indices[idx_name] = {"name": idx_name, "value": 0, "change": 0, "changePct": 0, "signal": "3"}
                     continue
@@ -484,7 +817,6 @@ class KiwoomLogic:
                 logger.warning(f"Index [{idx_name}] fetch failed: {e}")
                 indices[idx_name] = {"name": idx_name, "value": 0, "change": 0, "changePct": 0, "signal": "3"}
 
-        self._set_cache("market_indices", indices)
         return indices
 
     # ═══════════════ Program Trading Trend (ka90005) ═══════════════
@@ -503,11 +835,7 @@ class KiwoomLogic:
         data = self._api.call("ka90005", "/api/dostk/stkinfo", body)
 
         # ── 응답에서 배열 데이터 자동 탐색 ──
-        items = []
-        for key, val in data.items():
-            if isinstance(val, list) and val and isinstance(val[0], dict):
-                items = val
-                break
+        items = extract_items(data)
 
         result = []
         running_cum = 0
@@ -599,47 +927,89 @@ class KiwoomLogic:
             ),
         }
 
+    # ═══════════════ Program Net Buy TOP 50 (ka90003) ═══════════════
+
+    def get_program_top(self, count: int = 50) -> list:
+        """ka90003 동기 래퍼 (get_program_top_async)."""
+        return self._run(self.get_program_top_async(count))
+
+    async def get_program_top_async(self, count: int = 50) -> list:
+        """
+        ka90003: 당일 프로그램 순매수 상위 — 코스피/코스닥 2회 동시 조회 후 금액 절대값 기준 통합.
+
+        Returns: [{rank, stk_cd, stk_nm, market, cur_prc, flu_rt, prm_netprps_amt}, ...]
+        """
+        markets = (("KOSPI", "P00101"), ("KOSDAQ", "P10102"))
+        responses = await asyncio.gather(*(
+            self._api.call_async("ka90003", "/api/dostk/stkinfo", {
+                "trde_upper_tp": "2", "amt_qty_tp": "1",
+                "mrkt_tp": mrkt_cd, "stex_tp": "1",
+            })
+            for _, mrkt_cd in markets
+        ))
+
+        parts = [decode("ka90003", data) for data in responses]
+        for p, (m, _) in zip(parts, markets):
+            self._remember_names(p.records({"code": "stk_cd", "name": "stk_nm"}), market=m)
+        cols = Columns.concat(parts)
+        market = np.concatenate([np.full(len(p), m, dtype="<U6") for p, (m, _) in zip(parts, markets)])
+
+        order = np.argsort(-np.abs(cols["prm_netprps_amt"]), kind="stable")[:count]
+        return cols.take(order).records({
+            "rank": np.arange(1, len(order) + 1),
+            "stk_cd": "stk_cd",
+            "stk_nm": "stk_nm",
+            "market": market[order],
+            "cur_prc": "cur_prc",
+            "flu_rt": "flu_rt",
+            "prm_netprps_amt": "prm_netprps_amt",
+        })
+
     # ═══════════════ Provisional Ranking (ka10065) ═══════════════
 
-    def get_provisional_ranking(self, orgn_tp: str = "9100", trde_tp: str = "1", mrkt_tp: str = "0") -> list:
+    def get_provisional_ranking(self, orgn_tp: str = "9100", trde_tp: str = "1", mrkt_tp: str = "0",
+                                limit: int | None = None) -> list:
+        """ka10065 랭킹 동기 래퍼 (get_provisional_ranking_async)."""
+        return self._run(self.get_provisional_ranking_async(orgn_tp, trde_tp, mrkt_tp, limit))
+
+    async def get_provisional_ranking_async(self, orgn_tp: str = "9100", trde_tp: str = "1",
+                                            mrkt_tp: str = "0", limit: int | None = None) -> list:
         """
         ka10065: 투자자별 가집계 순매수 상위 랭킹.
         orgn_tp: "9000"=프로그램, "9100"=기관, "9200"=외국인
         trde_tp: "0"=전체, "1"=순매수상위
         mrkt_tp: "0"=KOSPI, "1"=KOSDAQ
+        limit: 상위 N종목만 (충족 시 다음 페이지 미요청), None=연속조회 전체
 
         Returns: [{code, name, buyQty, sellQty, netQty}, ...]
         """
-        cache_key = f"prov_rank_{orgn_tp}_{trde_tp}_{mrkt_tp}"
+        cache_key = f"prov_rank_{orgn_tp}_{trde_tp}_{mrkt_tp}" + (f"_{limit}" if limit else "")
         cached = self._get_cache(cache_key, ttl=25)
         if cached:
             return cached
 
         body = {"orgn_tp": orgn_tp, "trde_tp": trde_tp, "mrkt_tp": mrkt_tp}
-        data = self._api.call("ka10065", "/api/dostk/rkinfo", body)
-        items = data.get("opmr_invsr_trde_upper", [])
-
-        result = []
-        for item in items:
-            code = str(item.get("stk_cd", "")).replace("_AL", "").replace("_NX", "").strip()
-            if not code or len(code) != 6:
-                continue
-
-            result.append({
-                "code": code,
-                "name": str(item.get("stk_nm", "")).strip(),
-                "buyQty": self._parse_int(item.get("buy_qty", "0")),
-                "sellQty": self._parse_int(item.get("sel_qty", "0")),
-                "netQty": self._parse_int(item.get("netslmt", "0")),
-            })
+        cols = await self._api.decode_pages_async("ka10065", "/api/dostk/rkinfo", body, limit)
+        result = cols.records({
+            "code": "stk_cd",
+            "name": "stk_nm",
+            "buyQty": "buy_qty",
+            "sellQty": "sel_qty",
+            "netQty": "netslmt",
+        })
 
         if result:
             self._set_cache(cache_key, result)
+            self._remember_names(result, market=mrkt_tp)
         return result
 
     # ═══════════════ Top Trading Volume (ka10032) ═══════════════
 
     def get_top_volume_stocks(self, mrkt_tp: str = "0", count: int = 50) -> list:
+        """ka10032 동기 래퍼 (get_top_volume_stocks_async)."""
+        return self._run(self.get_top_volume_stocks_async(mrkt_tp, count))
+
+    async def get_top_volume_stocks_async(self, mrkt_tp: str = "0", count: int = 50) -> list:
         """
         ka10032: 거래대금상위 — 장중 거래대금 기준 상위 종목.
         mrkt_tp: "0"=KOSPI, "1"=KOSDAQ
@@ -651,37 +1021,19 @@ class KiwoomLogic:
             return cached
 
         body = {"mrkt_tp": mrkt_tp, "vol_qty_tp": "0", "stex_tp": "3", "mang_stk_incls": "0"}
-        data = self._api.call("ka10032", "/api/dostk/rkinfo", body)
-
-        items = data.get("trde_prica_upper", [])
-        if not items:
-            for key, val in data.items():
-                if isinstance(val, list) and val and isinstance(val[0], dict):
-                    items = val
-                    break
-
-        result = []
-        for item in items[:count]:
-            code = str(item.get("stk_cd", "")).replace("_AL", "").replace("_NX", "").strip()
-            if not code or len(code) != 6:
-                continue
-
-            trade_amt = self._parse_int(
-                item.get("trde_prica", item.get("trde_amt", item.get("trde_val", "0")))
-            )
-            cur_prc = abs(self._parse_int(item.get("cur_prc", item.get("prc", "0"))))
-            flu_rt = self._parse_float(item.get("flu_rt", "0"))
-
-            result.append({
-                "code": code,
-                "name": str(item.get("stk_nm", "")).strip(),
-                "tradeAmt": trade_amt,
-                "curPrc": cur_prc,
-                "changePct": flu_rt,
-            })
+        # 상위 count 충족 시 다음 페이지 요청 안 함
+        cols = await self._api.decode_pages_async("ka10032", "/api/dostk/rkinfo", body, count)
+        result = cols.records({
+            "code": "stk_cd",
+            "name": "stk_nm",
+            "tradeAmt": "trde_prica",
+            "curPrc": "cur_prc",
+            "changePct": "flu_rt",
+        })
 
         if result:
             self._set_cache(f"top_volume_{mrkt_tp}", result)
+            self._remember_names(result, market=mrkt_tp)
         return result
 
     # ═══════════════ Market Indices (yfinance) ═══════════════
@@ -693,9 +1045,7 @@ class KiwoomLogic:
             return cached
 
         try:
-            import yfinance as yf
-            ticker = yf.Ticker("^IXIC")
-            hist = ticker.history(period="2d")
+            hist = self._yf_history("^IXIC", "2d")
             if hist.empty or len(hist) < 1:
                 return {"name": "NASDAQ", "value": 0, "change": 0, "changePct": 0, "signal": "3"}
 
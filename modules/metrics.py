@@ -0,0 +1,274 @@
+"""
+AX RADAR v5.3 - Metrics
+Prometheus 텍스트 노출 형식(/metrics)용 경량 계측 — 외부 의존성 없음, 관측 1회 = lock 1회 + bisect.
+
+    KIWOOM_SECONDS.labels("ka10032").observe(0.12)
+    HTTP_INFLIGHT.inc()
+    REGISTRY.collector(fn)      # 조회 시점에 기존 통계(캐시 · limiter · 토큰)를 샘플로 변환
+
+라벨 값은 호출 측에서 카디널리티를 제한한다 (api-id, 라우트 규칙, 캐시 키 계열 — 종목코드 · URL 원문은 금지).
+"""
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UPSTREAM_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    if isinstance(v, float) and v.is_integer() and abs(v) < 1e15:
+        return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Metric types
+# ═══════════════════════════════════════════════════════════════════
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: tuple = ()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict = {}
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(list(self._children.items())):
+            lines.extend(child.lines(self.name, _labels(self.labelnames, values), self.labelnames, values))
+        return lines
+
+
+class _Value:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def lines(self, name: str, labels: str, *_):
+        return [f"{name}{labels} {_num(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("_lock", "bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)       # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def lines(self, name: str, labels: str, labelnames: tuple, values: tuple):
+        with self._lock:
+            counts, total, n = list(self.counts), self.sum, self.count
+        out, acc = [], 0
+        for bound, c in zip(self.bounds + (float("inf"),), counts):
+            acc += c
+            le = 'le="%s"' % _num(bound)
+            out.append(f"{name}_bucket{_labels(labelnames, values, le)} {acc}")
+        out.append(f"{name}_sum{labels} {_num(round(total, 6))}")
+        out.append(f"{name}_count{labels} {n}")
+        return out
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Registry
+# ═══════════════════════════════════════════════════════════════════
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+        self._collectors: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, doc: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, doc, labelnames))
+
+    def gauge(self, name: str, doc: str, labelnames: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, doc, labelnames))
+
+    def histogram(self, name: str, doc: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, doc, labelnames, buckets))
+
+    def collector(self, fn):
+        """
+        fn() → [(name, kind, doc, [({label: value}, number), ...]), ...]
+        /metrics 조회 때만 호출 — 이미 집계 중인 통계를 계측 코드 없이 노출.
+        """
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for fn in self._collectors:
+            try:
+                families = fn()
+            except Exception as e:  # 통계 조회 실패가 /metrics 전체를 막지 않도록
+                lines.append(f"# collector {getattr(fn, '__name__', '?')} failed: {_escape(e)}")
+                continue
+            for name, kind, doc, samples in families:
+                lines.append(f"# HELP {name} {doc}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    names = tuple(labels)
+                    lines.append(f"{name}{_labels(names, tuple(labels[n] for n in names))} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── HTTP (Flask 라우트) ──
+HTTP_SECONDS = REGISTRY.histogram(
+    "axradar_http_request_duration_seconds", "Flask request latency by route rule", ("route", "method"))
+HTTP_REQUESTS = REGISTRY.counter(
+    "axradar_http_requests_total", "Flask responses by route rule and status", ("route", "method", "status"))
+HTTP_INFLIGHT = REGISTRY.gauge("axradar_http_inflight_requests", "Requests currently being handled")
+
+# ── Kiwoom REST ──
+KIWOOM_SECONDS = REGISTRY.histogram(
+    "axradar_kiwoom_request_duration_seconds", "Kiwoom REST round trip by api-id", ("api_id",), UPSTREAM_BUCKETS)
+KIWOOM_REQUESTS = REGISTRY.counter(
+    "axradar_kiwoom_requests_total", "Kiwoom REST calls by api-id and result (ok, http_429, http_4xx, http_5xx, error)",
+    ("api_id", "result"))
+KIWOOM_INFLIGHT = REGISTRY.gauge("axradar_kiwoom_inflight_requests", "Kiwoom REST calls in flight", ("api_id",))
+TOKEN_ISSUES = REGISTRY.counter("axradar_kiwoom_token_issues_total", "au10001 token issue attempts", ("result",))
+TOKEN_SECONDS = REGISTRY.histogram(
+    "axradar_kiwoom_token_issue_duration_seconds", "au10001 token issue latency", buckets=UPSTREAM_BUCKETS)
+
+# ── 외부 데이터 (pykrx · yfinance) ──
+EXTERNAL_SECONDS = REGISTRY.histogram(
+    "axradar_external_fetch_duration_seconds", "pykrx / yfinance fetch latency", ("source", "fn"), UPSTREAM_BUCKETS)
+EXTERNAL_ERRORS = REGISTRY.counter(
+    "axradar_external_fetch_errors_total", "pykrx / yfinance fetch failures", ("source", "fn"))
+
+# ── 스냅샷 · 캐시 대체 응답 ──
+FETCH_ERRORS = REGISTRY.counter(
+    "axradar_panel_fetch_errors_total", "Route/panel fetch failures by cache key", ("key",))
+SERVED_STALE = REGISTRY.counter(
+    "axradar_served_stale_total", "Responses served from the last snapshot/cache after a fetch failure", ("key",))
+
+
+class track_inflight:
+    """with track_inflight(gauge): 진입 시 +1, 종료 시 -1."""
+
+    __slots__ = ("_child",)
+
+    def __init__(self, gauge, *labels):
+        self._child = gauge.labels(*labels)
+
+    def __enter__(self):
+        self._child.inc()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.dec()
+        return False
+
+
+def result_of(exc: Exception | None) -> str:
+    """Kiwoom 호출 결과 라벨 (HTTPError는 응답 상태 코드로 분류)."""
+    if exc is None:
+        return "ok"
+    code = getattr(getattr(exc, "response", None), "status_code", None)
+    if code == 429:
+        return "http_429"
+    if code is not None and 400 <= code < 500:
+        return "http_4xx"
+    if code is not None and code >= 500:
+        return "http_5xx"
+    return "error"
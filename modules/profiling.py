@@ -0,0 +1,288 @@
+"""
+AX RADAR v5.3 - On-demand Request Profiling
+운영 중 느린 요청 1건을 처음부터 끝까지 cProfile로 기록하고, 벽시계 시간을 upstream 대기와 로컬 실행으로 나눈다.
+
+트리거 (둘 다 opt-in):
+- 헤더  X-Profile: {PROFILE_TOKEN}          — 특정 요청을 지정해 프로파일
+- 표본  PROFILE_SAMPLE_RATE (0~1)           — PROFILE_SAMPLE_PATHS 접두어 경로에서 무작위
+
+프로파일 중인 요청은
+- EventLoopThread.run()이 코루틴을 요청 스레드의 임시 루프에서 실행 (aio.inline) → 코루틴 CPU도 cProfile에 포함
+- ContextExecutor(kiwoom-io · 축적 분석 · 대시보드 풀)로 세션이 전달 → 워커 스레드의 Kiwoom 호출도 upstream에 집계
+  (cProfile은 enable()한 요청 스레드만 관찰 — 워커 스레드의 파싱 · 분석 CPU는 top/cpuSec에 없고 processCpuSec · upstream 구간에만 반영)
+
+결과: {PROFILE_DIR}/{id}.prof (pstats) + {id}.json (요약: wall · CPU · upstream/external/쿼터 대기 · 상위 함수)
+최근 PROFILE_KEEP건만 유지. /admin/profiles (목록) · /admin/profiles/<id> (.prof 다운로드, ?format=txt 텍스트).
+
+동시에 1건만 프로파일 — processCpuSec · 스레드 전달 세션이 다른 요청과 섞이지 않도록, 진행 중이면 건너뛴다.
+"""
+import contextvars
+import cProfile
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+from datetime import datetime
+
+from config import PROFILE_DIR, PROFILE_KEEP, PROFILE_SAMPLE_PATHS, PROFILE_SAMPLE_RATE, PROFILE_TOKEN
+
+from .aio import inline
+
+logger = logging.getLogger("profiling")
+
+_session = contextvars.ContextVar("profile_session", default=None)
+_busy = threading.Lock()
+
+PROFILE_ID = re.compile(r"^\d{8}-\d{6}-[a-z0-9_]{1,40}-[0-9a-f]{6}$")
+EXCLUDED_PREFIXES = ("/admin/", "/metrics", "/static/", "/api/v3/stream")   # SSE는 연결 종료까지 teardown이 없음
+
+
+def should_profile(path: str, header: str = "") -> str:
+    """트리거 사유 ("header" | "sample") 또는 ""."""
+    if path.startswith(EXCLUDED_PREFIXES):
+        return ""
+    if header and PROFILE_TOKEN and hmac.compare_digest(header, PROFILE_TOKEN):
+        return "header"
+    if PROFILE_SAMPLE_RATE > 0 and path.startswith(PROFILE_SAMPLE_PATHS) and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return ""
+
+
+def authorized(headers) -> bool:
+    """관리 엔드포인트: X-Profile-Token 또는 Authorization: Bearer {PROFILE_TOKEN}."""
+    if not PROFILE_TOKEN:
+        return False
+    given = headers.get("X-Profile-Token", "")
+    auth = headers.get("Authorization", "")
+    if not given and auth.startswith("Bearer "):
+        given = auth[7:]
+    return bool(given) and hmac.compare_digest(given, PROFILE_TOKEN)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Upstream 기록 (계측 지점에서 호출 — 세션 없으면 contextvar 조회 1회)
+# ═══════════════════════════════════════════════════════════════════
+
+def record_upstream(api_id: str, t0: float, t1: float):
+    session = _session.get()
+    if session is not None:
+        session.add("kiwoom", api_id, t0, t1)
+
+
+def record_external(source: str, fn_name: str, t0: float, t1: float):
+    session = _session.get()
+    if session is not None:
+        session.add("external", f"{source}.{fn_name}", t0, t1)
+
+
+def record_wait(seconds: float):
+    session = _session.get()
+    if session is not None and seconds > 0:
+        session.add_wait(seconds)
+
+
+def _union(intervals: list) -> float:
+    """겹치는 구간을 합친 총 길이 (동시 호출은 한 번만)."""
+    total, end = 0.0, float("-inf")
+    for a, b in sorted(intervals):
+        if a > end:
+            total += b - a
+            end = b
+        elif b > end:
+            total += b - end
+            end = b
+    return total
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Session
+# ═══════════════════════════════════════════════════════════════════
+
+class ProfileSession:
+    def __init__(self, method: str, path: str, query: str, route: str, reason: str):
+        slug = re.sub(r"[^a-z0-9]+", "_", route.lower()).strip("_")[:40] or "root"
+        self.id = f"{datetime.now():%Y%m%d-%H%M%S}-{slug}-{secrets.token_hex(3)}"
+        self.method = method
+        self.path = path
+        self.query = query
+        self.route = route
+        self.reason = reason
+        self.status = None
+        self._lock = threading.Lock()
+        self._calls: list = []          # (kind, name, t0, t1)
+        self._wait = 0.0
+        self._profiler = cProfile.Profile()
+        self._tokens = ()
+
+    @classmethod
+    def begin(cls, *args):
+        """프로파일 시작. 이미 다른 요청을 프로파일 중이면 None."""
+        if not _busy.acquire(blocking=False):
+            return None
+        session = cls(*args)
+        try:
+            session._tokens = (_session.set(session), inline.set(True))
+            session._t0 = time.perf_counter()
+            session._cpu0 = time.thread_time()
+            session._proc0 = time.process_time()
+            session._profiler.enable()
+        except Exception:
+            _busy.release()
+            raise
+        return session
+
+    def add(self, kind: str, name: str, t0: float, t1: float):
+        with self._lock:
+            self._calls.append((kind, name, t0, t1))
+
+    def add_wait(self, seconds: float):
+        with self._lock:
+            self._wait += seconds
+
+    def finish(self, exc: BaseException | None = None) -> dict | None:
+        try:
+            self._profiler.disable()
+            wall = time.perf_counter() - self._t0
+            cpu = time.thread_time() - self._cpu0
+            proc = time.process_time() - self._proc0
+        finally:
+            session_token, inline_token = self._tokens
+            _session.reset(session_token)
+            inline.reset(inline_token)
+            _busy.release()
+        try:
+            summary = self._summary(wall, cpu, proc, exc)
+            self._write(summary)
+            return summary
+        except Exception as e:
+            logger.warning(f"Profile [{self.id}] write failed: {e}")
+            return None
+
+    # ── 요약 ──
+
+    def _breakdown(self, kind: str) -> dict:
+        calls = [c for c in self._calls if c[0] == kind]
+        by_name: dict = {}
+        for _, name, a, b in calls:
+            entry = by_name.setdefault(name, {"calls": 0, "sec": 0.0, "maxSec": 0.0})
+            entry["calls"] += 1
+            entry["sec"] += b - a
+            entry["maxSec"] = max(entry["maxSec"], b - a)
+        for entry in by_name.values():
+            entry["sec"] = round(entry["sec"], 4)
+            entry["maxSec"] = round(entry["maxSec"], 4)
+        return {
+            "calls": len(calls),
+            "sumSec": round(sum(b - a for _, _, a, b in calls), 4),
+            "wallSec": round(_union([(a, b) for _, _, a, b in calls]), 4),
+            "byName": dict(sorted(by_name.items(), key=lambda kv: -kv[1]["sec"])),
+        }
+
+    def _summary(self, wall: float, cpu: float, proc: float, exc) -> dict:
+        with self._lock:
+            waiting = _union([(a, b) for _, _, a, b in self._calls])
+            upstream, external, limiter = self._breakdown("kiwoom"), self._breakdown("external"), self._wait
+        stats = pstats.Stats(self._profiler)
+        top = sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:25]
+        return {
+            "id": self.id,
+            "createdAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "reason": self.reason,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "route": self.route,
+            "status": 500 if exc is not None else self.status,
+            "error": repr(exc) if exc is not None else None,
+            "wallSec": round(wall, 4),
+            "cpuSec": round(cpu, 4),                 # 요청 스레드 CPU (inline 코루틴 포함)
+            "processCpuSec": round(proc, 4),         # 프로세스 전체 CPU (동시 요청 · 워커 스레드 포함)
+            "upstream": upstream,
+            "external": external,
+            "limiterWaitSec": round(limiter, 4),
+            # upstream · external 대기 구간(합집합)과 쿼터 대기를 뺀 나머지 = 로컬 실행 (Python CPU + 잠금 · GIL 대기)
+            "localSec": round(max(wall - waiting - limiter, 0.0), 4),
+            "top": [
+                {
+                    "func": f"{os.path.basename(file)}:{line}({name})",
+                    "ncalls": nc, "tottime": round(tt, 5), "cumtime": round(ct, 5),
+                }
+                for (file, line, name), (_, nc, tt, ct, _) in top
+            ],
+        }
+
+    def _write(self, summary: dict):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        self._profiler.dump_stats(os.path.join(PROFILE_DIR, f"{self.id}.prof"))
+        tmp = os.path.join(PROFILE_DIR, f".{self.id}.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, os.path.join(PROFILE_DIR, f"{self.id}.json"))
+        rotate()
+        logger.info(f"Profile [{self.id}] {self.method} {self.path} {summary['wallSec']:.3f}s "
+                    f"(upstream {summary['upstream']['wallSec']:.3f}s, local {summary['localSec']:.3f}s)")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Profile directory
+# ═══════════════════════════════════════════════════════════════════
+
+def _ids() -> list:
+    """최신순 id (같은 초 안의 순서는 요약 파일 기록 시각)."""
+    try:
+        entries = [e for e in os.scandir(PROFILE_DIR) if e.name.endswith(".json") and PROFILE_ID.match(e.name[:-5])]
+        entries.sort(key=lambda e: (e.stat().st_mtime_ns, e.name), reverse=True)
+    except OSError:
+        return []
+    return [e.name[:-5] for e in entries]
+
+
+def rotate(keep: int = PROFILE_KEEP):
+    for pid in _ids()[max(keep, 1):]:
+        for ext in (".json", ".prof"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, pid + ext))
+            except OSError:
+                pass
+
+
+def list_profiles(limit: int = 50) -> list:
+    """최근 프로파일 요약 (상위 함수 목록 제외)."""
+    out = []
+    for pid in _ids()[:limit]:
+        try:
+            with open(os.path.join(PROFILE_DIR, f"{pid}.json"), "r", encoding="utf-8") as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            continue
+        doc.pop("top", None)
+        for part in ("upstream", "external"):
+            doc.get(part, {}).pop("byName", None)
+        out.append(doc)
+    return out
+
+
+def profile_path(pid: str) -> str | None:
+    """검증된 id의 .prof 경로 (없거나 형식이 다르면 None)."""
+    if not PROFILE_ID.match(pid):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{pid}.prof")
+    return path if os.path.isfile(path) else None
+
+
+def render_text(pid: str, sort: str = "cumulative", limit: int = 80) -> str | None:
+    path = profile_path(pid)
+    if path is None:
+        return None
+    buf = io.StringIO()
+    stats = pstats.Stats(path, stream=buf)
+    stats.strip_dirs().sort_stats(sort if sort in ("cumulative", "tottime", "ncalls") else "cumulative")
+    stats.print_stats(limit)
+    return buf.getvalue()
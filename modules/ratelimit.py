@@ -0,0 +1,91 @@
+"""
+AX RADAR v5.3 - Kiwoom Rate Limiter
+Process-wide token bucket (global + per api-id) applied inside KiwoomAPI.call / call_async.
+"""
+import asyncio
+import threading
+import time
+
+from config import KIWOOM_RATE_BURST, KIWOOM_RATE_LIMIT, KIWOOM_RATE_LIMIT_PER_API
+
+
+class TokenBucket:
+    """
+    예약(reservation) 방식 토큰 버킷 (GCRA — 다음 토큰의 이론적 도착 시각으로 표현).
+
+    예약마다 사용 시점(slot)을 확정하고 도착 시각을 1/rate만큼 뒤로 민다.
+    미래 시점(at) 예약도 같은 시간축에 배정되므로, 예약된 시점에 실제로 호출하면
+    어떤 구간에서도 burst + rate × 구간 길이를 넘지 않는다.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self._interval = 1.0 / self.rate
+        self._tolerance = (self.burst - 1) * self._interval     # 버스트 허용 폭
+        self._tat = float("-inf")                               # 다음 토큰의 이론적 도착 시각
+
+    def ready(self, at: float) -> float:
+        """at 이후 토큰을 쓸 수 있는 가장 이른 시각 (예약하지 않음)."""
+        return max(at, self._tat - self._tolerance)
+
+    def reserve(self, now: float, at: float | None = None) -> float:
+        """
+        at(기본 now) 이후 가장 이른 시점에 토큰 1개 예약.
+        반환값 = now부터 사용 가능 시점까지 대기 시간(초).
+        """
+        slot = self.ready(now if at is None else max(now, at))
+        self._tat = max(self._tat, slot) + self._interval
+        return slot - now
+
+
+class RateLimiter:
+    """
+    키움 REST 쿼터 관리자.
+
+    - global: 전체 api-id 합산 초당 호출 수
+    - per_api: {api_id: (rate, burst)} 개별 api-id 예산 (선택)
+
+    acquire()는 두 버킷 모두에서 토큰을 예약한 뒤 필요한 만큼만 대기한다.
+    acquire_async()는 같은 버킷을 공유하되 스레드 대신 이벤트 루프에서 대기한다.
+    """
+
+    def __init__(self, rate: float, burst: float = 1, per_api: dict | None = None):
+        self._lock = threading.Lock()
+        self._global = TokenBucket(rate, burst)
+        self._per_api = {
+            api_id: TokenBucket(r, b) for api_id, (r, b) in (per_api or {}).items()
+        }
+        self.waits = 0
+        self.waited_sec = 0.0
+
+    def reserve(self, api_id: str) -> float:
+        with self._lock:
+            now = time.monotonic()
+            # api-id 버킷이 준비되는 시점에 맞춰 전역 슬롯 예약 (지금 예약하면 대기하는 동안 슬롯이 버려짐)
+            bucket = self._per_api.get(api_id)
+            at = bucket.ready(now) if bucket is not None else now
+            wait = self._global.reserve(now, at)
+            if bucket is not None:
+                bucket.reserve(now, now + wait)
+            if wait > 0:
+                self.waits += 1
+                self.waited_sec += wait
+        return wait
+
+    def acquire(self, api_id: str) -> float:
+        """쿼터 내에서 호출 가능해질 때까지 블록. 반환값 = 실제 대기 시간(초)."""
+        wait = self.reserve(api_id)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, api_id: str) -> float:
+        wait = self.reserve(api_id)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# ── 프로세스 전역 limiter (모든 KiwoomAPI 인스턴스 공유) ──
+kiwoom_limiter = RateLimiter(KIWOOM_RATE_LIMIT, KIWOOM_RATE_BURST, KIWOOM_RATE_LIMIT_PER_API)
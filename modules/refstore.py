@@ -0,0 +1,202 @@
+"""
+AX RADAR v5.3 - Reference Data Store
+느리게 바뀌는 참조 데이터(업종 맵, ax_universe, 종목명)의 로컬 영속 저장소.
+
+파일 형식: {REF_DATA_DIR}/{name}.json
+    {"built": "20260209", "builtAt": "2026-02-09 08:41:02", "data": {...}}
+
+- 기동 시 디스크에서 즉시 로드 (네트워크 호출 없음)
+- built 날짜가 오늘이 아니면 stale → 백그라운드에서 재구축, 그동안 기존 데이터 제공
+- 저장은 임시 파일 + os.replace (원자적 교체), 워커 프로세스 간 공유 가능
+- merge()로 쌓인 변경은 REF_FLUSH_INTERVAL 안에 타이머로 기록, 프로세스 종료 시 atexit로 남은 변경 기록
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from config import REF_DATA_DIR, REF_FLUSH_INTERVAL
+
+logger = logging.getLogger("refstore")
+
+
+class ReferenceStore:
+    """이름별 참조 데이터 (메모리 + 디스크)."""
+
+    def __init__(self, root: str = REF_DATA_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._items: dict = {}          # name → {"built", "builtAt", "data"}
+        self._building: set = set()
+        self._dirty: set = set()
+        self._last_flush: dict = {}
+        self._timers: dict = {}         # name → 예약된 지연 flush (threading.Timer)
+        self._listeners: list = []
+        atexit.register(self.flush_all)
+
+    def on_put(self, fn):
+        """put()으로 데이터가 교체될 때마다 fn(name, data) 호출 (심볼 마스터 갱신 등)."""
+        self._listeners.append(fn)
+        return fn
+
+    # ── 파일 I/O ──
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.json")
+
+    def _read(self, name: str) -> dict | None:
+        try:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            if isinstance(doc, dict) and "data" in doc:
+                return doc
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Reference [{name}] load failed: {e}")
+        return None
+
+    def _write(self, name: str, doc: dict):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # ── 조회 ──
+
+    def _entry(self, name: str) -> dict | None:
+        entry = self._items.get(name)
+        if entry is None:
+            entry = self._read(name)
+            if entry is not None:
+                with self._lock:
+                    entry = self._items.setdefault(name, entry)
+        return entry
+
+    def peek(self, name: str, default=None):
+        """디스크/메모리에 있는 데이터 그대로 반환 (재구축 없음)."""
+        entry = self._entry(name)
+        return entry["data"] if entry is not None else default
+
+    def built(self, name: str) -> str:
+        entry = self._entry(name)
+        return entry["built"] if entry is not None else ""
+
+    def is_stale(self, name: str) -> bool:
+        return self.built(name) != datetime.now().strftime("%Y%m%d")
+
+    def get(self, name: str, builder, stale_fn=None):
+        """
+        참조 데이터 조회.
+          저장본 있음 + 최신 → 즉시 반환
+          저장본 있음 + stale → 즉시 반환 + 백그라운드 재구축
+          저장본 없음 → builder() 동기 실행
+        stale_fn(entry) 지정 시 기본 날짜 비교 대신 사용.
+        """
+        entry = self._entry(name)
+        if entry is None:
+            return self.put(name, builder())
+        stale = stale_fn(entry) if stale_fn else entry["built"] != datetime.now().strftime("%Y%m%d")
+        if stale:
+            self.refresh_async(name, builder)
+        return entry["data"]
+
+    # ── 저장 ──
+
+    def put(self, name: str, data):
+        now = datetime.now()
+        doc = {"built": now.strftime("%Y%m%d"), "builtAt": now.strftime("%Y-%m-%d %H:%M:%S"), "data": data}
+        with self._lock:
+            self._items[name] = doc
+            self._dirty.discard(name)
+            self._last_flush[name] = time.time()
+        try:
+            self._write(name, doc)
+        except OSError as e:
+            logger.warning(f"Reference [{name}] save failed: {e}")
+        for fn in self._listeners:
+            try:
+                fn(name, data)
+            except Exception as e:
+                logger.warning(f"Reference [{name}] listener failed: {e}")
+        return data
+
+    def merge(self, name: str, updates: dict):
+        """dict 형 참조 데이터에 항목 병합 (예: 종목명). 디스크 기록은 REF_FLUSH_INTERVAL 간격."""
+        if not updates:
+            return
+        with self._lock:
+            entry = self._items.get(name)
+            if entry is None:
+                entry = self._read(name) or {"built": "", "builtAt": "", "data": {}}
+                self._items[name] = entry
+            data = entry["data"]
+            changed = False
+            for k, v in updates.items():
+                if v and data.get(k) != v:
+                    data[k] = v
+                    changed = True
+            if not changed:
+                return
+            self._dirty.add(name)
+            remaining = REF_FLUSH_INTERVAL - (time.time() - self._last_flush.get(name, 0))
+            if remaining > 0 and name not in self._timers:
+                # 이후 변경이 없어도 마지막 배치가 디스크에 남도록 지연 flush 예약
+                timer = self._timers[name] = threading.Timer(remaining, self.flush, (name,))
+                timer.daemon = True
+                timer.start()
+        if remaining <= 0:
+            self.flush(name)
+
+    def flush(self, name: str):
+        with self._lock:
+            timer = self._timers.pop(name, None)
+            if name not in self._dirty:
+                return
+            entry = self._items[name]
+            now = datetime.now()
+            entry["built"] = now.strftime("%Y%m%d")
+            entry["builtAt"] = now.strftime("%Y-%m-%d %H:%M:%S")
+            doc = {"built": entry["built"], "builtAt": entry["builtAt"], "data": dict(entry["data"])}
+            self._dirty.discard(name)
+            self._last_flush[name] = time.time()
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        try:
+            self._write(name, doc)
+        except OSError as e:
+            logger.warning(f"Reference [{name}] flush failed: {e}")
+
+    def flush_all(self):
+        """기록 대기 중인 변경 전부 (종료 시 atexit)."""
+        for name in list(self._dirty):
+            self.flush(name)
+
+    def refresh_async(self, name: str, builder):
+        with self._lock:
+            if name in self._building:
+                return
+            self._building.add(name)
+
+        def run():
+            try:
+                self.put(name, builder())
+                logger.info(f"Reference [{name}] refreshed")
+            except Exception as e:
+                logger.warning(f"Reference [{name}] refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._building.discard(name)
+
+        threading.Thread(target=run, name=f"ref-{name}", daemon=True).start()
+
+    def status(self) -> dict:
+        return {
+            name: {"built": entry["built"], "builtAt": entry["builtAt"], "size": len(entry["data"])}
+            for name, entry in list(self._items.items())
+        }
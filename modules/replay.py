@@ -0,0 +1,243 @@
+"""
+AX RADAR v5.3 - Hong Strategy Replay
+장중 기록(IntradayStore)의 ka10032 · ka10065 스냅샷을 실제 HongSignalScanner.scan_strategy에 다시 흘려
+시그널 타임라인을 만들고, 이후 실현 가격 변화와 비교한다 (API 호출 · 쿼터 소모 없음).
+
+    replay = StrategyReplay(IntradayStore(), sector_map, names)
+    result = replay.run("20261017", mrkt_tp="0")
+    result["events"]     # 신규 진입 · 레벨 상향 시점 + 이후 수익률
+    result["summary"]    # 레벨별 건수 · 평균 수익률 · 적중률
+
+CLI: python -m modules.replay 20261017 --market 0
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .hong_signal import HongSignalScanner
+from .intraday import IntradayStore, batches
+
+HORIZONS = {"5m": 300, "15m": 900, "30m": 1800}
+LEVEL_RANK = {"WATCH": 0, "ACTIVE": 1, "STRONG": 2}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Recorded inputs
+# ═══════════════════════════════════════════════════════════════════
+
+class _Frames:
+    """테이블 1개를 ts별 배치로 분할 — 컬럼 변환은 테이블당 1회."""
+
+    def __init__(self, cols: dict, row_fn):
+        self.ts = cols["ts"]
+        self._spans = {float(self.ts[a]): (a, b) for a, b in batches(self.ts)}
+        self._rows = row_fn(cols)
+
+    def at(self, ts: float) -> list:
+        span = self._spans.get(ts)
+        return self._rows[span[0]:span[1]] if span else []
+
+    def stamps(self) -> list:
+        return list(self._spans)
+
+
+class ReplayClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Symbols:
+    def __init__(self, sector_map: dict, names: dict):
+        self._sectors = sector_map
+        self._names = names
+
+    def sector(self, code: str, default: str = "기타") -> str:
+        return self._sectors.get(code) or default
+
+    def name(self, code: str, default: str = "") -> str:
+        return self._names.get(code) or default
+
+
+class ReplayKiwoom:
+    """scan_strategy가 쓰는 KiwoomLogic 인터페이스를 현재 리플레이 시각의 기록 스냅샷으로 응답."""
+
+    def __init__(self, clock: ReplayClock, volume: _Frames, rankings: dict, sector_map: dict, names: dict):
+        self.clock = clock
+        self._volume = volume
+        self._rankings = rankings           # orgn_tp → _Frames
+        self._sector_map = sector_map
+        self.symbols = _Symbols(sector_map, names)
+
+    async def get_top_volume_stocks_async(self, mrkt_tp: str = "0", count: int = 50) -> list:
+        return self._volume.at(self.clock.now)[:count]
+
+    async def get_provisional_ranking_async(self, orgn_tp: str = "9100", trde_tp: str = "1",
+                                            mrkt_tp: str = "0", limit: int | None = None) -> list:
+        frames = self._rankings.get(orgn_tp)
+        return frames.at(self.clock.now) if frames is not None else []
+
+    def _get_sector_map(self) -> dict:
+        return self._sector_map
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Replay
+# ═══════════════════════════════════════════════════════════════════
+
+class StrategyReplay:
+    def __init__(self, store: IntradayStore, sector_map: dict, names: dict | None = None,
+                 horizons: dict | None = None):
+        self.store = store
+        self.sector_map = sector_map
+        self.names = names or {}
+        self.horizons = horizons or HORIZONS
+
+    def _load(self, day: str, mrkt_tp: str) -> tuple:
+        names = self.names
+        volume = self.store.read(f"volume_{mrkt_tp}", day)
+
+        def volume_rows(cols):
+            codes = cols["code"].astype(str).tolist()
+            return [
+                {"code": c, "name": names.get(c, c), "tradeAmt": a, "curPrc": p, "changePct": g}
+                for c, a, p, g in zip(codes, cols["amt"].tolist(), cols["price"].tolist(), cols["chg"].tolist())
+            ]
+
+        def ranking_rows(cols):
+            codes = cols["code"].astype(str).tolist()
+            return [{"code": c, "name": names.get(c, c), "netQty": n} for c, n in zip(codes, cols["net"].tolist())]
+
+        rankings = {
+            orgn: _Frames(self.store.read(f"rank_{orgn}_{mrkt_tp}", day), ranking_rows)
+            for orgn in ("9100", "9000")
+        }
+        return volume, _Frames(volume, volume_rows), rankings
+
+    def run(self, day: str, mrkt_tp: str = "0") -> dict:
+        t0 = time.perf_counter()
+        volume_cols, volume, rankings = self._load(day, mrkt_tp)
+        clock = ReplayClock()
+        kiwoom = ReplayKiwoom(clock, volume, rankings, self.sector_map, self.names)
+        scanner = HongSignalScanner(kiwoom, clock=clock)   # 기록 없음 (journal=None)
+
+        timeline, events = asyncio.run(self._drive(scanner, clock, volume.stamps(), mrkt_tp))
+        self._attach_returns(events, volume_cols)
+
+        return {
+            "day": day,
+            "market": mrkt_tp,
+            "steps": len(timeline),
+            "elapsedMs": round((time.perf_counter() - t0) * 1000, 1),
+            "timeline": timeline,
+            "events": events,
+            "summary": self._summarize(events),
+        }
+
+    @staticmethod
+    async def _drive(scanner: HongSignalScanner, clock: ReplayClock, stamps: list, mrkt_tp: str) -> tuple:
+        timeline, events = [], []
+        best: dict = {}                     # code → 지금까지 최고 레벨
+        for ts in stamps:
+            clock.now = ts
+            result = await scanner.scan_strategy_async(mrkt_tp)
+            hhmmss = datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+            timeline.append({
+                "ts": ts,
+                "time": hhmmss,
+                "trend": result["program"]["trend"],
+                "slope": result["program"]["slope"],
+                "leadingSectors": list(result["leadingSectors"]),
+                "signals": [
+                    {"code": s["code"], "level": s["level"], "consecutive": s["consecutive"], "instNet": s["instNet"]}
+                    for s in result["signals"]
+                ],
+            })
+            for s in result["signals"]:
+                rank = LEVEL_RANK.get(s["level"], -1)
+                if rank > best.get(s["code"], -1):
+                    best[s["code"]] = rank
+                    events.append({
+                        "ts": ts, "time": hhmmss, "code": s["code"], "name": s["name"],
+                        "sector": s["sector"], "level": s["level"], "consecutive": s["consecutive"],
+                    })
+        return timeline, events
+
+    def _attach_returns(self, events: list, volume_cols: dict):
+        """
+        이벤트 시점 가격 대비 horizon 후(그 시각 이전 마지막 관측) · 장 마감(마지막 관측) 수익률(%).
+        가격은 거래대금 상위 스냅샷의 curPrc — 종목이 목록에서 빠진 구간은 직전 관측을 사용.
+        """
+        if not events:
+            return
+        codes = volume_cols["code"]
+        ts = np.asarray(volume_cols["ts"])
+        price = np.asarray(volume_cols["price"], dtype=np.float64)
+        uniq, ids = np.unique(codes, return_inverse=True)
+        order = np.lexsort((ts, ids))
+        ids, ts, price = ids[order], ts[order], price[order]
+        span = float(ts.max() - ts.min()) + max(self.horizons.values(), default=0) + 1.0
+        key = ids * span + (ts - ts.min())           # 종목별로 분리된 단조 증가 키
+
+        ev_code = np.array([e["code"] for e in events], dtype=uniq.dtype)
+        ev_ts = np.array([e["ts"] for e in events])
+        ev_id = np.searchsorted(uniq, ev_code)
+        known = (ev_id < len(uniq)) & (uniq[np.minimum(ev_id, len(uniq) - 1)] == ev_code)
+        base = ev_id * span - ts.min()
+
+        def price_at(target: np.ndarray) -> tuple:
+            idx = np.searchsorted(key, base + target, side="right") - 1
+            ok = known & (idx >= 0) & (ids[np.maximum(idx, 0)] == ev_id)
+            return np.where(ok, price[np.maximum(idx, 0)], np.nan), np.where(ok, ts[np.maximum(idx, 0)], np.nan)
+
+        p0, _ = price_at(ev_ts)
+        last_idx = np.searchsorted(ids, ev_id, side="right") - 1
+        p_close = np.where(known & (last_idx >= 0), price[np.maximum(last_idx, 0)], np.nan)
+        ts_close = np.where(known & (last_idx >= 0), ts[np.maximum(last_idx, 0)], np.nan)
+
+        rets = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for label, sec in self.horizons.items():
+                p, seen = price_at(ev_ts + sec)
+                rets[label] = np.where((p0 > 0) & (seen > ev_ts), (p / p0 - 1) * 100, np.nan)
+            rets["close"] = np.where((p0 > 0) & (ts_close > ev_ts), (p_close / p0 - 1) * 100, np.nan)
+
+        for i, e in enumerate(events):
+            e["price"] = None if np.isnan(p0[i]) else int(p0[i])
+            e["ret"] = {k: (None if np.isnan(v[i]) else round(float(v[i]), 2)) for k, v in rets.items()}
+
+    def _summarize(self, events: list) -> dict:
+        summary = {}
+        for level in LEVEL_RANK:
+            group = [e for e in events if e["level"] == level]
+            stats = {"count": len(group), "meanRet": {}, "hitRate": {}}
+            for label in (*self.horizons, "close"):
+                vals = np.array([e["ret"][label] for e in group if e.get("ret", {}).get(label) is not None])
+                stats["meanRet"][label] = round(float(vals.mean()), 2) if len(vals) else None
+                stats["hitRate"][label] = round(float((vals > 0).mean()), 3) if len(vals) else None
+            summary[level] = stats
+        return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from .refstore import ReferenceStore
+
+    parser = argparse.ArgumentParser(description="Replay recorded intraday snapshots through scan_strategy")
+    parser.add_argument("day", help="YYYYMMDD")
+    parser.add_argument("--market", default="0", help='"0"=KOSPI, "1"=KOSDAQ')
+    parser.add_argument("--timeline", action="store_true", help="타임라인 전체 출력")
+    args = parser.parse_args()
+
+    refs = ReferenceStore()
+    replay = StrategyReplay(IntradayStore(), refs.peek("sector_map", {}), refs.peek("stock_names", {}))
+    out = replay.run(args.day, args.market)
+    if not args.timeline:
+        out.pop("timeline")
+    print(json.dumps(out, ensure_ascii=False, indent=2))
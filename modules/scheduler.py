@@ -0,0 +1,170 @@
+"""
+AX RADAR v5.3 - Background Refresh Scheduler
+패널별 주기(interval) · 우선순위(priority) · 지터(jitter)로 백그라운드 갱신.
+"""
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("scheduler")
+
+
+class Job:
+    """스케줄 작업 1개 (패널 갱신 함수 + 주기 설정 + 실행 통계)."""
+
+    __slots__ = (
+        "name", "fn", "interval", "priority", "jitter",
+        "runs", "failures", "last_run", "last_duration", "last_error",
+    )
+
+    def __init__(self, name: str, fn, interval: float, priority: int, jitter: float):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.priority = priority
+        self.jitter = jitter
+        self.runs = 0
+        self.failures = 0
+        self.last_run = 0.0
+        self.last_duration = 0.0
+        self.last_error = ""
+
+
+class RefreshScheduler:
+    """
+    단일 디스패처 스레드 + 소규모 워커 풀.
+
+    - 다음 실행 시각 = 이전 실행 종료 + interval × (1 ± jitter) → 같은 작업은 겹쳐 실행되지 않음
+    - 동시에 만기된 작업은 priority(작을수록 먼저) 순으로 워커에 투입
+    - 기동 직후에는 priority 순으로 stagger_sec 간격을 두고 첫 실행 → 쿼터 버스트 방지
+    """
+
+    def __init__(self, workers: int = 3, jitter: float = 0.15, stagger_sec: float = 1.0):
+        self.workers = max(1, workers)
+        self.jitter = jitter
+        self.stagger_sec = stagger_sec
+        self._jobs: dict = {}
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._pool: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    # ── 등록 ──
+
+    def add(self, name: str, fn, interval: float, priority: int = 5, jitter: float | None = None):
+        job = Job(name, fn, interval, priority, self.jitter if jitter is None else jitter)
+        self._jobs[name] = job
+        return job
+
+    def has(self, name: str) -> bool:
+        return name in self._jobs
+
+    def get(self, name: str) -> Job | None:
+        return self._jobs.get(name)
+
+    # ── 실행 ──
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, warm=()):
+        """warm: 이미 첫 결과가 준비된 작업 이름 (기동 준비 단계) → 첫 실행을 한 주기 뒤로."""
+        if self.running:
+            return
+        self._stopped = False
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="refresh")
+        now = time.monotonic()
+        cold = [j for j in sorted(self._jobs.values(), key=lambda j: j.priority) if j.name not in warm]
+        for i, job in enumerate(cold):
+            offset = i * self.stagger_sec + random.uniform(0, job.interval * job.jitter)
+            self._push(job, now + offset)
+        for job in self._jobs.values():
+            if job.name in warm:
+                self._push(job, now + self._next_delay(job))
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Refresh scheduler started: {len(self._jobs)} jobs, {self.workers} workers")
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def run_now(self, name: str):
+        """작업 즉시 실행 (현재 스레드, 블로킹)."""
+        job = self._jobs[name]
+        self._execute(job)
+
+    def _push(self, job: Job, due: float):
+        with self._cond:
+            heapq.heappush(self._heap, (due, job.priority, next(self._seq), job))
+            self._cond.notify()
+
+    def _next_delay(self, job: Job) -> float:
+        spread = job.interval * job.jitter
+        return max(1.0, job.interval + random.uniform(-spread, spread))
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._heap and self._heap[0][0] <= time.monotonic():
+                        break
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[3])
+
+            for job in sorted(due, key=lambda j: j.priority):
+                try:
+                    self._pool.submit(self._run, job)
+                except RuntimeError:
+                    return  # pool shut down
+
+    def _run(self, job: Job):
+        try:
+            self._execute(job)
+        finally:
+            if not self._stopped:
+                self._push(job, time.monotonic() + self._next_delay(job))
+
+    def _execute(self, job: Job):
+        t0 = time.monotonic()
+        try:
+            job.fn()
+            job.last_error = ""
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.warning(f"Refresh [{job.name}] failed: {e}")
+        finally:
+            job.runs += 1
+            job.last_run = time.time()
+            job.last_duration = time.monotonic() - t0
+
+    def status(self) -> dict:
+        return {
+            name: {
+                "interval": job.interval,
+                "priority": job.priority,
+                "runs": job.runs,
+                "failures": job.failures,
+                "lastRun": job.last_run,
+                "lastDurationSec": round(job.last_duration, 3),
+                "lastError": job.last_error,
+            }
+            for name, job in self._jobs.items()
+        }
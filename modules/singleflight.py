@@ -0,0 +1,57 @@
+"""
+AX RADAR v5.3 - Single-flight Request Coalescing
+동일 키에 대한 동시 요청은 진행 중인 하나의 fetch 결과를 함께 기다린다.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    키별 in-flight 호출 병합기.
+
+    사용법:
+        flight = SingleFlight()
+        data, shared = flight.do("institutions", fetch)
+
+    - 첫 호출자(leader)만 fn()을 실행하고, 같은 키로 들어온 나머지는 결과를 공유
+    - fn()이 예외(BaseException 포함)를 던지면 대기 중인 호출자 모두에게 같은 예외 전달
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key: str, fn):
+        """fn() 실행 또는 진행 중인 호출 대기. 반환값 = (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:     # SystemExit · KeyboardInterrupt 포함 — 대기자가 None을 결과로 받지 않도록
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
@@ -0,0 +1,82 @@
+"""
+AX RADAR v5.3 - Panel Snapshot Store
+대시보드 패널별 최신 계산 결과 저장소 (스케줄러가 쓰고, 라우트가 읽는다).
+"""
+import logging
+import threading
+import time
+
+from .encoding import EncodedBody
+
+logger = logging.getLogger("snapshots")
+
+
+class Snapshot:
+    """패널 1개의 계산 결과 + 생성 시각 + 직렬화된 응답 본문(ETag · 압축본 캐시)."""
+
+    __slots__ = ("key", "data", "ts", "version", "encoded")
+
+    def __init__(self, key: str, data, ts: float, version: int):
+        self.key = key
+        self.data = data
+        self.ts = ts
+        self.version = version
+        self.encoded = EncodedBody({"status": "ok", "data": data})
+
+    @property
+    def etag(self) -> str:
+        return self.encoded.etag
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.ts
+
+
+class SnapshotStore:
+    """
+    키 → Snapshot. 조회는 dict lookup 한 번 (O(1)), 쓰기만 lock.
+
+    Snapshot 객체는 불변으로 취급: put()은 항상 새 객체로 교체하므로
+    읽는 쪽은 lock 없이 참조를 잡고 사용해도 안전하다.
+
+    on_change(fn): 내용(ETag)이 바뀐 put마다 fn(snapshot) 호출 (SSE 푸시 등).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: dict = {}
+        self._listeners: list = []
+
+    def on_change(self, fn):
+        self._listeners.append(fn)
+        return fn
+
+    def get(self, key: str) -> Snapshot | None:
+        return self._items.get(key)
+
+    def put(self, key: str, data) -> Snapshot:
+        snap = Snapshot(key, data, time.time(), 1)   # 직렬화 · 해시는 lock 밖에서
+        with self._lock:
+            prev = self._items.get(key)
+            changed = prev is None or prev.etag != snap.etag
+            if prev is not None:
+                # 내용이 같으면 버전 유지 (ETag 동일 → 클라이언트는 304)
+                snap.version = prev.version + 1 if changed else prev.version
+            self._items[key] = snap
+        if changed:
+            for fn in self._listeners:
+                try:
+                    fn(snap)
+                except Exception as e:
+                    logger.warning(f"Snapshot listener [{key}] failed: {e}")
+        return snap
+
+    def clear(self):
+        with self._lock:
+            self._items = {}
+
+    def keys(self) -> list:
+        return list(self._items)
+
+    def ages(self) -> dict:
+        return {k: round(s.age, 1) for k, s in list(self._items.items())}
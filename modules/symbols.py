@@ -0,0 +1,154 @@
+"""
+AX RADAR v5.3 - Symbol Master
+종목코드 → 종목명 · 시장 · 업종 · ax_universe 포함 여부 (메모리 인덱스, 조회 O(1) · API 호출 없음).
+
+공급원:
+- 참조 저장소 stock_names / symbol_markets (기동 시 디스크에서 적재)
+- sector_map (ka20002) · ax_universe — ReferenceStore.put 시 자동 반영
+- 랭킹 응답 행 (ka10032 · ka10065 · ka10039 · ka10035 · ka10036) — update()로 증분 반영
+"""
+import threading
+
+# 요청 mrkt_tp → 시장명 (API마다 "0"/"1" 또는 "001"/"101" 표기)
+MARKET_CODES = {"0": "KOSPI", "001": "KOSPI", "1": "KOSDAQ", "101": "KOSDAQ"}
+
+
+class Symbol:
+    __slots__ = ("code", "name", "market", "sector", "universe")
+
+    def __init__(self, code: str):
+        self.code = code
+        self.name = ""
+        self.market = ""
+        self.sector = ""
+        self.universe = False
+
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code, "name": self.name, "market": self.market,
+            "sector": self.sector, "universe": self.universe,
+        }
+
+
+class SymbolMaster:
+    def __init__(self, refs):
+        self.refs = refs
+        self._lock = threading.Lock()
+        self._items: dict = {}          # code → Symbol
+        refs.on_put(self._on_ref_put)
+        self._apply_names(refs.peek("stock_names", {}))
+        self._apply_markets(refs.peek("symbol_markets", {}))
+        self.set_sectors(refs.peek("sector_map", {}))
+        self.set_universe(refs.peek("ax_universe", {}))
+
+    def _symbol(self, code: str) -> Symbol:
+        sym = self._items.get(code)
+        if sym is None:
+            sym = self._items[code] = Symbol(code)
+        return sym
+
+    # ═══════════════════════════════════════════════════════════════
+    #  Lookup
+    # ═══════════════════════════════════════════════════════════════
+
+    def get(self, code: str) -> Symbol | None:
+        return self._items.get(code)
+
+    def name(self, code: str, default: str = "") -> str:
+        sym = self._items.get(code)
+        return sym.name if sym is not None and sym.name else default
+
+    def sector(self, code: str, default: str = "기타") -> str:
+        sym = self._items.get(code)
+        return sym.sector if sym is not None and sym.sector else default
+
+    def market(self, code: str, default: str = "") -> str:
+        sym = self._items.get(code)
+        return sym.market if sym is not None and sym.market else default
+
+    def in_universe(self, code: str) -> bool:
+        sym = self._items.get(code)
+        return sym is not None and sym.universe
+
+    def universe(self) -> list:
+        return [code for code, sym in list(self._items.items()) if sym.universe]
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        items = list(self._items.values())
+        return {
+            "symbols": len(items),
+            "named": sum(1 for s in items if s.name),
+            "withSector": sum(1 for s in items if s.sector),
+            "withMarket": sum(1 for s in items if s.market),
+            "universe": sum(1 for s in items if s.universe),
+        }
+
+    # ═══════════════════════════════════════════════════════════════
+    #  Update
+    # ═══════════════════════════════════════════════════════════════
+
+    def update(self, rows: list, code_key: str = "code", name_key: str = "name", market: str = ""):
+        """
+        응답 행 목록 반영. market은 요청 mrkt_tp 또는 시장명 (전체 시장 조회면 생략).
+        변경분은 참조 저장소에 병합 (디스크 기록은 REF_FLUSH_INTERVAL 간격).
+        """
+        market = MARKET_CODES.get(market, market if market in ("KOSPI", "KOSDAQ") else "")
+        names, markets = {}, {}
+        with self._lock:
+            for r in rows:
+                code = r.get(code_key)
+                if not code:
+                    continue
+                sym = self._symbol(code)
+                nm = r.get(name_key)
+                if nm and sym.name != nm:
+                    sym.name = names[code] = nm
+                if market and sym.market != market:
+                    sym.market = markets[code] = market
+        self.refs.merge("stock_names", names)
+        self.refs.merge("symbol_markets", markets)
+
+    def set_sectors(self, sector_map: dict):
+        with self._lock:
+            for code, sector in sector_map.items():
+                self._symbol(code).sector = sector
+
+    def set_universe(self, universe: dict):
+        """ax_universe.json: {code: name} 또는 {code: {"name", "sector", "market"}}."""
+        with self._lock:
+            for sym in self._items.values():
+                sym.universe = False
+            for code, info in universe.items():
+                sym = self._symbol(code)
+                sym.universe = True
+                if isinstance(info, str):
+                    info = {"name": info}
+                if not isinstance(info, dict):
+                    continue
+                sym.name = sym.name or str(info.get("name", "") or "")
+                sym.sector = sym.sector or str(info.get("sector", "") or "")
+                sym.market = sym.market or str(info.get("market", "") or "")
+
+    def _apply_names(self, names: dict):
+        with self._lock:
+            for code, nm in names.items():
+                self._symbol(code).name = nm
+
+    def _apply_markets(self, markets: dict):
+        with self._lock:
+            for code, mk in markets.items():
+                self._symbol(code).market = mk
+
+    def _on_ref_put(self, name: str, data):
+        if name == "sector_map":
+            self.set_sectors(data)
+        elif name == "ax_universe":
+            self.set_universe(data)
+        elif name == "stock_names":
+            self._apply_names(data)
@@ -0,0 +1,164 @@
+"""
+AX RADAR v5.3 - Institutional Tally Store
+종목별 기관 가집계 순매수 이력 — 고정 크기 NumPy 링버퍼 + 종목코드 → 행 인덱스.
+
+    store = InstTallyStore(depth=30, ttl=3600)
+    res = store.record(["005930", "000660"], [5000, 1200])
+    res["delta"], res["consecutive"], res["samples"]    # 입력 순서의 배열
+
+- 한 번의 record()로 배치 전체의 직전 대비 변화량 · 연속 증가 횟수를 벡터 연산
+- ttl 동안 갱신이 없는 종목은 행을 반납 (장중 주도 종목이 바뀌어도 메모리 고정)
+- 행이 부족하면 용량을 2배로 확장
+"""
+import threading
+import time
+
+import numpy as np
+
+
+class InstTallyStore:
+    def __init__(self, depth: int = 30, ttl: float = 3600, capacity: int = 128):
+        self.depth = max(2, int(depth))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index: dict = {}          # code → row
+        self._free: list = []
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int):
+        self._vals = np.zeros((capacity, self.depth), dtype=np.int64)
+        self._ts = np.zeros((capacity, self.depth), dtype=np.float64)
+        self._head = np.zeros(capacity, dtype=np.int64)     # 다음 기록 위치
+        self._len = np.zeros(capacity, dtype=np.int64)
+        self._seen = np.full(capacity, np.inf)              # 마지막 기록 시각 (빈 행 = +inf → 만료 대상 아님)
+        self._codes: list = [None] * capacity               # row → code (만료 행만 역조회)
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def _grow(self):
+        old = len(self._head)
+        arrays = (self._vals, self._ts, self._head, self._len, self._seen)
+        codes = self._codes
+        self._alloc(old * 2)
+        for dst, src in zip((self._vals, self._ts, self._head, self._len, self._seen), arrays):
+            dst[:old] = src
+        self._codes[:old] = codes
+        self._free = list(range(old * 2 - 1, old - 1, -1))
+
+    def _row(self, code: str) -> int:
+        row = self._index.get(code)
+        if row is None:
+            if not self._free:
+                self._grow()
+            row = self._index[code] = self._free.pop()
+            self._codes[row] = code
+            self._head[row] = 0
+            self._len[row] = 0
+        return row
+
+    # ═══════════════════════════════════════════════════════════════
+    #  Write
+    # ═══════════════════════════════════════════════════════════════
+
+    def record(self, codes: list, values, now: float | None = None) -> dict:
+        """
+        종목별 샘플 1개씩 추가 (codes는 중복 없음).
+        Returns: {"delta", "consecutive", "samples"} — codes 순서의 int64 배열.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict(now)
+            rows = np.fromiter((self._row(c) for c in codes), dtype=np.int64, count=len(codes))
+            vals = np.asarray(values, dtype=np.int64)
+
+            depth = self.depth
+            head = self._head[rows]
+            had = self._len[rows] > 0
+            last = self._vals[rows, (head - 1) % depth]
+            delta = np.where(had, vals - last, 0)
+
+            self._vals[rows, head] = vals
+            self._ts[rows, head] = now
+            self._head[rows] = (head + 1) % depth
+            self._len[rows] = np.minimum(self._len[rows] + 1, depth)
+            self._seen[rows] = now
+
+            return {
+                "delta": delta,
+                "consecutive": self._consecutive(rows),
+                "samples": self._len[rows].copy(),
+            }
+
+    def _evict(self, now: float):
+        if not self._index or self.ttl <= 0:
+            return
+        stale = np.flatnonzero(self._seen < now - self.ttl)     # 사용 중인 행만 대상 (빈 행은 +inf)
+        for row in stale.tolist():
+            del self._index[self._codes[row]]
+            self._codes[row] = None
+            self._len[row] = 0
+            self._seen[row] = np.inf
+            self._free.append(row)
+
+    # ═══════════════════════════════════════════════════════════════
+    #  Read
+    # ═══════════════════════════════════════════════════════════════
+
+    def _ordered(self, rows: np.ndarray) -> tuple:
+        """rows의 이력을 시간순(오래된 → 최신) 정렬한 행렬 + 유효 마스크."""
+        depth = self.depth
+        pos = (self._head[rows, None] + np.arange(depth)) % depth
+        vals = self._vals[rows[:, None], pos]
+        valid = np.arange(depth) >= depth - self._len[rows, None]
+        return vals, valid
+
+    def _consecutive(self, rows: np.ndarray) -> np.ndarray:
+        """최신 샘플부터 거슬러 연속 증가(직전보다 큰) 횟수."""
+        if not len(rows):
+            return np.zeros(0, dtype=np.int64)
+        vals, valid = self._ordered(rows)
+        inc = (vals[:, 1:] > vals[:, :-1]) & valid[:, :-1]
+        rev = inc[:, ::-1]
+        return np.where(rev.all(axis=1), rev.shape[1], np.argmin(rev, axis=1)).astype(np.int64)
+
+    def peek(self, codes: list) -> dict:
+        """
+        기록 없이 현재 이력 조회 (record()와 같은 형식, 장외 시간 스캔용).
+        delta는 마지막 두 샘플의 차이, 추적하지 않는 종목은 0.
+        """
+        with self._lock:
+            known = [self._index.get(c, -1) for c in codes]
+            rows = np.asarray([r for r in known if r >= 0], dtype=np.int64)
+            mask = np.asarray([r >= 0 for r in known], dtype=bool)
+
+            depth = self.depth
+            head = self._head[rows]
+            last = self._vals[rows, (head - 1) % depth]
+            prev = self._vals[rows, (head - 2) % depth]
+            out = {k: np.zeros(len(codes), dtype=np.int64) for k in ("delta", "consecutive", "samples")}
+            out["delta"][mask] = np.where(self._len[rows] > 1, last - prev, 0)
+            out["consecutive"][mask] = self._consecutive(rows)
+            out["samples"][mask] = self._len[rows]
+            return out
+
+    def consecutive_all(self) -> dict:
+        """추적 중인 전 종목의 연속 증가 횟수 {code: n} (한 번의 벡터 연산)."""
+        with self._lock:
+            codes = list(self._index)
+            rows = np.fromiter((self._index[c] for c in codes), dtype=np.int64, count=len(codes))
+            return dict(zip(codes, self._consecutive(rows).tolist()))
+
+    def history(self, code: str) -> list:
+        """종목 1개의 [(ts, value), ...] 시간순."""
+        with self._lock:
+            row = self._index.get(code)
+            if row is None:
+                return []
+            n = int(self._len[row])
+            pos = (self._head[row] - n + np.arange(n)) % self.depth
+            return list(zip(self._ts[row, pos].tolist(), self._vals[row, pos].tolist()))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
@@ -0,0 +1,83 @@
+"""
+AX RADAR v5.3 - HTTP Transport
+Pooled keep-alive session shared by every Kiwoom REST call.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import KIWOOM_POOL_CONNECTIONS, KIWOOM_POOL_MAXSIZE
+
+
+class PooledTransport:
+    """
+    requests.Session 기반 keep-alive 커넥션 풀.
+
+    - 호스트별 커넥션 풀 (pool_connections 개 호스트, 호스트당 pool_maxsize 소켓)
+    - TCP/TLS 핸드셰이크는 최초 연결 시에만 발생, 이후 요청은 소켓 재사용
+    - stats(): 호스트별 요청 수 / 신규 연결 수 / 재사용 수 — 프로세스 누적
+      (pool_connections 초과로 PoolManager가 호스트 풀을 내보내도 그 풀의 카운터는 _retired에 합산)
+    """
+
+    def __init__(self, pool_connections: int = KIWOOM_POOL_CONNECTIONS,
+                 pool_maxsize: int = KIWOOM_POOL_MAXSIZE):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+        pools = self._adapter.poolmanager.pools
+        self._dispose = pools.dispose_func
+        pools.dispose_func = self._retire
+
+    @staticmethod
+    def _host(pool) -> str:
+        return f"{pool.host}:{pool.port}" if pool.port not in (None, 80, 443) else pool.host
+
+    @staticmethod
+    def _add(hosts: dict, host: str, num_requests: int, num_connections: int):
+        entry = hosts.setdefault(host, {"requests": 0, "newConnections": 0, "reused": 0})
+        entry["requests"] += num_requests
+        entry["newConnections"] += num_connections
+        entry["reused"] += max(num_requests - num_connections, 0)
+
+    def _retire(self, pool):
+        """PoolManager가 내보내는 호스트 풀의 카운터를 보존한 뒤 원래 dispose(close) 호출."""
+        with self._lock:
+            self._add(self._retired, self._host(pool), pool.num_requests, pool.num_connections)
+        if self._dispose:
+            self._dispose(pool)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self._session.post(url, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        호스트별 커넥션 재사용 통계.
+
+        Returns: {
+            "api.kiwoom.com": {"requests": 32, "newConnections": 1, "reused": 31},
+            ...
+        }
+        """
+        pools = self._adapter.poolmanager.pools
+        with self._lock:
+            hosts = {host: dict(entry) for host, entry in self._retired.items()}
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue  # 조회 중 풀 교체됨
+            self._add(hosts, self._host(pool), pool.num_requests, pool.num_connections)
+        return hosts
+
+    def close(self):
+        self._session.close()
@@ -0,0 +1,142 @@
+"""
+AX RADAR v5.3 - Startup Warmup
+서버는 import 직후 바로 바인드하고, 토큰 · 참조 데이터 · 첫 패널 스냅샷은 백그라운드 단계로 준비한다.
+/readyz는 모든 단계가 끝난 뒤에만 200 — 로드밸런서가 준비된 인스턴스에만 트래픽을 보내도록.
+
+    warmup = Warmup(max_sec=120, retry_sec=5)
+    warmup.add("token", kiwoom.warm_token, required=True)
+    warmup.add("panels", warm_panels)
+    warmup.start()          # 또는 warmup.run() (현재 스레드, 블로킹)
+
+- 단계는 등록 순서대로 1개씩 실행 (단계 내부 병렬화는 단계 함수 책임)
+- required 단계 실패 → retry_sec 간격 재시도, max_sec 경과 시 포기하고 다음 단계로 (degraded)
+- 선택 단계 실패 → 기록만 하고 다음 단계로
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger("warmup")
+
+
+class Step:
+    """준비 단계 1개 (함수 + 실행 결과)."""
+
+    __slots__ = ("name", "fn", "required", "state", "attempts", "duration", "error", "detail")
+
+    def __init__(self, name: str, fn, required: bool):
+        self.name = name
+        self.fn = fn
+        self.required = required
+        self.state = "pending"          # pending → running → ok | failed
+        self.attempts = 0
+        self.duration = 0.0
+        self.error = ""
+        self.detail = None              # 단계 함수 반환값 (건수 · 패널별 결과 등)
+
+
+class Warmup:
+    def __init__(self, max_sec: float = 120.0, retry_sec: float = 5.0):
+        self.max_sec = max_sec
+        self.retry_sec = max(retry_sec, 0.1)
+        self._steps: list = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at: datetime | None = None
+        self._t0 = 0.0
+        self._elapsed = 0.0
+
+    def add(self, name: str, fn, required: bool = False) -> Step:
+        step = Step(name, fn, required)
+        self._steps.append(step)
+        return step
+
+    # ── 실행 ──
+
+    def start(self):
+        """백그라운드 스레드에서 run(). 중복 호출 안전."""
+        with self._lock:
+            if self._thread is not None or self._done.is_set():
+                return
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        self._started_at = datetime.now()
+        self._t0 = time.monotonic()
+        logger.info(f"Warmup started: {', '.join(s.name for s in self._steps)}")
+        try:
+            for step in self._steps:
+                self._execute(step)
+        finally:
+            self._elapsed = time.monotonic() - self._t0
+            self._done.set()
+        failed = [s.name for s in self._steps if s.state == "failed"]
+        logger.info(f"Warmup finished in {self._elapsed:.1f}s"
+                    + (f" (failed: {', '.join(failed)})" if failed else ""))
+
+    def _execute(self, step: Step):
+        step.state = "running"
+        t0 = time.monotonic()
+        while True:
+            step.attempts += 1
+            try:
+                step.detail = step.fn()
+                step.state, step.error = "ok", ""
+                break
+            except Exception as e:
+                step.error = str(e) or type(e).__name__
+                remaining = self.max_sec - (time.monotonic() - self._t0)
+                if not step.required or remaining <= 0:
+                    step.state = "failed"
+                    logger.warning(f"Warmup [{step.name}] failed: {step.error}")
+                    break
+                logger.info(f"Warmup [{step.name}] attempt {step.attempts} failed, retrying: {step.error}")
+                time.sleep(min(self.retry_sec, remaining))
+        step.duration = time.monotonic() - t0
+        if step.state == "ok":
+            logger.info(f"Warmup [{step.name}] ok in {step.duration:.2f}s")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    # ── 상태 ──
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def degraded(self) -> bool:
+        """required 단계가 max_sec 내에 끝내 성공하지 못함 (준비 완료로 간주하되 표시)."""
+        return any(s.required and s.state == "failed" for s in self._steps)
+
+    def status(self) -> dict:
+        if self._done.is_set():
+            elapsed = self._elapsed
+        else:
+            elapsed = time.monotonic() - self._t0 if self._started_at else 0.0
+        current = next((s.name for s in self._steps if s.state == "running"), "")
+        finished = sum(1 for s in self._steps if s.state in ("ok", "failed"))
+        return {
+            "ready": self.ready,
+            "degraded": self.degraded,
+            "startedAt": self._started_at.strftime("%Y-%m-%d %H:%M:%S") if self._started_at else "",
+            "elapsedSec": round(elapsed, 2),
+            "current": current,
+            "progress": f"{finished}/{len(self._steps)}",
+            "steps": [
+                {
+                    "name": s.name,
+                    "state": s.state,
+                    "required": s.required,
+                    "attempts": s.attempts,
+                    "durationSec": round(s.duration, 3),
+                    "error": s.error,
+                    "detail": s.detail,
+                }
+                for s in self._steps
+            ],
+        }
@@ -24,15 +24,21 @@ let sectorFlowData = null;
 /* ── API Layer ── */
 const API = {
   _cache: {},
+  _etag: {},
   async _f(url, retries=1){
     for(let i=0;i<=retries;i++){
       try{
         if(i>0) await new Promise(r=>setTimeout(r,1000));
-        const r=await fetch(url);
+        const h={};
+        if(this._etag[url]&&this._cache[url]!==undefined) h['If-None-Match']=this._etag[url];
+        const r=await fetch(url,{headers:h,cache:'no-store'});
+        if(r.status===304) return this._cache[url];
         if(!r.ok){if(i<retries)continue;throw new Error('HTTP '+r.status)}
         const j=await r.json();
         if(j.status!=='ok'){if(i<retries)continue;throw new Error(j.message||'API error')}
         this._cache[url]=j.data;
+        const tag=r.headers.get('ETag');
+        if(tag) this._etag[url]=tag; else delete this._etag[url];
         return j.data;
       }catch(e){
         if(i>=retries){if(this._cache[url])return this._cache[url];throw e}
@@ -47,6 +53,7 @@ const API = {
   accumulation(){return this._f('/api/v3/accumulation')},
   consecutiveBuy(){return this._f('/api/v3/consecutive-buy')},
   programTop(){return this._f('/api/v3/program-top')},
+  dashboard(){return this._f('/api/v3/dashboard',0)},
 };
 
 /* ── Splash ── */
@@ -61,7 +68,8 @@ function dismissSplash(){
 /* ── Init ── */
 document.addEventListener('DOMContentLoaded',()=>{
   loadAllInitial();
-  timer=setInterval(loadAll,REFRESH);
+  startPolling();
+  openStream();
   document.getElementById('mo').addEventListener('click',e=>{if(e.target.id==='mo')closeMo()});
   document.getElementById('mo-x').addEventListener('click',closeMo);
   document.getElementById('sellOverlay').addEventListener('click',e=>{if(e.target.id==='sellOverlay')closeSellPopup()});
@@ -69,29 +77,88 @@ document.addEventListener('DOMContentLoaded',()=>{
   document.addEventListener('keydown',e=>{if(e.key==='Escape'){closeMo();closeSellPopup()}});
 });
 
+/* ── Dashboard panels: /api/v3/dashboard key → [apply, fail] ── */
+const PANELS={
+  indices:[applyIdx,failIdx],
+  foreignTop:[applyForeignTop,failForeignTop],
+  foreignSector:[applySectorFlow,failSectorFlow],
+  inst:[applyInst,failInst],
+  accumulation:[applyAccumulation,failAccumulation],
+  programTop:[applyProgramTop,failProgramTop],
+  consecutiveBuy:[applyConsecutiveBuy,failConsecutiveBuy],
+};
+const _panelShown={};
+
+function applyPanel(key,p){
+  const h=PANELS[key];
+  if(!h||!p||p.status==='pending')return;
+  try{
+    if(p.status!=='ok')throw new Error(p.message||'API error');
+    h[0](p.data);
+    _panelShown[key]=true;
+  }catch(e){
+    /* 이전에 표시된 데이터가 있으면 유지 */
+    if(_panelShown[key])console.warn(key,e);
+    else h[1](e);
+  }
+}
+
+/* 1 request per refresh — 패널별 status로 개별 반영 */
+async function loadDashboard(){
+  const panels=await API.dashboard();
+  Object.keys(PANELS).forEach(function(k){applyPanel(k,panels[k])});
+}
+
+/* Fallback: 패널별 개별 요청 */
+function loadPanels(){
+  return Promise.all([
+    loadIdx(),loadForeignTop(),loadSectorFlow(),loadInst(),
+    loadAccumulation(),loadProgramTop(),loadConsecutiveBuy(),
+  ]);
+}
+
 async function loadAllInitial(){
   clock();
-  splashMsg('Loading market indices...');
-  var p1=loadIdx().then(function(){splashMsg('Loading accumulation data...')});
-  var p2=loadForeignTop();
-  var p3=loadSectorFlow();
-  var p4=loadInst();
-  var p5=loadAccumulation();
-  var p6=loadProgramTop();
-  var p7=loadConsecutiveBuy();
-  try{await Promise.all([p1,p2,p3,p4,p5,p6,p7])}catch(e){}
+  splashMsg('Loading dashboard...');
+  try{await loadDashboard()}
+  catch(e){
+    console.error('dashboard',e);
+    splashMsg('Loading market indices...');
+    try{await loadPanels()}catch(e2){}
+  }
   dismissSplash();
 }
 
 function loadAll(){
   clock();
-  loadIdx();
-  loadForeignTop();
-  loadSectorFlow();
-  loadInst();
-  loadAccumulation();
-  loadProgramTop();
-  loadConsecutiveBuy();
+  loadDashboard().catch(function(e){
+    console.error('dashboard',e);
+    loadPanels();
+  });
+}
+
+/* ── Live stream (SSE): 바뀐 패널만 push, 끊기면 폴링으로 대체 ── */
+let stream=null;
+function startPolling(){if(!timer)timer=setInterval(loadAll,REFRESH)}
+function stopPolling(){if(timer){clearInterval(timer);timer=null}}
+
+function openStream(){
+  if(!window.EventSource)return;
+  stream=new EventSource('/api/v3/stream');
+  stream.addEventListener('hello',function(ev){
+    /* 서버 스케줄러가 돌지 않으면 폴링 유지 (폴링으로 갱신된 패널도 스트림으로 전달됨) */
+    if(JSON.parse(ev.data).scheduled)stopPolling();else startPolling();
+  });
+  stream.addEventListener('panel',function(ev){
+    const m=JSON.parse(ev.data);
+    applyPanel(m.panel,m.body);
+    clock();
+  });
+  stream.onerror=function(){
+    startPolling();
+    /* CLOSED(503 등)는 브라우저가 재접속하지 않음 → 직접 재시도 */
+    if(stream.readyState===EventSource.CLOSED){stream=null;setTimeout(openStream,REFRESH*2)}
+  };
 }
 
 function clock(){
@@ -121,64 +188,64 @@ function sigArrow(sig){const s=String(sig);return['1','2'].includes(s)?'\u25B2':
 
 /* ═══════════════ Market Pulse — Indices ═══════════════ */
 async function loadIdx(){
-  try{
-    const d=await API.indices();
-    ['KOSPI','KOSDAQ','NASDAQ'].forEach(k=>{
-      const idx=d[k];
-      if(!idx)return;
-      const card=document.getElementById('idx-'+k);
-      const valEl=document.getElementById('idx-'+k+'-val');
-      const chgEl=document.getElementById('idx-'+k+'-chg');
-      const pctEl=document.getElementById('idx-'+k+'-pct');
-      if(!valEl)return;
-
-      const val=typeof idx.value==='number'?idx.value:0;
-      const chg=typeof idx.change==='number'?idx.change:0;
-      const pct=typeof idx.changePct==='number'?idx.changePct:0;
-      const cls=chg>0?'up':chg<0?'dn':'fl';
-      const arrow=chg>0?'\u25B2':chg<0?'\u25BC':'';
-
-      valEl.textContent=val.toLocaleString('en-US',{minimumFractionDigits:2,maximumFractionDigits:2});
-
-      if(card){
-        card.classList.remove('state-up','state-dn','state-fl');
-        card.classList.add('state-'+cls);
-      }
-      if(chgEl){
-        chgEl.className='idx-hero__chg '+cls;
-        chgEl.textContent=arrow+(chg>0?' +':' ')+chg.toFixed(2);
-      }
-      if(pctEl){
-        pctEl.className='idx-hero__pct '+cls;
-        pctEl.textContent=(pct>0?'+':'')+pct.toFixed(2)+'%';
-      }
-    });
-  }catch(e){
-    console.error('loadIdx',e);
-  }
+  try{applyIdx(await API.indices())}catch(e){failIdx(e)}
+}
+function failIdx(e){console.error('loadIdx',e)}
+function applyIdx(d){
+  ['KOSPI','KOSDAQ','NASDAQ'].forEach(k=>{
+    const idx=d[k];
+    if(!idx)return;
+    const card=document.getElementById('idx-'+k);
+    const valEl=document.getElementById('idx-'+k+'-val');
+    const chgEl=document.getElementById('idx-'+k+'-chg');
+    const pctEl=document.getElementById('idx-'+k+'-pct');
+    if(!valEl)return;
+
+    const val=typeof idx.value==='number'?idx.value:0;
+    const chg=typeof idx.change==='number'?idx.change:0;
+    const pct=typeof idx.changePct==='number'?idx.changePct:0;
+    const cls=chg>0?'up':chg<0?'dn':'fl';
+    const arrow=chg>0?'\u25B2':chg<0?'\u25BC':'';
+
+    valEl.textContent=val.toLocaleString('en-US',{minimumFractionDigits:2,maximumFractionDigits:2});
+
+    if(card){
+      card.classList.remove('state-up','state-dn','state-fl');
+      card.classList.add('state-'+cls);
+    }
+    if(chgEl){
+      chgEl.className='idx-hero__chg '+cls;
+      chgEl.textContent=arrow+(chg>0?' +':' ')+chg.toFixed(2);
+    }
+    if(pctEl){
+      pctEl.className='idx-hero__pct '+cls;
+      pctEl.textContent=(pct>0?'+':'')+pct.toFixed(2)+'%';
+    }
+  });
 }
 
 
 
 /* ═══════════════ Foreign Flow TOP 5 ═══════════════ */
 async function loadForeignTop(){
-  try{
-    const d=await API.foreignTop();
-    const buyList=(d.buy||[]).slice(0,5);
-    const sellList=(d.sell||[]).slice(0,5);
-    rForeignList('foreignBuy',buyList,'buy');
-    rForeignList('foreignSell',sellList,'sell');
-    const bc=document.getElementById('fbCnt');
-    const sc=document.getElementById('fsCnt');
-    if(bc)bc.textContent=buyList.length+' stocks';
-    if(sc)sc.textContent=sellList.length+' stocks';
-  }catch(e){
-    console.error('foreignTop',e);
-    const fb=document.getElementById('foreignBuy');
-    const fs=document.getElementById('foreignSell');
-    if(fb)fb.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
-    if(fs)fs.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
-  }
+  try{applyForeignTop(await API.foreignTop())}catch(e){failForeignTop(e)}
+}
+function applyForeignTop(d){
+  const buyList=(d.buy||[]).slice(0,5);
+  const sellList=(d.sell||[]).slice(0,5);
+  rForeignList('foreignBuy',buyList,'buy');
+  rForeignList('foreignSell',sellList,'sell');
+  const bc=document.getElementById('fbCnt');
+  const sc=document.getElementById('fsCnt');
+  if(bc)bc.textContent=buyList.length+' stocks';
+  if(sc)sc.textContent=sellList.length+' stocks';
+}
+function failForeignTop(e){
+  console.error('foreignTop',e);
+  const fb=document.getElementById('foreignBuy');
+  const fs=document.getElementById('foreignSell');
+  if(fb)fb.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
+  if(fs)fs.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
 }
 function rForeignList(id,items,type){
   const el=document.getElementById(id);if(!el)return;
@@ -216,15 +283,16 @@ window.switchSectorTab=function(mode){
 };
 
 async function loadSectorFlow(){
-  try{
-    const d=await API.foreignSector();
-    sectorFlowData=d||[];
-    renderSectorChart(sectorFlowData);
-  }catch(e){
-    console.error('sectorFlow',e);
-    const el=document.getElementById('sectorChart');
-    if(el)el.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
-  }
+  try{applySectorFlow(await API.foreignSector())}catch(e){failSectorFlow(e)}
+}
+function applySectorFlow(d){
+  sectorFlowData=d||[];
+  renderSectorChart(sectorFlowData);
+}
+function failSectorFlow(e){
+  console.error('sectorFlow',e);
+  const el=document.getElementById('sectorChart');
+  if(el)el.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
 }
 function renderSectorChart(items){
   const el=document.getElementById('sectorChart');
@@ -286,15 +354,16 @@ var _progData=null;
 var _progShowAll=false;
 
 async function loadProgramTop(){
-  try{
-    var d=await API.programTop();
-    _progData=d||[];
-    renderProgramTop(_progData);
-  }catch(e){
-    console.error('programTop',e);
-    var el=document.getElementById('progBody');
-    if(el)el.innerHTML='<tr><td colspan="6" style="text-align:center;color:var(--tx-3);padding:32px">데이터를 불러올 수 없습니다</td></tr>';
-  }
+  try{applyProgramTop(await API.programTop())}catch(e){failProgramTop(e)}
+}
+function applyProgramTop(d){
+  _progData=d||[];
+  renderProgramTop(_progData);
+}
+function failProgramTop(e){
+  console.error('programTop',e);
+  var el=document.getElementById('progBody');
+  if(el)el.innerHTML='<tr><td colspan="6" style="text-align:center;color:var(--tx-3);padding:32px">데이터를 불러올 수 없습니다</td></tr>';
 }
 
 function renderProgramTop(items){
@@ -346,19 +415,20 @@ window.toggleProg=function(){
 var _accumData=[];
 
 async function loadAccumulation(){
-  try{
-    var d=await API.accumulation();
-    if(!d||!d.length){
-      document.getElementById('accumCards').innerHTML='<div class="stealth-empty">No data</div>';
-      return;
-    }
-    _accumData=d;
-    renderAccumCards(d.slice(0,5));
-    renderWeightTop(d);
-  }catch(e){
-    console.error('accumulation',e);
-    document.getElementById('accumCards').innerHTML='<div class="stealth-empty">데이터를 불러올 수 없습니다</div>';
+  try{applyAccumulation(await API.accumulation())}catch(e){failAccumulation(e)}
+}
+function applyAccumulation(d){
+  if(!d||!d.length){
+    document.getElementById('accumCards').innerHTML='<div class="stealth-empty">No data</div>';
+    return;
   }
+  _accumData=d;
+  renderAccumCards(d.slice(0,5));
+  renderWeightTop(d);
+}
+function failAccumulation(e){
+  console.error('accumulation',e);
+  document.getElementById('accumCards').innerHTML='<div class="stealth-empty">데이터를 불러올 수 없습니다</div>';
 }
 
 function renderWeightTop(items){
@@ -394,14 +464,15 @@ function renderWeightTop(items){
 
 /* ═══════════════ Consecutive Buy TOP (ka10035) ═══════════════ */
 async function loadConsecutiveBuy(){
-  try{
-    var d=await API.consecutiveBuy();
-    renderConsecTop(d||[]);
-  }catch(e){
-    console.error('consecutiveBuy',e);
-    var el=document.getElementById('consecTopBody');
-    if(el)el.innerHTML='<tr><td colspan="7" style="text-align:center;color:#64748B;padding:32px">\uB370\uC774\uD130\uB97C \uBD88\uB7EC\uC62C \uC218 \uC5C6\uC2B5\uB2C8\uB2E4</td></tr>';
-  }
+  try{applyConsecutiveBuy(await API.consecutiveBuy())}catch(e){failConsecutiveBuy(e)}
+}
+function applyConsecutiveBuy(d){
+  renderConsecTop(d||[]);
+}
+function failConsecutiveBuy(e){
+  console.error('consecutiveBuy',e);
+  var el=document.getElementById('consecTopBody');
+  if(el)el.innerHTML='<tr><td colspan="7" style="text-align:center;color:#64748B;padding:32px">\uB370\uC774\uD130\uB97C \uBD88\uB7EC\uC62C \uC218 \uC5C6\uC2B5\uB2C8\uB2E4</td></tr>';
 }
 
 function renderConsecTop(items){
@@ -500,39 +571,40 @@ const IB_META={
 };
 
 async function loadInst(){
-  try{
-    const d=await API.inst();
-    if(!d){throw new Error('No data')}
-    ['MS','JP','GS'].forEach(k=>{
-      const inst=d[k];
-      const el=document.getElementById(k+'-col');
-      if(!el)return;
-      if(!inst||(!((inst.buyTop||[]).length) && !((inst.sellTop||[]).length))){
-        el.innerHTML='<div class="no-data">데이터 없음</div>';
-        return;
-      }
-      /* Store sell data for popup */
-      sellDataStore[k]=inst.sellTop||[];
-      let html='';
-      /* BUY section only */
-      html+='<div class="ib-sub-hd buy">Net Buy TOP 5</div>';
-      html+=rInstItems(inst.buyTop||[],false);
-      /* Sell toggle button */
-      const sellCnt=(inst.sellTop||[]).length;
-      if(sellCnt>0){
-        html+='<div class="sell-toggle-btn" onclick="openSellPopup(\''+k+'\')">'
-          +'<span class="arrow">\u25BC</span> NET SELL TOP '+sellCnt+' 보기'
-          +'</div>';
-      }
-      el.innerHTML=html;
-    });
-  }catch(e){
-    console.error('inst',e);
-    ['MS-col','JP-col','GS-col'].forEach(id=>{
-      const el=document.getElementById(id);
-      if(el)el.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
-    });
-  }
+  try{applyInst(await API.inst())}catch(e){failInst(e)}
+}
+function applyInst(d){
+  if(!d){throw new Error('No data')}
+  ['MS','JP','GS'].forEach(k=>{
+    const inst=d[k];
+    const el=document.getElementById(k+'-col');
+    if(!el)return;
+    if(!inst||(!((inst.buyTop||[]).length) && !((inst.sellTop||[]).length))){
+      el.innerHTML='<div class="no-data">데이터 없음</div>';
+      return;
+    }
+    /* Store sell data for popup */
+    sellDataStore[k]=inst.sellTop||[];
+    let html='';
+    /* BUY section only */
+    html+='<div class="ib-sub-hd buy">Net Buy TOP 5</div>';
+    html+=rInstItems(inst.buyTop||[],false);
+    /* Sell toggle button */
+    const sellCnt=(inst.sellTop||[]).length;
+    if(sellCnt>0){
+      html+='<div class="sell-toggle-btn" onclick="openSellPopup(\''+k+'\')">'
+        +'<span class="arrow">\u25BC</span> NET SELL TOP '+sellCnt+' 보기'
+        +'</div>';
+    }
+    el.innerHTML=html;
+  });
+}
+function failInst(e){
+  console.error('inst',e);
+  ['MS-col','JP-col','GS-col'].forEach(id=>{
+    const el=document.getElementById(id);
+    if(el)el.innerHTML='<div class="no-data">데이터를 불러올 수 없습니다</div>';
+  });
 }
 function rInstItems(stocks,isSell){
   if(!stocks||!stocks.length)return'<div class="empty-txt">No data</div>';
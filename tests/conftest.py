@@ -0,0 +1,32 @@
+"""
+pytest 공용 설정 — 저장소 루트를 import 경로에 추가, 앱 fixture는 bench와 같은 오프라인 부팅 사용.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench.run import _boot, _prepare_env  # noqa: E402
+
+# config는 import 시점에 환경 변수를 읽음 → 어떤 테스트 모듈보다 먼저 오프라인 환경 고정
+_prepare_env(argparse.Namespace(cassette=""), tempfile.mkdtemp(prefix="axradar-test-"))
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """tools/fake_kiwoom 합성 시장(고정 시점)에 연결된 app — 네트워크 없음, 스케줄러 · 자동 warmup 꺼짐."""
+    cwd = os.getcwd()
+    app_module, _ = _boot(argparse.Namespace(cassette="", symbols=300, seed=7, sim_time="11:00:00"))
+    os.chdir(cwd)
+    return app_module
+
+
+@pytest.fixture()
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,52 @@
+"""벤치마크 하네스 — 측정 필드 · check 건너뛰기 · 회귀 판정 · 시뮬레이션 시계."""
+from datetime import datetime
+
+from bench.harness import Case, compare, measure
+from bench.run import _sim_clock
+
+
+def test_measure_reports_latency_memory_and_upstream():
+    calls = {"setup": 0, "upstream": 0}
+
+    def setup():
+        calls["setup"] += 1
+
+    def fn():
+        calls["upstream"] += 2
+        return [0] * 10_000
+
+    res = measure(Case("list", "engine", fn, setup=setup, iterations=10, warmup=1),
+                  scale=0.5, counter=lambda: calls["upstream"])
+    assert res["ops"] == 5
+    assert res["opsPerSec"] > 0
+    assert 0 <= res["p50Ms"] <= res["p99Ms"] <= res["maxMs"]
+    assert res["peakKiB"] >= 70          # 10,000 포인터
+    assert res["upstream"] == 2
+    assert calls["setup"] == 1 + 1 + 5 + 1   # 첫 실행 · warmup · 측정 · 메모리 패스
+
+
+def test_failed_check_skips_case():
+    res = measure(Case("route", "route", lambda: 503, check=lambda s: f"status {s}" if s >= 500 else None))
+    assert res == {"group": "route", "skipped": "status 503"}
+
+
+def test_compare_flags_p50_and_memory_only():
+    base = {"results": {"a": {"p50Ms": 1.0, "p99Ms": 2.0, "peakKiB": 100.0},
+                        "b": {"skipped": "pykrx"}}}
+    cur = {"results": {"a": {"p50Ms": 1.1, "p99Ms": 4.0, "peakKiB": 130.0},
+                       "b": {"p50Ms": 1.0},
+                       "c": {"p50Ms": 1.0}}}
+    rows = {r["metric"]: r for r in compare(cur, base, threshold=0.15)}
+    assert set(rows) == {"p50Ms", "p99Ms", "peakKiB"}
+    assert not rows["p50Ms"]["regression"]       # +10%
+    assert not rows["p99Ms"]["regression"]       # 참고용
+    assert rows["peakKiB"]["regression"]          # +30%
+
+
+def test_sim_clock_runs_on_a_weekday_at_sim_time():
+    clock = _sim_clock("11:00:00")
+    now = datetime.fromtimestamp(clock())
+    assert now.weekday() < 5
+    assert (now.hour, now.minute) == (11, 0)
+    first = clock()
+    assert clock() >= first
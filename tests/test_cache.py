@@ -0,0 +1,125 @@
+"""CacheEngine — fresh/stale TTL, stale-while-revalidate, invalidate, miss 병합."""
+import threading
+import time
+
+import pytest
+
+import modules.cache as cache_module
+from modules.cache import CacheEngine, Uncached
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture()
+def cache():
+    engine = CacheEngine(max_entries=100, max_bytes=1 << 20, policies={"panel": (10, 60), "row_": (5, 20)})
+    yield engine
+    engine._pool.shutdown(wait=True)
+
+
+def _wait_for(pred, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not pred():
+        time.sleep(0.01)
+    return pred()
+
+
+def test_fresh_stale_and_expired(clock, cache):
+    cache.set("panel", "v1")
+    assert cache.get("panel", ttl=10) == "v1"
+    clock.now += 30                                     # fresh 초과, stale 이내
+    assert cache.get("panel", ttl=10) is None
+    assert cache.get("panel") == "v1"                   # 실패 대체용 조회
+    clock.now += 31                                     # stale 초과 → 삭제
+    assert cache.get("panel") is None
+    assert "panel" not in cache
+    stats = cache.stats()["families"]["panel"]
+    assert stats["expirations"] == 1
+
+
+def test_prefix_family_policy(clock, cache):
+    cache.set("row_005930", 1)
+    assert cache.family_of("row_005930") == "row_"
+    clock.now += 21
+    assert cache.get("row_005930") is None
+
+
+def test_stale_while_revalidate(clock, cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return f"v{len(calls)}"
+
+    assert cache.get_or_load("panel", loader) == "v1"
+    assert cache.get_or_load("panel", loader) == "v1"   # fresh hit
+    clock.now += 20
+    assert cache.get_or_load("panel", loader) == "v1"   # stale 즉시 반환 + 백그라운드 재검증
+    assert _wait_for(lambda: cache.get("panel") == "v2")
+    assert len(calls) == 2
+
+
+def test_invalidate_forces_reload_but_keeps_fallback(clock, cache):
+    cache.set("panel", "old")
+    cache.invalidate("panel", "missing")
+    assert cache.get("panel") == "old"                  # 대체용 조회는 유지
+    assert cache.get("panel", ttl=10) is None           # 신선도 조회는 miss
+    assert cache.get_or_load("panel", lambda: "new") == "new"
+    assert cache.get("panel", ttl=10) == "new"
+
+
+def test_concurrent_misses_share_one_load(cache):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("panel", slow_loader)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    assert started.wait(2)
+    time.sleep(0.05)                                    # 나머지 호출자가 대기열에 합류할 시간
+    release.set()
+    for t in threads:
+        t.join(2)
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_uncached_result_is_returned_but_not_stored(clock, cache):
+    assert cache.get_or_load("panel", lambda: Uncached({"buy": []})) == {"buy": []}
+    assert cache.get("panel") is None
+    assert cache.get_or_load("panel", lambda: "loaded") == "loaded"
+
+    # stale 재검증이 빈 결과를 받으면 기존 값 유지
+    clock.now += 20
+    revalidated = threading.Event()
+
+    def empty():
+        revalidated.set()
+        return Uncached({"buy": []})
+
+    assert cache.get_or_load("panel", empty) == "loaded"
+    assert revalidated.wait(2)
+    assert _wait_for(lambda: "panel" not in cache._revalidating)
+    assert cache.get("panel") == "loaded"
@@ -0,0 +1,101 @@
+"""Cassette — Kiwoom 응답 기록 → 재생 왕복 (토큰 가림 · 키별 재생 순서 · loose 대체)."""
+import json
+
+import pytest
+
+from modules.cassette import REDACTED_TOKEN, Cassette, CassetteMiss, CassetteTransport
+
+URL = "https://api.kiwoom.com"
+SECRET = "real-token-abc"
+
+
+class _Resp:
+    def __init__(self, body, headers=None, status_code=200):
+        self._body = body
+        self.headers = headers or {}
+        self.status_code = status_code
+
+    def json(self):
+        return self._body
+
+
+class _Live:
+    """실서버 대신 호출마다 다음 응답을 돌려주는 transport."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        self.calls.append((url, dict(headers or {}), json))
+        return self.responses.pop(0)
+
+
+def _hdr(api_id, next_key=""):
+    h = {"api-id": api_id, "authorization": f"Bearer {SECRET}"}
+    if next_key:
+        h["cont-yn"], h["next-key"] = "Y", next_key
+    return h
+
+
+@pytest.fixture()
+def recorded(tmp_path):
+    live = _Live([
+        _Resp({"token": SECRET, "expires_dt": "20261017120000", "return_code": 0}),
+        _Resp({"list": [1]}, {"cont-yn": "Y", "next-key": "k2", "x-trace": "drop"}),
+        _Resp({"list": [2]}, {"cont-yn": "N", "next-key": ""}),
+        _Resp({"list": ["a"]}),
+        _Resp({"list": ["b"]}),
+    ])
+    rec = CassetteTransport(live, Cassette(root=str(tmp_path), mode="record"))
+    rec.post(f"{URL}/oauth2/token", headers={"api-id": "au10001"},
+             json={"grant_type": "client_credentials", "appkey": "APPKEY", "secretkey": "SECRETKEY"})
+    rec.post(f"{URL}/api/dostk/rkinfo", headers=_hdr("ka10030"), json={"mrkt_tp": "0"})
+    rec.post(f"{URL}/api/dostk/rkinfo", headers=_hdr("ka10030", "k2"), json={"mrkt_tp": "0"})
+    rec.post(f"{URL}/api/dostk/stkinfo", headers=_hdr("ka10001"), json={"stk_cd": "005930"})
+    rec.post(f"{URL}/api/dostk/stkinfo", headers=_hdr("ka10001"), json={"stk_cd": "005930"})
+    assert rec.cassette.counts["recorded"] == 5 and not live.responses
+    return tmp_path
+
+
+def _replay(root):
+    return CassetteTransport(_Live([]), Cassette(root=str(root), mode="replay"))
+
+
+def test_token_and_credentials_are_redacted(recorded):
+    raw = (recorded / "kiwoom.jsonl").read_text(encoding="utf-8")
+    for secret in (SECRET, "APPKEY", "SECRETKEY", "authorization", "x-trace"):
+        assert secret not in raw
+    token = json.loads(raw.splitlines()[0])
+    assert token["body_in"] is None
+    assert token["body"] == {"token": REDACTED_TOKEN, "expires_dt": "20991231235959", "return_code": 0}
+
+    resp = _replay(recorded).post(f"{URL}/oauth2/token", headers={"api-id": "au10001"},
+                                  json={"appkey": "OTHER", "secretkey": "OTHER"})
+    assert resp.json()["token"] == REDACTED_TOKEN
+
+
+def test_pages_and_repeated_keys_replay_in_order(recorded):
+    tr = _replay(recorded)
+    first = tr.post(f"{URL}/api/dostk/rkinfo", headers=_hdr("ka10030"), json={"mrkt_tp": "0"})
+    assert first.json() == {"list": [1]}
+    assert (first.headers["Cont-Yn"], first.headers["next-key"]) == ("Y", "k2")
+    second = tr.post(f"{URL}/api/dostk/rkinfo", headers=_hdr("ka10030", first.headers["next-key"]), json={"mrkt_tp": "0"})
+    assert second.json() == {"list": [2]} and second.headers["cont-yn"] == "N"
+
+    # 같은 키 두 번 기록 → 순서대로, 소진 후 마지막 반복
+    bodies = [tr.post(f"{URL}/api/dostk/stkinfo", headers=_hdr("ka10001"), json={"stk_cd": "005930"}).json()
+              for _ in range(3)]
+    assert bodies == [{"list": ["a"]}, {"list": ["b"]}, {"list": ["b"]}]
+    assert tr.cassette.counts == {"recorded": 0, "played": 5, "loose": 0, "misses": 0}
+    assert tr.inner.calls == []
+
+
+def test_unknown_body_falls_back_to_latest_of_same_api(recorded):
+    tr = _replay(recorded)
+    resp = tr.post(f"{URL}/api/dostk/stkinfo", headers=_hdr("ka10001"), json={"stk_cd": "000660"})
+    assert resp.json() == {"list": ["b"]}
+    with pytest.raises(CassetteMiss):
+        tr.post(f"{URL}/api/dostk/chart", headers=_hdr("ka10081"), json={"stk_cd": "005930"})
+    assert tr.cassette.counts == {"recorded": 0, "played": 0, "loose": 1, "misses": 1}
+    assert tr.cassette.stats()["keys"] == 4
@@ -0,0 +1,28 @@
+"""/api/v3/dashboard 조건부 응답 — 스냅샷이 그대로면 ETag 불변 → 304."""
+import time
+
+
+def test_unchanged_dashboard_returns_304(client):
+    first = client.get("/api/v3/dashboard")
+    assert first.status_code == 200
+    etag = first.headers["ETag"].strip('"')
+    assert "X-Panel-Age" in first.headers
+    assert b'"age"' not in first.data
+
+    time.sleep(0.15)                    # 패널 경과 시간이 바뀌어도 본문 · ETag는 동일
+    again = client.get("/api/v3/dashboard", headers={"If-None-Match": f'"{etag}"'})
+    assert again.status_code == 304
+    assert again.headers["ETag"].strip('"') == etag
+
+
+def test_dashboard_body_reused_until_panel_changes(app_module, client):
+    client.get("/api/v3/dashboard")
+    encoded = app_module._dashboard_body["encoded"]
+    client.get("/api/v3/dashboard")
+    assert app_module._dashboard_body["encoded"] is encoded
+
+    snap = app_module.snapshots.get("indices")
+    app_module.snapshots.put("indices", {**snap.data, "_test": 1})
+    changed = client.get("/api/v3/dashboard", headers={"If-None-Match": f'"{encoded.etag}"'})
+    assert changed.status_code == 200
+    assert app_module._dashboard_body["encoded"] is not encoded
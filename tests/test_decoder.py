@@ -0,0 +1,122 @@
+"""decode — 스칼라 파서(parse_int · parse_float · clean_code)와 같은 결과 + 프로그램 상위 순위."""
+import asyncio
+import random
+
+import numpy as np
+
+from modules.decoder import Columns, clean_code, decode, parse_float, parse_int
+from modules.kiwoom import KiwoomLogic
+
+ODD_NUMBERS = ["--500", "12.5", "+1,234", "-3,441", "", "  42 ", "+-7", "5-", "-", "abc", "1e3", None, 0, 17]
+CODES = ["005930", "000660_AL", "035420_NX", " 068270 ", "12345", "1234567", "A0593!", "", None, "00088K"]
+
+
+def _rows(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        row = {
+            "stk_cd": rng.choice(CODES) if i % 5 == 0 else f"{rng.randint(0, 999999):06d}" + rng.choice(["", "_AL", "_NX"]),
+            "stk_nm": rng.choice([f"종목{i}", f" 종목{i} ", ""]),
+            "cur_prc": rng.choice(ODD_NUMBERS) if i % 7 == 0 else f"{rng.choice('+-')}{rng.randint(100, 10**6):,}",
+            "flu_rt": rng.choice(ODD_NUMBERS) if i % 11 == 0 else f"{rng.choice(['+', '-', ''])}{rng.uniform(0, 30):.2f}",
+        }
+        # 거래대금: 응답 버전에 따라 trde_prica / trde_amt / trde_val, 없을 수도 있음
+        amount = rng.choice(ODD_NUMBERS) if i % 13 == 0 else f"{rng.randint(0, 10**9):,}"
+        alt = rng.choice(["trde_prica", "trde_prica", "trde_amt", "trde_val", None])
+        if alt:
+            row[alt] = amount
+        rows.append(row)
+    return rows
+
+
+def _expected(rows: list) -> list:
+    """기존 행별 루프와 같은 의미."""
+    out = []
+    for r in rows:
+        code = clean_code(r.get("stk_cd") or "")
+        if len(code) != 6 or not code.isalnum():
+            continue
+        amount = next((r[k] for k in ("trde_prica", "trde_amt", "trde_val") if k in r), "0")
+        out.append({
+            "stk_cd": code,
+            "stk_nm": str(r.get("stk_nm") or "").strip(),
+            "trde_prica": parse_int(amount),
+            "cur_prc": abs(parse_int(r.get("cur_prc"))),
+            "flu_rt": parse_float(r.get("flu_rt")),
+        })
+    return out
+
+
+def test_decode_matches_scalar_parsers():
+    rows = _rows(600)
+    cols = decode("ka10032", {"trde_prica_upper": rows})
+    assert cols.records() == _expected(rows)
+    assert cols.total == len(rows)
+    assert cols["stk_cd"].tolist() == [clean_code(rows[i]["stk_cd"]) for i in cols.index.tolist()]
+    assert cols["trde_prica"].dtype == np.int64 and cols["flu_rt"].dtype == np.float64
+
+
+def test_odd_numbers_keep_scalar_meaning():
+    rows = [{"stk_cd": "005930", "netprps_amt": v, "flu_rt": v} for v in ODD_NUMBERS]
+    cols = decode("ka10039", rows)
+    assert cols["netprps_amt"].tolist() == [parse_int(v) for v in ODD_NUMBERS]
+    assert cols["flu_rt"].tolist() == [parse_float(v) for v in ODD_NUMBERS]
+    assert parse_int("--500") == -500 and parse_int("12.5") == 0 and parse_int("+1,234") == 1234
+
+
+def test_clean_numbers_take_the_bulk_path():
+    rows = [{"stk_cd": "005930", "netprps_amt": "+1,234", "flu_rt": "-0.50"},
+            {"stk_cd": "000660", "netprps_amt": "-3,441", "flu_rt": "+12.5"}]
+    cols = decode("ka10039", rows)
+    assert cols["netprps_amt"].tolist() == [1234, -3441]
+    assert cols["flu_rt"].tolist() == [-0.5, 12.5]
+
+
+def test_codes_drop_suffix_and_invalid_rows():
+    rows = [{"stk_cd": c, "stk_nm": str(i)} for i, c in enumerate(CODES)]
+    cols = decode("ka20002", rows)
+    assert cols["stk_cd"].tolist() == ["005930", "000660", "035420", "068270", "00088K"]
+    assert cols.index.tolist() == [0, 1, 2, 3, 9]
+    assert cols["stk_nm"].tolist() == ["0", "1", "2", "3", "9"]
+
+
+def test_empty_payload_and_concat():
+    empty = decode("ka10065", {"opmr_invsr_trde_upper": []})
+    assert len(empty) == 0 and empty["netslmt"].dtype == np.int64
+    a = decode("ka10065", [{"stk_cd": "005930", "netslmt": "1"}, {"stk_cd": "bad"}])
+    b = decode("ka10065", [{"stk_cd": "000660", "netslmt": "-2"}])
+    both = Columns.concat([a, b])
+    assert both["stk_cd"].tolist() == ["005930", "000660"]
+    assert both.index.tolist() == [0, 2] and both.total == 3
+
+
+class _ProgramAPI:
+    def __init__(self, pages):
+        self.pages = iter(pages)
+
+    async def call_async(self, api_id, path, body):
+        return {"prm_netprps_upper_50": next(self.pages)}
+
+
+class _ProgramLogic:
+    get_program_top_async = KiwoomLogic.get_program_top_async
+
+    def __init__(self, pages):
+        self._api = _ProgramAPI(pages)
+
+    def _remember_names(self, rows, market):
+        pass
+
+
+def test_program_top_ranks_are_contiguous_over_valid_rows():
+    kospi = [
+        {"stk_cd": "005930", "stk_nm": "A", "prm_netprps_amt": "+900"},
+        {"stk_cd": "bad", "stk_nm": "X", "prm_netprps_amt": "+5000"},     # 코드 불량 → 제외, 순위 건너뛰지 않음
+        {"stk_cd": "000660", "stk_nm": "B", "prm_netprps_amt": "-300"},
+    ]
+    kosdaq = [{"stk_cd": "035420_NX", "stk_nm": "C", "prm_netprps_amt": "-700"}]
+    out = asyncio.run(_ProgramLogic([kospi, kosdaq]).get_program_top_async(count=10))
+    assert [(r["rank"], r["stk_cd"], r["market"]) for r in out] == [
+        (1, "005930", "KOSPI"), (2, "035420", "KOSDAQ"), (3, "000660", "KOSPI"),
+    ]
@@ -0,0 +1,121 @@
+"""HongSignalScanner — 기울기 · 가속도 판정, 장외 시간 스캔은 추세 · 가집계 이력 · 장중 기록을 바꾸지 않음."""
+import asyncio
+import random
+from datetime import datetime
+
+import pytest
+
+from modules.hong_signal import HongSignalScanner, RollingSlope, TrendTracker, calc_slope
+
+OPEN = datetime(2026, 10, 16, 10, 0).timestamp()       # 금요일 장중
+CLOSED = datetime(2026, 10, 17, 10, 0).timestamp()     # 토요일
+
+
+class _Symbols:
+    def sector(self, code):
+        return "반도체"
+
+
+class _Kiwoom:
+    symbols = _Symbols()
+
+    @staticmethod
+    def _run(coro):
+        return asyncio.run(coro)
+
+
+class _Journal:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        if not name.startswith("append_"):
+            raise AttributeError(name)
+        return lambda *args: self.calls.append(name)
+
+
+def _scanner(now):
+    scanner = HongSignalScanner(_Kiwoom(), journal=_Journal(), clock=lambda: now[0])
+    scanner.nets = [1000, 2000, 3000]
+
+    async def inputs(mrkt_tp):
+        top = [{"code": c, "name": c, "tradeAmt": 1, "changePct": 0} for c in ("A", "B", "C")]
+        ranking = [{"code": c, "netQty": n} for c, n in zip(("A", "B", "C"), scanner.nets)]
+        return top, {}, ranking, ranking
+
+    scanner._strategy_inputs = inputs
+    return scanner
+
+
+@pytest.mark.parametrize("window", [2, 5, 10, 30])
+def test_rolling_slope_matches_calc_slope(window):
+    rng = random.Random(window)
+    values, fit = [], RollingSlope(window)
+    for _ in range(500):
+        values.append(rng.randint(-10**9, 10**9))
+        assert fit.push(values[-1]) == pytest.approx(calc_slope(values, window), rel=1e-9, abs=1e-6)
+
+
+def test_acceleration_is_slope_change_over_one_window():
+    window = 5
+    rng = random.Random(1)
+    tracker, values, slopes = TrendTracker((window,)), [], []
+    for k in range(40):
+        values.append(rng.randint(-1000, 1000))
+        _, fits = tracker.push(values[-1])
+        slope, accel = fits[window]
+        slopes.append(calc_slope(values, window))
+        earlier = slopes[max(0, k - window)]          # 이력이 짧으면 가장 오래된 기울기
+        assert accel == pytest.approx(slopes[-1] - earlier, abs=1e-9)
+
+
+def _program(scanner, net):
+    return scanner.get_program_slope("0", [{"code": "005930", "netQty": net}])
+
+
+def test_accelerating_needs_more_than_window_points():
+    scanner = HongSignalScanner(_Kiwoom())
+    window = scanner.program_slope_window
+    trends = [_program(scanner, i * i)["trend"] for i in range(1, window + 2)]    # 볼록 증가
+    assert trends[0] == "COLLECTING"
+    assert trends[window - 1] == "POSITIVE"          # 포인트 = window: 가속도 미판정
+    assert trends[window] == "ACCELERATING"          # window 초과 + 기울기 > 0 + 가속도 > 0
+
+    concave = HongSignalScanner(_Kiwoom())
+    for i in range(1, 2 * window + 2):
+        result = _program(concave, 1000 * i - 10 * i * i)   # 증가하지만 둔화
+    assert result["slope"] > 0 and result["acceleration"] < 0
+    assert result["trend"] == "POSITIVE"
+
+
+def test_market_hours():
+    scanner = HongSignalScanner(_Kiwoom())
+    assert scanner.is_market_hours(OPEN)
+    assert not scanner.is_market_hours(CLOSED)
+    assert not scanner.is_market_hours(datetime(2026, 10, 16, 9, 29).timestamp())
+    assert not scanner.is_market_hours(datetime(2026, 10, 16, 16, 0).timestamp())
+
+
+def test_off_hours_scan_is_read_only():
+    now = [OPEN]
+    scanner = _scanner(now)
+    for step in range(4):
+        scanner.nets = [n + 100 * step for n in (1000, 2000, 3000)]
+        live = scanner.scan_strategy("0")
+    assert live["marketHours"] is True
+    journaled = len(scanner.journal.calls)
+    assert journaled > 0
+    history = scanner._inst_tally.history("A")
+    points = scanner._program_trend("0").count
+
+    now[0] = CLOSED
+    scanner.nets = [0, 0, 0]
+    closed = scanner.scan_strategy("0")
+    assert closed["marketHours"] is False
+    assert len(scanner.journal.calls) == journaled
+    assert scanner._inst_tally.history("A") == history
+    assert scanner._program_trend("0").count == points
+    # 마지막 장중 판정을 그대로 유지
+    assert closed["program"]["slope"] == live["program"]["slope"]
+    assert sorted((s["code"], s["consecutive"], s["delta"]) for s in closed["signals"]) == \
+        sorted((s["code"], s["consecutive"], s["delta"]) for s in live["signals"])
@@ -0,0 +1,76 @@
+"""IntradayStore — 중단된 쓰기 뒤에도 컬럼 행 정렬 유지."""
+import os
+
+import numpy as np
+import pytest
+
+from modules.intraday import IntradayStore, batches
+
+DAY = "20260105"
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return IntradayStore(root=str(tmp_path), keep_days=3)
+
+
+def _torn_inst_row(store, code: str, ts: float):
+    """ts · code 컬럼만 기록되고 net은 빠진 inst 행 (쓰기 도중 프로세스 종료)."""
+    np.array([ts], "<f8").tofile(open(store._path(DAY, "inst", "ts"), "ab"))
+    with open(store._path(DAY, "inst", "code"), "ab") as f:
+        f.write(np.array([code], "S6").tobytes())
+
+
+def test_append_and_read_roundtrip(store):
+    store.append("inst", day=DAY, ts=[1.0, 1.0], code=["000001", "000002"], net=[10, 20])
+    store.append("inst", day=DAY, ts=[2.0], code=["000003"], net=[30])
+    cols = store.read("inst", DAY)
+    assert cols["code"].tolist() == [b"000001", b"000002", b"000003"]
+    assert cols["net"].tolist() == [10, 20, 30]
+    assert batches(cols["ts"]) == [(0, 2), (2, 3)]
+
+
+def test_torn_write_before_restart_is_truncated(store, tmp_path):
+    store.append("inst", day=DAY, ts=1.0, code="000001", net=10)
+    _torn_inst_row(store, "000002", 2.0)
+
+    restarted = IntradayStore(root=str(tmp_path), keep_days=3)     # 재기동 후 첫 append
+    restarted.append("inst", day=DAY, ts=3.0, code="000003", net=30)
+
+    cols = restarted.read("inst", DAY)
+    assert cols["code"].tolist() == [b"000001", b"000003"]
+    assert cols["net"].tolist() == [10, 30]
+    assert cols["ts"].tolist() == [1.0, 3.0]
+    assert restarted.repairs == 2
+    sizes = {c: os.path.getsize(restarted._path(DAY, "inst", c)) for c in ("ts", "code", "net")}
+    assert sizes == {"ts": 16, "code": 12, "net": 16}
+
+
+def test_partial_item_bytes_are_dropped(store):
+    store.append("program_0", day=DAY, ts=1.0, net=5)
+    with open(store._path(DAY, "program_0", "net"), "ab") as f:
+        f.write(b"\x01\x02\x03")                 # int64 절반만 기록
+    IntradayStore(root=store.root).append("program_0", day=DAY, ts=2.0, net=7)
+    cols = store.read("program_0", DAY)
+    assert cols["net"].tolist() == [5, 7]
+
+
+def test_failed_append_realigns_next_write(store, monkeypatch):
+    store.append("inst", day=DAY, ts=1.0, code="000001", net=10)
+    real_open = open
+    calls = {"n": 0}
+
+    def flaky_open(path, mode="r", *args, **kwargs):
+        if path.endswith("inst.net.bin") and "a" in mode and calls["n"] == 0:
+            calls["n"] += 1
+            raise OSError("disk full")
+        return real_open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", flaky_open)
+    store.append("inst", day=DAY, ts=2.0, code="000002", net=20)    # ts · code만 기록
+    monkeypatch.setattr("builtins.open", real_open)
+    store.append("inst", day=DAY, ts=3.0, code="000003", net=30)
+
+    cols = store.read("inst", DAY)
+    assert cols["code"].tolist() == [b"000001", b"000003"]
+    assert cols["net"].tolist() == [10, 30]
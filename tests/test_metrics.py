@@ -0,0 +1,27 @@
+"""/metrics 텍스트 형식 — 누적 히스토그램 버킷 · 레이블 이스케이프 · collector 실패 격리."""
+from modules.metrics import Registry
+
+
+def test_histogram_buckets_are_cumulative():
+    reg = Registry()
+    hist = reg.histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        hist.labels("/a").observe(v)
+    lines = reg.render().splitlines()
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 't_seconds_count{route="/a"} 4' in lines
+
+
+def test_label_escape_and_collector_failure():
+    reg = Registry()
+    reg.counter("t_total", "test", ("path",)).labels('a"b\\c').inc(2)
+
+    @reg.collector
+    def broken():
+        raise RuntimeError("boom")
+
+    text = reg.render()
+    assert 't_total{path="a\\"b\\\\c"} 2' in text
+    assert "# collector broken failed: boom" in text
@@ -0,0 +1,114 @@
+"""연속조회 — cont-yn · next-key · 최대 페이지 수 · limit 도달 시 조기 종료 (요청 횟수 확인)."""
+import asyncio
+
+import pytest
+
+import modules.kiwoom as kiwoom
+from modules.kiwoom import KiwoomAPI
+from modules.ratelimit import RateLimiter
+
+
+class _Token:
+    token = "t"
+    is_valid = True
+
+    def get_token(self):
+        return self.token
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, body, headers):
+        self._body = body
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+class _Pages:
+    """
+    페이지당 rows_per_page행, pages페이지째에 cont-yn=N.
+    empty_key_at: 해당 페이지는 cont-yn=Y지만 next-key가 빈 값, bad_first: 페이지마다 첫 행 코드 불량.
+    """
+
+    def __init__(self, pages: int, rows_per_page: int = 3, empty_key_at: int | None = None, bad_first: bool = False):
+        self.pages = pages
+        self.rows_per_page = rows_per_page
+        self.empty_key_at = empty_key_at
+        self.bad_first = bad_first
+        self.calls = []
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        page = int(headers.get("next-key", "0"))
+        self.calls.append(headers.get("next-key", ""))
+        rows = [{"stk_cd": f"{page:03d}{i:03d}", "netslmt": str(i)} for i in range(self.rows_per_page)]
+        if self.bad_first:
+            rows[0]["stk_cd"] = "BAD"
+        more = page + 1 < self.pages
+        key = "" if page == self.empty_key_at else str(page + 1)
+        return _Resp({"opmr_invsr_trde_upper": rows}, {"cont-yn": "Y" if more else "N", "next-key": key})
+
+
+@pytest.fixture()
+def make_api():
+    apis = []
+
+    def make(transport):
+        api = KiwoomAPI(_Token(), transport, limiter=RateLimiter(1e6, 1e6), io_workers=2)
+        apis.append(api)
+        return api
+
+    yield make
+    for api in apis:
+        api._io.shutdown(wait=True)
+
+
+def test_stops_when_cont_yn_is_not_y(make_api):
+    transport = _Pages(pages=3)
+    cols = make_api(transport).decode_pages("ka10065", "/api/dostk/rkinfo", {})
+    assert transport.calls == ["", "1", "2"]
+    assert len(cols) == 9 and cols.index.tolist() == list(range(9))
+
+
+def test_stops_on_empty_next_key(make_api):
+    transport = _Pages(pages=5, empty_key_at=1)
+    pages = list(make_api(transport).iter_pages("ka10065", "/api/dostk/rkinfo", {}))
+    assert len(pages) == 2 and len(transport.calls) == 2
+
+
+def test_stops_at_max_pages(make_api):
+    transport = _Pages(pages=100)
+    cols = make_api(transport).decode_pages("ka10065", "/api/dostk/rkinfo", {})
+    assert len(transport.calls) == kiwoom.KIWOOM_MAX_PAGES
+    assert len(cols) == 3 * kiwoom.KIWOOM_MAX_PAGES
+
+    transport = _Pages(pages=100)
+    list(make_api(transport).iter_pages("ka10065", "/api/dostk/rkinfo", {}, max_pages=2))
+    assert len(transport.calls) == 2
+
+
+def test_limit_stops_before_next_page(make_api):
+    transport = _Pages(pages=10, rows_per_page=4)
+    cols = make_api(transport).decode_pages("ka10065", "/api/dostk/rkinfo", {}, limit=6)
+    assert len(transport.calls) == 2 and len(cols) == 6
+    assert cols["stk_cd"].tolist()[-1] == "001001"
+
+
+def test_limit_counts_valid_rows_only(make_api):
+    transport = _Pages(pages=10, rows_per_page=4, bad_first=True)     # 페이지당 유효 3행
+    cols = make_api(transport).decode_pages("ka10065", "/api/dostk/rkinfo", {}, limit=7)
+    assert len(transport.calls) == 3 and len(cols) == 7
+
+
+def test_async_limit_stops_before_next_page(make_api):
+    transport = _Pages(pages=10, rows_per_page=4)
+    api = make_api(transport)
+    cols = asyncio.run(api.decode_pages_async("ka10065", "/api/dostk/rkinfo", {}, limit=4))
+    assert len(transport.calls) == 1 and len(cols) == 4
+    cols = asyncio.run(api.decode_pages_async("ka10065", "/api/dostk/rkinfo", {}))
+    assert len(transport.calls) == 1 + min(10, kiwoom.KIWOOM_MAX_PAGES)
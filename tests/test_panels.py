@@ -0,0 +1,24 @@
+"""스케줄 패널 갱신 — 내부 캐시의 이전 결과를 다시 스냅샷하지 않음."""
+from datetime import datetime
+
+
+def test_scheduled_refresh_bypasses_fresh_cache(app_module):
+    kiwoom = app_module.kiwoom
+    kiwoom._cache.set("foreign_sector_flow", [{"sector": "stale"}])
+    assert kiwoom.get_foreign_sector_flow() == [{"sector": "stale"}]      # 라우트 경로는 캐시 사용
+
+    snap = app_module._refresh_panel("foreign_sector", app_module.PANEL_FETCHERS["foreign_sector"])
+    assert snap.data != [{"sector": "stale"}]
+    assert kiwoom._cache.get("foreign_sector_flow", ttl=600) == snap.data
+
+
+def test_panel_cache_keys_are_known_panels(app_module):
+    assert set(app_module.PANEL_CACHE_KEYS) <= set(app_module.PANEL_FETCHERS)
+
+
+def test_strategy_refresh_skipped_off_hours(app_module, monkeypatch):
+    saturday = datetime(2026, 10, 17, 10, 0).timestamp()
+    first = app_module._refresh_panel("strategy_signals_0", app_module.PANEL_FETCHERS["strategy_signals_0"])
+    monkeypatch.setattr(app_module.hong_scanner, "clock", lambda: saturday)
+    again = app_module._refresh_panel("strategy_signals_0", app_module.PANEL_FETCHERS["strategy_signals_0"])
+    assert again is first
@@ -0,0 +1,64 @@
+"""RateLimiter — 전역 · api-id 버킷 예약이 어떤 1초 구간에서도 쿼터를 넘지 않음."""
+import random
+
+import pytest
+
+import modules.ratelimit as ratelimit_module
+from modules.ratelimit import RateLimiter, TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ratelimit_module, "time", clock)
+    return clock
+
+
+def _max_in_window(fired: list, width: float = 1.0) -> int:
+    fired = sorted(fired)
+    return max(sum(1 for t in fired if start <= t < start + width - 1e-9) for start in fired)
+
+
+def test_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve(0.0) for _ in range(5)] == [0.0, 0.0, 0.0, 0.5, 1.0]
+
+
+def test_bucket_future_reservation_takes_that_slot():
+    bucket = TokenBucket(rate=5, burst=1)
+    assert bucket.reserve(0.0, at=1.0) == 1.0
+    assert bucket.reserve(0.0) == pytest.approx(1.2)       # 1.0 슬롯은 이미 예약됨
+
+
+def test_delayed_per_api_call_does_not_waste_global_slot(clock):
+    limiter = RateLimiter(5, 1, per_api={"A": (1, 1)})
+    fired = []
+
+    def call(api_id):
+        fired.append(clock.now + limiter.reserve(api_id))
+
+    call("A")
+    call("A")                   # api-id 버킷 때문에 t=1.0까지 대기
+    for i in range(10):
+        clock.now = 1.0 + 0.2 * i
+        call("B")
+    assert fired[1] == pytest.approx(1.0)
+    assert _max_in_window(fired) <= 5
+
+
+def test_random_mix_stays_within_quota(clock):
+    rng = random.Random(3)
+    limiter = RateLimiter(5, 2, per_api={"A": (1, 1), "B": (2, 1)})
+    fired = []
+    for _ in range(300):
+        clock.now += rng.uniform(0, 0.3)
+        fired.append(clock.now + limiter.reserve(rng.choice("ABCC")))
+    assert _max_in_window(fired) <= 5 + 2 - 1        # rate × 1초 + (burst - 1)
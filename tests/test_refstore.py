@@ -0,0 +1,43 @@
+"""ReferenceStore — merge() 변경이 이후 호출 없이도 디스크에 기록되는지."""
+import json
+import time
+
+import modules.refstore as refstore
+from modules.refstore import ReferenceStore
+
+
+def _on_disk(store, name):
+    try:
+        with open(store._path(name), encoding="utf-8") as f:
+            return json.load(f)["data"]
+    except FileNotFoundError:
+        return None
+
+
+def test_merge_flushes_on_timer_after_quiet_period(tmp_path, monkeypatch):
+    monkeypatch.setattr(refstore, "REF_FLUSH_INTERVAL", 0.2)
+    store = ReferenceStore(root=str(tmp_path))
+    store.merge("stock_names", {"005930": "삼성전자"})          # 첫 병합 → 즉시 기록
+    store.merge("stock_names", {"000660": "SK하이닉스"})        # 간격 내 → 지연 기록 예약
+    assert _on_disk(store, "stock_names") == {"005930": "삼성전자"}
+
+    deadline = time.time() + 3
+    while time.time() < deadline and _on_disk(store, "stock_names") != {"005930": "삼성전자", "000660": "SK하이닉스"}:
+        time.sleep(0.05)
+    assert _on_disk(store, "stock_names") == {"005930": "삼성전자", "000660": "SK하이닉스"}
+    assert not store._timers
+
+    store.merge("stock_names", {"035420": "NAVER"})             # 타이머 반납 후에도 다시 예약
+    assert "stock_names" in store._timers
+    store.flush_all()
+    assert "035420" in _on_disk(store, "stock_names")
+
+
+def test_flush_all_writes_pending_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(refstore, "REF_FLUSH_INTERVAL", 3600)
+    store = ReferenceStore(root=str(tmp_path))
+    store.merge("stock_names", {"005930": "삼성전자"})
+    store.merge("stock_names", {"000660": "SK하이닉스"})
+    store.flush_all()                                           # atexit 훅과 같은 경로
+    assert _on_disk(store, "stock_names") == {"005930": "삼성전자", "000660": "SK하이닉스"}
+    assert not store._dirty and not store._timers
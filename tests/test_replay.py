@@ -0,0 +1,55 @@
+"""StrategyReplay — 기록 스냅샷 2개로 시그널 타임라인 · 이벤트 이후 수익률(searchsorted) 확인."""
+from datetime import datetime
+
+import pytest
+
+from modules.intraday import IntradayStore
+from modules.replay import StrategyReplay
+
+DAY = "20261016"
+T1 = datetime(2026, 10, 16, 10, 0).timestamp()      # 금요일 장중
+T2 = T1 + 300
+A, B, C = "005930", "000660", "035420"
+
+
+def _snapshot(store, ts, prices: dict, inst: dict, prog: dict):
+    codes = list(prices)
+    store.append("volume_0", day=DAY, ts=[ts] * len(codes), code=codes,
+                 amt=[10**9] * len(codes), price=list(prices.values()), chg=[0.0] * len(codes))
+    for orgn, rows in (("9100", inst), ("9000", prog)):
+        store.append(f"rank_{orgn}_0", day=DAY, ts=[ts] * len(rows), code=list(rows), net=list(rows.values()))
+
+
+@pytest.fixture()
+def result(tmp_path):
+    store = IntradayStore(root=str(tmp_path))
+    _snapshot(store, T1, {A: 100, B: 200, C: 300}, inst={A: 1000, B: 500}, prog={A: 10})
+    _snapshot(store, T2, {A: 110, B: 190, C: 330}, inst={A: 1200, B: 400, C: 50}, prog={A: 30})
+    sector_map = {A: "반도체", B: "반도체", C: "반도체"}
+    return StrategyReplay(store, sector_map, {A: "삼성전자"}).run(DAY, "0")
+
+
+def test_timeline_follows_recorded_stamps(result):
+    assert result["steps"] == 2
+    first, second = result["timeline"]
+    assert (first["ts"], second["ts"]) == (T1, T2)
+    assert first["time"] == "10:00:00" and first["leadingSectors"] == ["반도체"]
+    assert [(s["code"], s["level"], s["instNet"]) for s in first["signals"]] == [(A, "WATCH", 1000), (B, "WATCH", 500)]
+    assert {s["code"] for s in second["signals"]} == {A, B, C}
+    assert [s["consecutive"] for s in second["signals"] if s["code"] == A] == [1]
+    assert second["trend"] == "POSITIVE" and second["slope"] == 20
+
+
+def test_events_get_returns_from_later_snapshots(result):
+    events = {e["code"]: e for e in result["events"]}
+    assert set(events) == {A, B, C}                       # 레벨 상향 없음 → 종목당 최초 진입 1건
+    assert events[A]["name"] == "삼성전자" and events[A]["price"] == 100
+    assert events[A]["ret"] == {"5m": 10.0, "15m": 10.0, "30m": 10.0, "close": 10.0}
+    assert events[B]["ret"]["5m"] == -5.0 and events[B]["ret"]["close"] == -5.0
+    # 마지막 스냅샷에서 진입 → 이후 관측 없음
+    assert events[C]["ts"] == T2 and events[C]["price"] == 330
+    assert set(events[C]["ret"].values()) == {None}
+
+    watch = result["summary"]["WATCH"]
+    assert watch["count"] == 3
+    assert watch["meanRet"]["5m"] == 2.5 and watch["hitRate"]["5m"] == 0.5
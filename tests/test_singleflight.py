@@ -0,0 +1,70 @@
+"""SingleFlight — 동시 호출 병합, 예외(BaseException 포함) 공유, 완료 후 키 해제."""
+import threading
+import time
+
+from modules.singleflight import SingleFlight
+
+
+def _race(fn, callers: int = 8) -> tuple:
+    """leader의 fn이 도는 동안 나머지 호출자를 같은 키로 진입시킨다. → (호출자별 결과, fn 실행 횟수)"""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+    out = [None] * callers
+
+    def load():
+        runs.append(1)
+        started.set()
+        release.wait(2)
+        return fn()
+
+    def caller(i):
+        try:
+            out[i] = ("ok", flight.do("k", load))
+        except BaseException as e:
+            out[i] = ("error", e)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    threads[0].start()
+    assert started.wait(2)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.1)             # 나머지 호출자가 대기에 들어갈 시간
+    release.set()
+    for t in threads:
+        t.join(2)
+    assert not flight._calls
+    return out, len(runs)
+
+
+def test_concurrent_callers_share_one_call():
+    out, runs = _race(lambda: {"rows": 3})
+    assert runs == 1
+    assert out[0] == ("ok", ({"rows": 3}, False))
+    assert all(r == ("ok", ({"rows": 3}, True)) for r in out[1:])
+
+
+def test_exception_reaches_every_waiter():
+    error = ValueError("upstream 500")
+
+    def fail():
+        raise error
+
+    out, runs = _race(fail)
+    assert runs == 1
+    assert all(kind == "error" and e is error for kind, e in out)
+
+
+def test_base_exception_is_not_returned_as_none():
+    def interrupted():
+        raise KeyboardInterrupt
+
+    out, runs = _race(interrupted, callers=4)
+    assert runs == 1
+    assert all(kind == "error" and isinstance(e, KeyboardInterrupt) for kind, e in out)
+
+
+def test_key_released_after_call():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == (1, False)
+    assert flight.do("k", lambda: 2) == (2, False)
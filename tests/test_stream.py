@@ -0,0 +1,23 @@
+"""/api/v3/stream — 응답이 소비되지 않고 닫혀도 구독 슬롯 반납."""
+
+
+def test_unconsumed_stream_releases_slot(app_module):
+    broadcaster = app_module.broadcaster
+    before = broadcaster.clients()
+    for _ in range(broadcaster.max_clients + 5):        # 누수되면 상한에 걸려 503
+        with app_module.app.test_request_context("/api/v3/stream"):
+            resp = app_module.api_v3_stream()
+            assert resp.status_code == 200
+            resp.close()                                # 본문을 한 번도 읽지 않고 종료
+    assert broadcaster.clients() == before
+
+
+def test_stream_sends_hello_and_panels(app_module, client):
+    app_module.snapshots.put("indices", {"KOSPI": {"value": 1}})
+    resp = client.get("/api/v3/stream", buffered=False)
+    chunks = resp.response
+    frames = b"".join(next(chunks) for _ in range(3))
+    resp.close()
+    assert b"event: hello" in frames
+    assert b'"panel":"indices"' in frames
+    assert app_module.broadcaster.clients() == 0
@@ -0,0 +1,55 @@
+"""InstTallyStore — 변화량 · 연속 증가 · ttl 만료 · 용량 확장."""
+import numpy as np
+
+from modules.tally import InstTallyStore
+
+
+def test_delta_and_consecutive():
+    store = InstTallyStore(depth=4, ttl=0)
+    store.record(["A", "B"], [10, 50], now=1)
+    store.record(["A", "B"], [20, 40], now=2)
+    res = store.record(["A", "B"], [30, 45], now=3)
+    assert res["delta"].tolist() == [10, 5]
+    assert res["consecutive"].tolist() == [2, 1]
+    assert res["samples"].tolist() == [3, 3]
+    assert store.history("A") == [(1.0, 10), (2.0, 20), (3.0, 30)]
+
+
+def test_ring_buffer_keeps_depth_samples():
+    store = InstTallyStore(depth=3, ttl=0)
+    for t in range(6):
+        res = store.record(["A"], [t], now=t)
+    assert res["samples"].tolist() == [3]
+    assert res["consecutive"].tolist() == [2]
+    assert [v for _, v in store.history("A")] == [3, 4, 5]
+
+
+def test_ttl_evicts_only_stale_rows_and_reuses_them():
+    store = InstTallyStore(depth=4, ttl=10, capacity=4)
+    store.record(["A", "B"], [1, 2], now=0)
+    store.record(["B"], [3], now=8)
+    store.record(["C"], [4], now=15)                # A 만료 (0 < 15 - 10), B는 유지
+    assert "A" not in store and "B" in store and "C" in store
+    assert store.history("B") == [(0.0, 2), (8.0, 3)]
+
+    res = store.record(["A"], [7], now=16)           # 반납된 행 재사용 — 이전 이력 없음
+    assert res["samples"].tolist() == [1] and res["delta"].tolist() == [0]
+    assert len(store._head) == 4
+
+
+def test_free_rows_never_look_stale():
+    store = InstTallyStore(depth=4, ttl=10, capacity=64)
+    store.record(["A"], [1], now=100)
+    assert not (store._seen < 100 - 10).any()       # 빈 행(+inf)은 만료 검사에 걸리지 않음
+    store.record(["A"], [2], now=200)                # A 만료 → 재할당
+    assert np.isinf(np.delete(store._seen, store._index["A"])).all()
+
+
+def test_grow_preserves_rows():
+    store = InstTallyStore(depth=4, ttl=0, capacity=2)
+    codes = [f"{i:06d}" for i in range(5)]
+    store.record(codes, list(range(5)), now=1)
+    res = store.record(codes, [v + 1 for v in range(5)], now=2)
+    assert res["delta"].tolist() == [1] * 5
+    assert len(store._head) >= 5
+    assert store.consecutive_all() == {c: 1 for c in codes}
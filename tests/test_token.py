@@ -0,0 +1,53 @@
+"""TokenManager 선제 갱신 — 수명이 REFRESH_AHEAD보다 짧은 토큰에서도 au10001 연속 호출 없음."""
+import time
+from datetime import datetime, timedelta
+
+import modules.kiwoom as kiwoom
+from modules.kiwoom import TokenManager
+
+
+class _IssueCounter:
+    def __init__(self, lifetime: timedelta):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        self.calls += 1
+        expires = datetime.now() + timedelta(minutes=5) + self.lifetime    # _issue_token이 5분 여유를 뺌
+        return _Resp({"token": f"t{self.calls}", "expires_dt": expires.strftime("%Y%m%d%H%M%S")})
+
+
+class _Resp:
+    status_code = 200
+    headers: dict = {}
+
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+def _run_refresher(monkeypatch, lifetime: timedelta, seconds: float = 0.6) -> int:
+    monkeypatch.setattr(kiwoom, "KIWOOM_APPKEY", "test")
+    monkeypatch.setattr(kiwoom, "KIWOOM_TOKEN_REFRESH_AHEAD", 1800)
+    monkeypatch.setattr(kiwoom, "KIWOOM_TOKEN_RETRY_SEC", 0.2)
+    transport = _IssueCounter(lifetime)
+    tm = TokenManager(transport, path="")
+    tm.start_refresher()
+    time.sleep(seconds)
+    return transport.calls
+
+
+def test_short_lived_token_refreshes_at_half_lifetime(monkeypatch):
+    # 수명 60초 < REFRESH_AHEAD 1800초 → 이전에는 발급 직후 바로 재발급 반복
+    assert _run_refresher(monkeypatch, timedelta(seconds=60)) == 1
+
+
+def test_already_expired_token_is_paced_by_retry_interval(monkeypatch):
+    # 서버 시계가 어긋나 받자마자 만료된 토큰 → RETRY_SEC 간격으로만 재시도
+    calls = _run_refresher(monkeypatch, timedelta(seconds=-1))
+    assert 2 <= calls <= 5
@@ -0,0 +1,43 @@
+"""PooledTransport.stats — 호스트 풀이 교체돼도 요청 · 연결 카운터 누적 유지."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.transport import PooledTransport
+
+
+class _Ok(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def port():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Ok)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_stats_survive_pool_eviction(port):
+    tr = PooledTransport(pool_connections=1, pool_maxsize=1)
+    a, b = f"127.0.0.1:{port}", f"localhost:{port}"
+    try:
+        for host in (a, a, a, b, b, a):      # 풀 1개 → 호스트가 바뀔 때마다 이전 풀 교체
+            assert tr.post(f"http://{host}/", json={}).status_code == 200
+        stats = tr.stats()
+    finally:
+        tr.close()
+    assert stats[a] == {"requests": 4, "newConnections": 2, "reused": 2}
+    assert stats[b] == {"requests": 2, "newConnections": 1, "reused": 1}
@@ -0,0 +1,54 @@
+"""기동 준비 — 단계 순서 · 필수 단계 재시도 · warmup 비활성 시에도 토큰 선제 갱신 · 스케줄러 시작."""
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+from modules.warmup import Warmup
+
+
+def test_background_jobs_start_without_warmup(app_module):
+    env = dict(os.environ, WARMUP_ENABLED="false", SCHEDULER_ENABLED="true")
+    code = (
+        "import app; "
+        "print(app.kiwoom._tm._refresher.is_alive(), app.scheduler.running, app.warmup.ready)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.split() == ["True", "True", "False"]
+
+
+def test_steps_run_in_order_and_optional_failure_continues():
+    order = []
+    warmup = Warmup(max_sec=1, retry_sec=0.1)
+    warmup.add("a", lambda: order.append("a") or {"n": 1})
+    warmup.add("b", lambda: order.append("b") or 1 / 0)
+    warmup.add("c", lambda: order.append("c"))
+    warmup.run()
+    status = warmup.status()
+    assert order == ["a", "b", "c"]
+    assert warmup.ready and not warmup.degraded
+    assert [s["state"] for s in status["steps"]] == ["ok", "failed", "ok"]
+    assert status["steps"][0]["detail"] == {"n": 1}
+    assert status["progress"] == "3/3"
+
+
+def test_required_step_retries_then_degrades():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("token unavailable")
+
+    warmup = Warmup(max_sec=5, retry_sec=0.1)
+    step = warmup.add("token", flaky, required=True)
+    warmup.run()
+    assert step.state == "ok" and step.attempts == 3 and not warmup.degraded
+
+    dead = Warmup(max_sec=0.3, retry_sec=0.1)
+    step = dead.add("token", lambda: 1 / 0, required=True)
+    dead.run()
+    assert step.state == "failed" and step.attempts >= 2
+    assert dead.ready and dead.degraded
@@ -0,0 +1,571 @@
+"""
+AX RADAR v5.3 - Fake Kiwoom REST Server
+부하 테스트용 키움 REST API 대역 — 앱이 쓰는 api-id만 구현, 약 2,500종목 합성 시장이 장중 진행.
+
+    python tools/fake_kiwoom.py --port 9100 --symbols 2500 --latency-ms 80 --rate 5 --error-rate 0.01
+    KIWOOM_BASE_URL=http://127.0.0.1:9100 KIWOOM_APPKEY=x KIWOOM_SECRETKEY=x python app.py
+
+구현 api-id:
+    au10001 (/oauth2/token)
+    ka10001 · ka10065(종목) · ka90003 · ka90005   (/api/dostk/stkinfo)
+    ka10032 · ka10034 · ka10035 · ka10036 · ka10039 · ka10065(랭킹)   (/api/dostk/rkinfo)
+    ka10051 · ka20002   (/api/dostk/sect)
+    ka10008   (/api/dostk/frgnistt)
+
+시장 모델:
+- 종목별 가격은 기하 브라운 운동, 기관 · 외국인 · 프로그램 순매수는 종목별 추세 + 잡음으로 누적
+  (일부 종목은 지속 매집 → 연속 증가 · 주도 섹터 시그널이 실제로 발생)
+- 시뮬레이션 시각은 09:00부터 --speed 배속으로 진행, 15:30 이후 정지
+- 랭킹 응답은 --page-size 행씩 cont-yn / next-key 연속조회
+
+장애 주입 (런타임 변경: POST /fake/config {"latency_ms": 200, ...}):
+- 응답 지연: 로그정규 분포 (중앙값 --latency-ms, 분산 --latency-sigma)
+- 쿼터: 토큰 버킷 --rate/초 · --burst 초과 시 429
+- 간헐 오류: --error-rate 확률로 500/503
+
+GET /fake/stats — api-id별 요청 수 · 429 · 5xx · 시뮬레이션 시각
+"""
+import argparse
+import os
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INDUSTRY_SECTORS, KA10051_SECTOR_MAP  # noqa: E402
+
+SESSION_OPEN = 9 * 3600
+SESSION_CLOSE = 15 * 3600 + 30 * 60
+TICK_SEC = 30                       # 시장 상태 갱신 단위 (시뮬레이션 초)
+
+# 시장 코드 표기 (api마다 "0"/"1", "001"/"101", "P00101"/"P10102")
+KOSPI_CODES = {"0", "001", "P00101"}
+KOSDAQ_CODES = {"1", "101", "P10102"}
+
+
+def sgn(v) -> str:
+    """키움 표기: 부호 접두 정수 문자열."""
+    v = int(v)
+    return f"+{v}" if v > 0 else str(v)
+
+
+def sgn_f(v, nd: int = 2) -> str:
+    return f"{v:+.{nd}f}"
+
+
+def sig(change) -> str:
+    return "2" if change > 0 else ("5" if change < 0 else "3")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Synthetic market
+# ═══════════════════════════════════════════════════════════════════
+
+class Market:
+    def __init__(self, n: int = 2500, seed: int = 7, speed: float = 60.0):
+        self.n = n
+        self.seed = seed
+        self.speed = speed
+        self.rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        rng = self.rng
+
+        self.codes = np.array([f"{i:06d}" for i in range(5, 5 + n * 10, 10)][:n])
+        self.names = np.array([f"합성{i:04d}" for i in range(n)])
+        self.kosdaq = np.arange(n) >= int(n * 0.4)              # 앞 40% KOSPI
+        sector_codes = list(INDUSTRY_SECTORS)
+        self.sector = rng.integers(0, len(sector_codes), n)
+        self.sector_codes = sector_codes
+
+        self.prev_close = np.round(np.exp(rng.normal(9.6, 1.1, n)), -1).clip(500, 900_000)
+        self.shares = np.exp(rng.normal(17.0, 1.0, n)).astype(np.int64)
+        self.frgn_weight = rng.uniform(2, 55, n)
+        self.liquidity = np.exp(rng.normal(0, 1.2, n))
+
+        # 매집 성향: 종목별 기관 · 외국인 · 프로그램 순매수 추세 (상위 일부 종목은 뚜렷한 양의 추세)
+        self.inst_drift = rng.normal(0, 1, n) + (rng.random(n) < 0.05) * 4
+        self.frgn_drift = rng.normal(0, 1, n) + (rng.random(n) < 0.05) * 4
+        self.prog_drift = rng.normal(0, 1, n)
+
+        self.reset()
+
+    def reset(self):
+        n = self.n
+        self.price = self.prev_close.copy()
+        self.open = self.prev_close.copy()
+        self.high = self.prev_close.copy()
+        self.low = self.prev_close.copy()
+        self.volume = np.zeros(n, dtype=np.int64)
+        self.amount = np.zeros(n)                   # 원
+        self.inst_net = np.zeros(n, dtype=np.int64)
+        self.frgn_net = np.zeros(n, dtype=np.int64)
+        self.prsn_net = np.zeros(n, dtype=np.int64)
+        self.prog_buy = np.zeros(n)
+        self.prog_sell = np.zeros(n)
+        self.prog_series: list = []                 # [(hhmmss, buy, sell, KOSPI/KOSDAQ mask별)]
+        self.sim_sec = SESSION_OPEN
+        self.started = time.time()
+
+    # ── 진행 ──
+
+    def advance(self):
+        """실시간 경과 × speed 만큼 TICK_SEC 단위로 상태 진행 (요청 시점에 지연 계산)."""
+        self.advance_to(SESSION_OPEN + (time.time() - self.started) * self.speed)
+
+    def advance_to(self, sim_sec: float):
+        """시뮬레이션 시각(자정 기준 초)까지 진행 — speed=0과 함께 쓰면 고정 시점 시장."""
+        target = min(sim_sec, SESSION_CLOSE)
+        with self._lock:
+            while self.sim_sec + TICK_SEC <= target:
+                self._tick()
+                self.sim_sec += TICK_SEC
+
+    def _tick(self):
+        rng, n = self.rng, self.n
+        flow = self.inst_drift * 0.6 + self.frgn_drift * 0.6 + self.prog_drift * 0.3
+        ret = rng.normal(0.00002 * flow, 0.0025, n)
+        self.price = np.maximum(self.price * np.exp(ret), 10)
+        self.high = np.maximum(self.high, self.price)
+        self.low = np.minimum(self.low, self.price)
+
+        vol = (rng.gamma(2.0, 400, n) * self.liquidity).astype(np.int64)
+        self.volume += vol
+        self.amount += vol * self.price
+        scale = vol * 0.15
+        self.inst_net += (scale * (0.25 * self.inst_drift + rng.normal(0, 1, n))).astype(np.int64)
+        self.frgn_net += (scale * (0.25 * self.frgn_drift + rng.normal(0, 1, n))).astype(np.int64)
+        self.prsn_net = -(self.inst_net + self.frgn_net)
+        buy = vol * self.price * rng.uniform(0.05, 0.15, n)
+        sell = buy * np.exp(rng.normal(-0.05 * self.prog_drift, 0.2, n))
+        self.prog_buy += buy
+        self.prog_sell += sell
+        if int(self.sim_sec) % 60 == 0:
+            hhmmss = time.strftime("%H%M%S", time.gmtime(self.sim_sec))
+            self.prog_series.append((hhmmss, self.prog_buy.copy(), self.prog_sell.copy()))
+
+    # ── 조회 헬퍼 ──
+
+    def clock(self) -> str:
+        return time.strftime("%H:%M:%S", time.gmtime(self.sim_sec))
+
+    def mask(self, mrkt_tp: str) -> np.ndarray:
+        if mrkt_tp in KOSPI_CODES:
+            return ~self.kosdaq
+        if mrkt_tp in KOSDAQ_CODES:
+            return self.kosdaq
+        return np.ones(self.n, dtype=bool)
+
+    def index_of(self, code: str) -> int | None:
+        code = code.replace("_AL", "").replace("_NX", "")
+        i = np.searchsorted(self.codes, code)
+        return int(i) if i < self.n and self.codes[i] == code else None
+
+    def change(self) -> np.ndarray:
+        return self.price - self.prev_close
+
+    def flu_rt(self) -> np.ndarray:
+        return (self.price / self.prev_close - 1) * 100
+
+    def quote(self, i: int) -> dict:
+        chg = self.price[i] - self.prev_close[i]
+        return {
+            "stk_cd": self.codes[i], "stk_nm": self.names[i],
+            "cur_prc": sgn(self.price[i] if chg >= 0 else -self.price[i]),
+            "pred_pre_sig": sig(chg), "pred_pre": sgn(chg), "flu_rt": sgn_f(self.flu_rt()[i]),
+        }
+
+    def daily_history(self, i: int, days: int = 60) -> list:
+        """ka10008 일자별 외국인 보유 추이 (종목별 고정 시드, 최신일 우선)."""
+        rng = np.random.default_rng(self.seed * 100_003 + i)
+        chg = (rng.normal(0.1 * self.frgn_drift[i], 1, days) * self.shares[i] * 0.0004).astype(np.int64)
+        poss = (self.frgn_weight[i] / 100 * self.shares[i] - np.cumsum(chg)).astype(np.int64)
+        close = self.prev_close[i] * np.exp(-np.cumsum(rng.normal(0, 0.018, days)))
+        trde = (rng.gamma(2.0, 20_000, days) * self.liquidity[i]).astype(np.int64) + np.abs(chg)
+        today = datetime.now()
+        rows = []
+        for d in range(days):
+            wght = poss[d] / self.shares[i] * 100
+            rows.append({
+                "dt": (today - timedelta(days=d)).strftime("%Y%m%d"),
+                "close_pric": sgn(close[d]), "pred_pre": "0", "trde_qty": str(trde[d]),
+                "chg_qty": sgn(chg[d]), "poss_stkcnt": str(poss[d]),
+                "wght": f"{wght:.2f}", "gain_pos_stkcnt": str(self.shares[i] - poss[d]),
+                "frgnr_limit": str(self.shares[i]), "frgnr_limit_irds": "0",
+                "limit_exh_rt": f"{wght:.2f}",
+            })
+        return rows
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Fault injection
+# ═══════════════════════════════════════════════════════════════════
+
+class Faults:
+    def __init__(self, latency_ms: float, latency_sigma: float, rate: float, burst: int,
+                 error_rate: float, seed: int):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.rate = rate
+        self.burst = burst
+        self.error_rate = error_rate
+        self._rng = np.random.default_rng(seed + 1)
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+
+    def delay(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            return float(self._rng.lognormal(np.log(self.latency_ms / 1000), self.latency_sigma))
+
+    def admit(self) -> bool:
+        """토큰 버킷 (rate <= 0 이면 무제한)."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def error(self) -> int:
+        if self.error_rate <= 0:
+            return 0
+        with self._lock:
+            if self._rng.random() < self.error_rate:
+                return int(self._rng.choice([500, 503]))
+        return 0
+
+    def config(self) -> dict:
+        return {
+            "latency_ms": self.latency_ms, "latency_sigma": self.latency_sigma,
+            "rate": self.rate, "burst": self.burst, "error_rate": self.error_rate,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Handlers (api-id → body → (리스트 키, 행 목록) 또는 단건 dict)
+# ═══════════════════════════════════════════════════════════════════
+
+def _rank_rows(m: Market, idx: np.ndarray, extra) -> list:
+    return [{**m.quote(i), **extra(i, r)} for r, i in enumerate(idx.tolist(), 1)]
+
+
+def ka10032(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "000"))
+    idx = np.flatnonzero(mask)[np.argsort(-m.amount[mask], kind="stable")][:200]
+    return "trde_prica_upper", _rank_rows(m, idx, lambda i, r: {
+        "now_rank": str(r), "pred_rank": str(r), "now_trde_qty": str(m.volume[i]),
+        "trde_prica": str(int(m.amount[i] // 1_000_000)),          # 백만원
+    })
+
+
+def ka10065_rank(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "000"))
+    orgn = body.get("orgn_tp", "9100")
+    if orgn == "9000":
+        net = ((m.prog_buy - m.prog_sell) / np.maximum(m.price, 1)).astype(np.int64)
+    elif orgn == "9200":
+        net = m.frgn_net
+    else:
+        net = m.inst_net
+    sell_side = body.get("trde_tp", "1") == "2"
+    order = np.argsort(net[mask] if sell_side else -net[mask], kind="stable")
+    idx = np.flatnonzero(mask)[order][:100]
+    return "opmr_invsr_trde_upper", _rank_rows(m, idx, lambda i, r: {
+        "buy_qty": str(max(net[i], 0) + m.volume[i] // 20), "sel_qty": str(max(-net[i], 0) + m.volume[i] // 20),
+        "netslmt": sgn(net[i]),
+    })
+
+
+def ka10065_stock(m: Market, body: dict):
+    i = m.index_of(body.get("stk_cd", ""))
+    if i is None:
+        return None
+    prog = int((m.prog_buy[i] - m.prog_sell[i]) / max(m.price[i], 1))
+    return {
+        "stk_cd": m.codes[i], "orgn_netprps_qty": sgn(m.inst_net[i]), "frgnr_netprps_qty": sgn(m.frgn_net[i]),
+        "prsn_netprps_qty": sgn(m.prsn_net[i]), "pgm_netprps_qty": sgn(prog),
+    }
+
+
+def ka10035(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "000"))
+    d = m.frgn_drift
+    tot = (d * m.shares * 0.0003).astype(np.int64)
+    idx = np.flatnonzero(mask)[np.argsort(-tot[mask], kind="stable")][:100]
+    return "for_cont_nettrde_upper", _rank_rows(m, idx, lambda i, r: {
+        "dm1": sgn(tot[i] // 3), "dm2": sgn(tot[i] // 3), "dm3": sgn(tot[i] - 2 * (tot[i] // 3)),
+        "tot": sgn(tot[i]), "limit_exh_rt": f"{m.frgn_weight[i]:.2f}",
+    })
+
+
+def ka10036(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "000"))
+    days = int(body.get("dt", "5") or 5)
+    incr = m.frgn_drift * 0.04 * days ** 0.5
+    idx = np.flatnonzero(mask)[np.argsort(-incr[mask], kind="stable")][:150]
+    return "for_limit_exh_rt_incrs_upper", _rank_rows(m, idx, lambda i, r: {
+        "rank": str(r), "trde_qty": str(m.volume[i]),
+        "poss_stkcnt": str(int(m.frgn_weight[i] / 100 * m.shares[i])),
+        "gain_pos_stkcnt": str(int((1 - m.frgn_weight[i] / 100) * m.shares[i])),
+        "base_limit_exh_rt": f"{m.frgn_weight[i] - incr[i]:.2f}", "limit_exh_rt": f"{m.frgn_weight[i]:.2f}",
+        "exh_rt_incrs": sgn_f(incr[i]),
+    })
+
+
+def ka10034(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "000"))
+    score = m.frgn_drift if body.get("trde_tp", "2") == "2" else -m.frgn_drift
+    idx = np.flatnonzero(mask)[np.argsort(-score[mask], kind="stable")][:100]
+    return "for_dt_trde_upper", _rank_rows(m, idx, lambda i, r: {
+        "rank": str(r), "netprps_qty": sgn(m.frgn_drift[i] * m.shares[i] * 0.0002),
+    })
+
+
+def ka10039(m: Market, body: dict):
+    # 회원사 코드별 고정 시드로 종목 선택 → 같은 회원사는 세션 내내 비슷한 종목을 매매
+    member = body.get("mmcm_cd", "000")
+    rng = np.random.default_rng(m.seed * 7919 + int(member or 0))
+    pick = rng.choice(m.n, size=60, replace=False)
+    weight = rng.gamma(1.5, 1.0, 60) * m.liquidity[pick]
+    sell_side = body.get("trde_tp", "1") == "2"
+    days = int(body.get("dt", "1") or 1)
+    turnover = m.prev_close[pick] * m.liquidity[pick] * 2e5 * days + m.amount[pick]          # 원
+    amt = weight * turnover * 0.01 / 1000                                                     # 천원
+    amt = -amt if sell_side else amt
+    order = np.argsort(-np.abs(amt), kind="stable")[:30]
+    rows = []
+    for r, j in enumerate(order.tolist(), 1):
+        i = int(pick[j])
+        qty = int(amt[j] * 1000 / max(m.price[i], 1))
+        rows.append({
+            "rank": str(r), "stk_cd": m.codes[i], "stk_nm": m.names[i], "flu_rt": sgn_f(m.flu_rt()[i]),
+            "sel_trde_qty": str(max(-qty, 0)), "buy_trde_qty": str(max(qty, 0)),
+            "netprps_qty": sgn(qty), "netprps_amt": sgn(amt[j]),
+        })
+    return "sec_trde_upper", rows
+
+
+def ka10051(m: Market, body: dict):
+    name_of = {std: raw for raw, std in KA10051_SECTOR_MAP.items()}
+    rows = []
+    for k, code in enumerate(m.sector_codes):
+        sel = (m.sector == k) & ~m.kosdaq
+        raw = name_of.get(INDUSTRY_SECTORS[code], INDUSTRY_SECTORS[code])
+        frgn = int((m.frgn_net[sel] * m.price[sel]).sum() // 1_000_000)
+        orgn = int((m.inst_net[sel] * m.price[sel]).sum() // 1_000_000)
+        rows.append({
+            "inds_cd": code, "inds_nm": raw, "frgnr_netprps": sgn(frgn), "orgn_netprps": sgn(orgn),
+            "ind_netprps": sgn(-(frgn + orgn)),
+        })
+    return "inds_netprps", rows
+
+
+def ka20002(m: Market, body: dict):
+    code = body.get("inds_cd", "")
+    k = m.sector_codes.index(code) if code in m.sector_codes else -1
+    idx = np.flatnonzero((m.sector == k) & ~m.kosdaq)
+    return "inds_stkpc", _rank_rows(m, idx, lambda i, r: {
+        "now_trde_qty": str(m.volume[i]), "open_pric": sgn(m.open[i]),
+        "high_pric": sgn(m.high[i]), "low_pric": sgn(m.low[i]),
+    })
+
+
+def ka90003(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "P00101"))
+    net = (m.prog_buy - m.prog_sell) / 1_000_000          # 백만원
+    idx = np.flatnonzero(mask)[np.argsort(-net[mask], kind="stable")][:50]
+    return "prm_netprps_upper_50", _rank_rows(m, idx, lambda i, r: {
+        "rank": str(r), "acc_trde_qty": str(m.volume[i]),
+        "prm_sell_amt": str(int(m.prog_sell[i] // 1_000_000)), "prm_buy_amt": str(int(m.prog_buy[i] // 1_000_000)),
+        "prm_netprps_amt": sgn(net[i]),
+    })
+
+
+def ka90005(m: Market, body: dict):
+    mask = m.mask(body.get("mrkt_tp", "0"))
+    rows, prev_net = [], 0
+    for hhmmss, buy, sell in m.prog_series:
+        b, s = int(buy[mask].sum() // 1_000_000), int(sell[mask].sum() // 1_000_000)
+        rows.append({
+            "cntr_tm": hhmmss, "pgm_buy_amt": str(b), "pgm_sell_amt": str(s),
+            "pgm_netprps": sgn((b - s) - prev_net), "pgm_acml_netprps": sgn(b - s),
+        })
+        prev_net = b - s
+    return "prm_trde_trnsn", rows
+
+
+def ka10001(m: Market, body: dict):
+    i = m.index_of(body.get("stk_cd", ""))
+    if i is None:
+        return None
+    per = float(np.random.default_rng(i).uniform(4, 40))
+    return {
+        **m.quote(i),
+        "open_pric": sgn(m.open[i]), "high_pric": sgn(m.high[i]), "low_pric": sgn(m.low[i]),
+        "trde_qty": str(m.volume[i]), "mac": str(int(m.price[i] * m.shares[i] // 100_000_000)),
+        "per": f"{per:.2f}", "pbr": f"{per / 10:.2f}", "for_exh_rt": f"{m.frgn_weight[i]:.2f}",
+    }
+
+
+def ka10008(m: Market, body: dict):
+    i = m.index_of(body.get("stk_cd", ""))
+    return "stk_frgnr", ([] if i is None else m.daily_history(i))
+
+
+HANDLERS = {
+    ("/api/dostk/rkinfo", "ka10032"): ka10032,
+    ("/api/dostk/rkinfo", "ka10065"): ka10065_rank,
+    ("/api/dostk/rkinfo", "ka10035"): ka10035,
+    ("/api/dostk/rkinfo", "ka10036"): ka10036,
+    ("/api/dostk/rkinfo", "ka10034"): ka10034,
+    ("/api/dostk/rkinfo", "ka10039"): ka10039,
+    ("/api/dostk/stkinfo", "ka10001"): ka10001,
+    ("/api/dostk/stkinfo", "ka10065"): ka10065_stock,
+    ("/api/dostk/stkinfo", "ka90003"): ka90003,
+    ("/api/dostk/stkinfo", "ka90005"): ka90005,
+    ("/api/dostk/sect", "ka10051"): ka10051,
+    ("/api/dostk/sect", "ka20002"): ka20002,
+    ("/api/dostk/frgnistt", "ka10008"): ka10008,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Server
+# ═══════════════════════════════════════════════════════════════════
+
+def create_app(market: Market, faults: Faults, page_size: int = 40) -> Flask:
+    app = Flask(__name__)
+    tokens: set = set()
+    stats_lock = threading.Lock()
+    stats: dict = {}
+
+    def count(api_id: str, field: str):
+        with stats_lock:
+            entry = stats.setdefault(api_id, {"requests": 0, "throttled": 0, "errors": 0})
+            entry[field] += 1
+
+    def fail(status: int, msg: str):
+        return jsonify({"return_code": 1, "return_msg": msg}), status
+
+    def gate(api_id: str):
+        """지연 → 쿼터 → 간헐 오류 순서로 장애 주입. 통과 시 None."""
+        count(api_id, "requests")
+        delay = faults.delay()
+        if delay:
+            time.sleep(delay)
+        if not faults.admit():
+            count(api_id, "throttled")
+            return fail(429, "허용된 요청 개수를 초과하였습니다")
+        status = faults.error()
+        if status:
+            count(api_id, "errors")
+            return fail(status, "일시적인 서버 오류")
+        return None
+
+    @app.post("/oauth2/token")
+    def issue_token():
+        rejected = gate("au10001")
+        if rejected:
+            return rejected
+        body = request.get_json(silent=True) or {}
+        if not body.get("appkey") or not body.get("secretkey"):
+            return fail(400, "appkey/secretkey required")
+        token = secrets.token_hex(16)
+        tokens.add(token)
+        expires = (datetime.now() + timedelta(hours=24)).strftime("%Y%m%d%H%M%S")
+        return jsonify({"return_code": 0, "return_msg": "정상", "token": token,
+                        "token_type": "bearer", "expires_dt": expires})
+
+    @app.post("/api/dostk/<group>")
+    def dostk(group):
+        api_id = request.headers.get("api-id", "")
+        rejected = gate(api_id)
+        if rejected:
+            return rejected
+        auth = request.headers.get("authorization", "")
+        if not auth.startswith("Bearer ") or auth[7:] not in tokens:
+            return fail(401, "유효하지 않은 토큰")
+        handler = HANDLERS.get((f"/api/dostk/{group}", api_id))
+        if handler is None:
+            return fail(404, f"unsupported api-id {api_id} on {group}")
+
+        market.advance()
+        body = request.get_json(silent=True) or {}
+        out = handler(market, body)
+        if out is None:
+            return jsonify({"return_code": 1, "return_msg": "종목 없음"})
+        if isinstance(out, dict):
+            return jsonify({"return_code": 0, "return_msg": "정상", **out})
+
+        key, rows = out
+        start = int(request.headers.get("next-key") or 0) if request.headers.get("cont-yn") == "Y" else 0
+        page = rows[start:start + page_size]
+        resp = jsonify({"return_code": 0, "return_msg": "정상", key: page})
+        if start + page_size < len(rows):
+            resp.headers["cont-yn"] = "Y"
+            resp.headers["next-key"] = str(start + page_size)
+        else:
+            resp.headers["cont-yn"] = "N"
+        resp.headers["api-id"] = api_id
+        return resp
+
+    @app.get("/fake/stats")
+    def fake_stats():
+        market.advance()
+        with stats_lock:
+            snapshot = {k: dict(v) for k, v in stats.items()}
+        return jsonify({"simTime": market.clock(), "symbols": market.n, "faults": faults.config(), "apis": snapshot})
+
+    @app.post("/fake/config")
+    def fake_config():
+        body = request.get_json(silent=True) or {}
+        for field in ("latency_ms", "latency_sigma", "rate", "error_rate"):
+            if field in body:
+                setattr(faults, field, float(body[field]))
+        if "burst" in body:
+            faults.burst = int(body["burst"])
+        if "speed" in body:
+            market.speed = float(body["speed"])
+        if body.get("reset"):
+            market.reset()
+        return jsonify(faults.config())
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Kiwoom REST server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--symbols", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--speed", type=float, default=60.0, help="시뮬레이션 배속 (실시간 1초 = N초)")
+    parser.add_argument("--page-size", type=int, default=40, help="연속조회 페이지당 행 수")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="응답 지연 중앙값 (0=없음)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="로그정규 분산")
+    parser.add_argument("--rate", type=float, default=5.0, help="초당 허용 요청 (0=무제한)")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500/503 응답 확률")
+    args = parser.parse_args()
+
+    market = Market(args.symbols, args.seed, args.speed)
+    faults = Faults(args.latency_ms, args.latency_sigma, args.rate, args.burst, args.error_rate, args.seed)
+    print(f"Fake Kiwoom: {args.symbols} symbols on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms}ms, rate {args.rate}/s, errors {args.error_rate:.1%})")
+    create_app(market, faults, args.page_size).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()